@@ -1,10 +1,11 @@
 import streamlit as st
 import pandas as pd
-import locale
 from datetime import datetime
 
 # Configura moeda brasileira
 def moeda(valor):
+    import locale
+
     try:
         return locale.currency(valor, grouping=True, symbol=True)
     except:
@@ -1,11 +1,9 @@
 import streamlit as st
 import pandas as pd
 from datetime import datetime
-from zoneinfo import ZoneInfo
-from fpdf import FPDF
-import base64
-from io import BytesIO
-import urllib.parse
+
+import folha
+from folha import DESCONTO_DEPENDENTE_IR, detalhar_faixas, formatar_moeda_coluna, resultado_para_csv, selecionar_tabelas
 
 # Configuração básica da página
 st.set_page_config(
@@ -27,27 +25,9 @@ if 'ultima_opcao' not in st.session_state:
 st.title("💰 Auditoria de Folha de Pagamento 2025 - Ana Clara")
 st.markdown("### Cálculo de Salário Família, INSS e IRRF")
 
-# --- TABELAS LEGAIS 2025 ---
-SALARIO_FAMILIA_LIMITE = 1906.04
-VALOR_POR_DEPENDENTE = 65.00
-DESCONTO_DEPENDENTE_IR = 189.59
-
-# Tabela INSS 2025 CORRETA
-TABELA_INSS = [
-    {"limite": 1518.00, "aliquota": 0.075},
-    {"limite": 2793.88, "aliquota": 0.09},
-    {"limite": 4190.83, "aliquota": 0.12},
-    {"limite": 8157.41, "aliquota": 0.14}
-]
-
-# Tabela IRRF 2025
-TABELA_IRRF = [
-    {"limite": 2428.80, "aliquota": 0.0, "deducao": 0.0},
-    {"limite": 2826.65, "aliquota": 0.075, "deducao": 182.16},
-    {"limite": 3751.05, "aliquota": 0.15, "deducao": 394.16},
-    {"limite": 4664.68, "aliquota": 0.225, "deducao": 675.49},
-    {"limite": float('inf'), "aliquota": 0.275, "deducao": 916.90}
-]
+# --- TABELAS LEGAIS ---
+# As tabelas de INSS/IRRF e os parâmetros do Salário Família vêm do registro
+# de vigências do pacote `folha`, pela competência analisada.
 
 # --- FUNÇÕES DE UTILIDADE ---
 
@@ -66,58 +46,56 @@ def formatar_data(data):
 
 def get_br_datetime_now():
     """Retorna o objeto datetime configurado para o fuso horário de São Paulo (BRT/GMT-3)"""
+    from zoneinfo import ZoneInfo
+
     return datetime.now(ZoneInfo("America/Sao_Paulo"))
 
 # --- FUNÇÕES DE CÁLCULO ---
 
-def calcular_inss(salario_bruto):
-    """Calcula desconto do INSS 2025 com a tabela correta (progressiva)"""
-    if salario_bruto <= 0:
-        return 0.0
-    
-    salario_calculo = min(salario_bruto, TABELA_INSS[3]["limite"])
-    inss = 0.0
-    salario_restante = salario_calculo
-    
-    for i, faixa in enumerate(TABELA_INSS):
-        if salario_restante <= 0:
-            break
-            
-        if i == 0:
-            valor_faixa = min(salario_restante, faixa["limite"])
-            inss += valor_faixa * faixa["aliquota"]
-            salario_restante -= valor_faixa
-        else:
-            faixa_anterior = TABELA_INSS[i-1]
-            limite_faixa = faixa["limite"] - faixa_anterior["limite"]
-            
-            valor_faixa = min(salario_restante, limite_faixa)
-            inss += valor_faixa * faixa["aliquota"]
-            salario_restante -= valor_faixa
-    
-    return round(inss, 2)
+def calcular_inss(salario_bruto, competencia):
+    """Calcula desconto do INSS com a tabela progressiva em vigor na competência"""
+    tabela_inss = selecionar_tabelas(competencia)[0]
+    return folha.calcular_inss(salario_bruto, tabela_inss)
 
-def calcular_salario_familia(salario, dependentes):
-    """Calcula salário família"""
-    if salario <= SALARIO_FAMILIA_LIMITE:
-        return dependentes * VALOR_POR_DEPENDENTE
-    return 0.0
+def calcular_salario_familia(salario, dependentes, competencia):
+    """Calcula salário família com os parâmetros em vigor na competência"""
+    _, _, limite_sf, valor_sf, _, _, _ = selecionar_tabelas(competencia)
+    return folha.calcular_salario_familia(salario, dependentes, limite_sf, valor_sf)
 
-def calcular_irrf(salario_bruto, dependentes, inss, outros_descontos=0):
-    """Calcula IRRF"""
+def calcular_irrf(salario_bruto, dependentes, inss, competencia, outros_descontos=0):
+    """Calcula IRRF com a tabela em vigor na competência"""
     # Base = Salário Bruto - Dedução por Dependente - INSS - Outros Descontos
     base_calculo = salario_bruto - (dependentes * DESCONTO_DEPENDENTE_IR) - inss - outros_descontos
-    
-    if base_calculo <= 0:
-        return 0.0
-    
-    irrf = 0.0
-    for faixa in TABELA_IRRF:
-        if base_calculo <= faixa["limite"]:
-            irrf = (base_calculo * faixa["aliquota"]) - faixa["deducao"]
-            return max(round(irrf, 2), 0.0)
-    
-    return 0.0
+    tabela_irrf = selecionar_tabelas(competencia)[1]
+    return folha.calcular_irrf_base(base_calculo, tabela_irrf)
+
+# --- TABELAS PARA EXIBIÇÃO ---
+
+def _percentual(aliquota, casas=None):
+    """Alíquota no formato brasileiro (0,075 -> '7,5%')."""
+    texto = f"{aliquota * 100:.{casas}f}" if casas is not None else f"{aliquota * 100:g}"
+    return texto.replace('.', ',') + '%'
+
+def faixas_inss(tabela_inss):
+    """Linhas (faixa salarial, alíquota, valor máximo na faixa) de uma tabela INSS."""
+    linhas = []
+    for i, (limite_anterior, limite, aliquota, _, valor_maximo) in enumerate(detalhar_faixas(tabela_inss)):
+        faixa = f'Até {formatar_moeda(limite)}' if i == 0 else f'{formatar_moeda(limite_anterior + 0.01)} a {formatar_moeda(limite)}'
+        linhas.append((faixa, _percentual(aliquota, casas=1), formatar_moeda(valor_maximo)))
+    return linhas
+
+def faixas_irrf(tabela_irrf):
+    """Linhas (base de cálculo, alíquota, parcela a deduzir, faixa) de uma tabela IRRF."""
+    linhas = []
+    for i, (limite_anterior, limite, aliquota, deducao, _) in enumerate(detalhar_faixas(tabela_irrf)):
+        if i == 0:
+            base = f'Até {formatar_moeda(limite)}'
+        elif limite == float('inf'):
+            base = f'Acima de {formatar_moeda(limite_anterior)}'
+        else:
+            base = f'{formatar_moeda(limite_anterior + 0.01)} a {formatar_moeda(limite)}'
+        linhas.append((base, _percentual(aliquota), formatar_moeda(deducao), f'{i}ª' if i else 'Isento'))
+    return linhas
 
 # --- FUNÇÕES DE GERAÇÃO DE PDF ---
 
@@ -131,13 +109,83 @@ def criar_link_download_pdf(pdf_output, filename):
         pdf_output = pdf_output.encode('latin1')
         
     # Usa o output (garantido como bytes) para codificar em base64
+    import base64
+
     b64 = base64.b64encode(pdf_output).decode('utf-8')
     
     href = f'<a href="data:application/octet-stream;base64,{b64}" download="{filename}">📄 Clique aqui para baixar o PDF</a>'
     return href
 
+def adicionar_tabelas_referencia_pdf(pdf, competencia):
+    """Adiciona ao PDF as tabelas de Salário Família, INSS e IRRF em vigor na competência"""
+    tabela_inss, tabela_irrf, limite_sf, valor_sf, ano_base, irrf_periodo, _ = selecionar_tabelas(competencia)
+
+    pdf.set_font('Arial', 'B', 12)
+    pdf.cell(0, 10, f'TABELAS DE REFERÊNCIA {ano_base}', 0, 1)
+    
+    # Tabela Salário Família
+    pdf.set_font('Arial', 'B', 10)
+    pdf.cell(0, 8, f'SALÁRIO FAMÍLIA {ano_base}', 0, 1)
+    pdf.set_font('Arial', '', 8)
+    pdf.cell(80, 6, 'Descrição', 1)
+    pdf.cell(50, 6, 'Valor', 1)
+    pdf.cell(0, 6, 'Observação', 1, 1)
+    
+    info_salario_familia = [
+        ('Limite de salário', formatar_moeda(limite_sf), 'Para ter direito'),
+        ('Valor por dependente', formatar_moeda(valor_sf), 'Por cada dependente'),
+        ('Dependentes considerados', 'Filhos até 14 anos', 'Ou inválidos qualquer idade')
+    ]
+    
+    for descricao, valor, obs in info_salario_familia:
+        pdf.cell(80, 6, descricao, 1)
+        pdf.cell(50, 6, valor, 1)
+        pdf.cell(0, 6, obs, 1, 1)
+    
+    pdf.ln(5)
+    
+    # Tabela INSS
+    pdf.set_font('Arial', 'B', 10)
+    pdf.cell(0, 8, f'TABELA INSS {ano_base}', 0, 1)
+    pdf.set_font('Arial', '', 8)
+    pdf.cell(60, 6, 'Faixa Salarial', 1)
+    pdf.cell(30, 6, 'Alíquota', 1)
+    pdf.cell(0, 6, 'Valor Máx. na Faixa', 1, 1)
+    
+    for faixa, aliquota, valor in faixas_inss(tabela_inss):
+        pdf.cell(60, 6, faixa, 1)
+        pdf.cell(30, 6, aliquota, 1)
+        pdf.cell(0, 6, valor, 1, 1)
+    
+    pdf.cell(0, 3, '', 0, 1)
+    pdf.cell(0, 6, f'Teto máximo do INSS: {formatar_moeda(tabela_inss[-1]["limite"])}', 0, 1)
+    pdf.ln(5)
+    
+    # Tabela IRRF
+    pdf.set_font('Arial', 'B', 10)
+    pdf.cell(0, 8, f'TABELA IRRF ({irrf_periodo})', 0, 1)
+    pdf.set_font('Arial', '', 8)
+    pdf.cell(60, 6, 'Base de Cálculo', 1)
+    pdf.cell(25, 6, 'Alíquota', 1)
+    pdf.cell(35, 6, 'Parcela a Deduzir', 1)
+    pdf.cell(0, 6, 'Faixa', 1, 1)
+    
+    for base, aliquota, deducao, faixa in faixas_irrf(tabela_irrf):
+        pdf.cell(60, 6, base, 1)
+        pdf.cell(25, 6, aliquota, 1)
+        pdf.cell(35, 6, deducao, 1)
+        pdf.cell(0, 6, faixa, 1, 1)
+    
+    pdf.cell(0, 3, '', 0, 1)
+    pdf.cell(0, 6, f'Dedução por dependente: {formatar_moeda(DESCONTO_DEPENDENTE_IR)}', 0, 1)
+
 def gerar_pdf_individual(dados):
     """Gera PDF profissional para cálculo individual"""
+    from fpdf import FPDF
+
+    competencia = dados["competencia_obj"]
+    _, _, limite_sf, valor_sf, _, _, _ = selecionar_tabelas(competencia)
+
     pdf = FPDF()
     pdf.add_page()
     
@@ -221,79 +269,7 @@ def gerar_pdf_individual(dados):
         pdf.ln(5)
     
     # --- INCLUSÃO DAS TABELAS NO PDF INDIVIDUAL ---
-    pdf.set_font('Arial', 'B', 12)
-    pdf.cell(0, 10, 'TABELAS DE REFERÊNCIA 2025', 0, 1)
-    
-    # Tabela Salário Família
-    pdf.set_font('Arial', 'B', 10)
-    pdf.cell(0, 8, 'SALÁRIO FAMÍLIA 2025', 0, 1)
-    pdf.set_font('Arial', '', 8)
-    pdf.cell(80, 6, 'Descrição', 1)
-    pdf.cell(50, 6, 'Valor', 1)
-    pdf.cell(0, 6, 'Observação', 1, 1)
-    
-    info_salario_familia = [
-        ('Limite de salário', formatar_moeda(SALARIO_FAMILIA_LIMITE), 'Para ter direito'),
-        ('Valor por dependente', formatar_moeda(VALOR_POR_DEPENDENTE), 'Por cada dependente'),
-        ('Dependentes considerados', 'Filhos até 14 anos', 'Ou inválidos qualquer idade')
-    ]
-    
-    for descricao, valor, obs in info_salario_familia:
-        pdf.cell(80, 6, descricao, 1)
-        pdf.cell(50, 6, valor, 1)
-        pdf.cell(0, 6, obs, 1, 1)
-    
-    pdf.ln(5)
-    
-    # Tabela INSS
-    pdf.set_font('Arial', 'B', 10)
-    pdf.cell(0, 8, 'TABELA INSS 2025', 0, 1)
-    pdf.set_font('Arial', '', 8)
-    pdf.cell(60, 6, 'Faixa Salarial', 1)
-    pdf.cell(30, 6, 'Alíquota', 1)
-    pdf.cell(0, 6, 'Valor Máx. na Faixa', 1, 1)
-    
-    faixas_inss = [
-        (f'Até {formatar_moeda(1518.00)}', '7,5%', formatar_moeda(1518.00 * 0.075)),
-        (f'{formatar_moeda(1518.01)} a {formatar_moeda(2793.88)}', '9,0%', formatar_moeda((2793.88 - 1518.00) * 0.09)),
-        (f'{formatar_moeda(2793.89)} a {formatar_moeda(4190.83)}', '12,0%', formatar_moeda((4190.83 - 2793.88) * 0.12)),
-        (f'{formatar_moeda(4190.84)} a {formatar_moeda(8157.41)}', '14,0%', formatar_moeda((8157.41 - 4190.83) * 0.14))
-    ]
-    
-    for faixa, aliquota, valor in faixas_inss:
-        pdf.cell(60, 6, faixa, 1)
-        pdf.cell(30, 6, aliquota, 1)
-        pdf.cell(0, 6, valor, 1, 1)
-    
-    pdf.cell(0, 3, '', 0, 1)
-    pdf.cell(0, 6, f'Teto máximo do INSS: {formatar_moeda(8157.41)}', 0, 1)
-    pdf.ln(5)
-    
-    # Tabela IRRF
-    pdf.set_font('Arial', 'B', 10)
-    pdf.cell(0, 8, 'TABELA IRRF 2025', 0, 1)
-    pdf.set_font('Arial', '', 8)
-    pdf.cell(60, 6, 'Base de Cálculo', 1)
-    pdf.cell(25, 6, 'Alíquota', 1)
-    pdf.cell(35, 6, 'Parcela a Deduzir', 1)
-    pdf.cell(0, 6, 'Faixa', 1, 1)
-    
-    faixas_irrf = [
-        (f'Até {formatar_moeda(2428.80)}', '0%', formatar_moeda(0), 'Isento'),
-        (f'{formatar_moeda(2428.81)} a {formatar_moeda(2826.65)}', '7,5%', formatar_moeda(182.16), '1ª'),
-        (f'{formatar_moeda(2826.66)} a {formatar_moeda(3751.05)}', '15%', formatar_moeda(394.16), '2ª'),
-        (f'{formatar_moeda(3751.06)} a {formatar_moeda(4664.68)}', '22,5%', formatar_moeda(675.49), '3ª'),
-        (f'Acima de {formatar_moeda(4664.68)}', '27,5%', formatar_moeda(916.90), '4ª')
-    ]
-    
-    for base, aliquota, deducao, faixa in faixas_irrf:
-        pdf.cell(60, 6, base, 1)
-        pdf.cell(25, 6, aliquota, 1)
-        pdf.cell(35, 6, deducao, 1)
-        pdf.cell(0, 6, faixa, 1, 1)
-    
-    pdf.cell(0, 3, '', 0, 1)
-    pdf.cell(0, 6, f'Dedução por dependente: {formatar_moeda(DESCONTO_DEPENDENTE_IR)}', 0, 1)
+    adicionar_tabelas_referencia_pdf(pdf, competencia)
     pdf.ln(10)
     
     # Legislação e Metodologia
@@ -318,10 +294,10 @@ def gerar_pdf_individual(dados):
     pdf.cell(0, 6, 'METODOLOGIA DE CÁLCULO', 0, 1)
     pdf.set_font('Arial', '', 9)
     metodologia = [
-        '1. SALÁRIO FAMÍLIA: Verifica se salário bruto é menor ou igual a R$ 1.906,04',
-        '2. CÁLCULO: Nº Dependentes × R$ 65,00 (se elegível)',
+        f'1. SALÁRIO FAMÍLIA: Verifica se salário bruto é menor ou igual a {formatar_moeda(limite_sf)}',
+        f'2. CÁLCULO: Nº Dependentes × {formatar_moeda(valor_sf)} (se elegível)',
         '3. INSS: Cálculo progressivo por faixas acumulativas (Aliquota Efetiva)',
-        '4. BASE IRRF: Salário Bruto - Dependentes × R$ 189,59 - INSS - Outros Descontos',
+        f'4. BASE IRRF: Salário Bruto - Dependentes × {formatar_moeda(DESCONTO_DEPENDENTE_IR)} - INSS - Outros Descontos',
         '5. IRRF: (Base × Alíquota) - Parcela a Deduzir (tabela progressiva)',
         '6. SALÁRIO LÍQUIDO: Salário Bruto + Salário Família - INSS - IRRF - Outros Descontos'
     ]
@@ -341,6 +317,11 @@ def gerar_pdf_individual(dados):
 
 def gerar_pdf_auditoria_completa(df_resultado, uploaded_filename, total_salario_familia, total_inss, total_irrf, folha_liquida_total, observacoes=""):
     """Gera PDF para auditoria completa"""
+    from fpdf import FPDF
+
+    competencia = df_resultado['Competencia'].iloc[0]
+    tabela_inss, _, limite_sf, valor_sf, ano_base, irrf_periodo, _ = selecionar_tabelas(competencia)
+
     pdf = FPDF()
     pdf.add_page()
     
@@ -360,6 +341,7 @@ def gerar_pdf_auditoria_completa(df_resultado, uploaded_filename, total_salario_
     pdf.cell(0, 6, f'Data da Análise: {formatar_data(data_hora_agora)}', 0, 1)
     pdf.cell(0, 6, f'Total de Funcionários Auditados: {len(df_resultado)}', 0, 1)
     pdf.cell(0, 6, f'Arquivo Processado: {uploaded_filename}', 0, 1)
+    pdf.cell(0, 6, f'Competência Analisada: {formatar_data(competencia)}', 0, 1)
     
     # Estatísticas de aplicação
     funcionarios_com_salario_familia = len(df_resultado[df_resultado['Salario_Familia'] > 0])
@@ -452,79 +434,7 @@ def gerar_pdf_auditoria_completa(df_resultado, uploaded_filename, total_salario_
 
     # --- INCLUSÃO DAS TABELAS NO PDF EM LOTE ---
     
-    pdf.set_font('Arial', 'B', 12)
-    pdf.cell(0, 10, 'TABELAS DE REFERÊNCIA 2025', 0, 1)
-    
-    # Tabela Salário Família
-    pdf.set_font('Arial', 'B', 10)
-    pdf.cell(0, 8, 'SALÁRIO FAMÍLIA 2025', 0, 1)
-    pdf.set_font('Arial', '', 8)
-    pdf.cell(80, 6, 'Descrição', 1)
-    pdf.cell(50, 6, 'Valor', 1)
-    pdf.cell(0, 6, 'Observação', 1, 1)
-    
-    info_salario_familia = [
-        ('Limite de salário', formatar_moeda(SALARIO_FAMILIA_LIMITE), 'Para ter direito'),
-        ('Valor por dependente', formatar_moeda(VALOR_POR_DEPENDENTE), 'Por cada dependente'),
-        ('Dependentes considerados', 'Filhos até 14 anos', 'Ou inválidos qualquer idade')
-    ]
-    
-    for descricao, valor, obs in info_salario_familia:
-        pdf.cell(80, 6, descricao, 1)
-        pdf.cell(50, 6, valor, 1)
-        pdf.cell(0, 6, obs, 1, 1)
-    
-    pdf.ln(5)
-    
-    # Tabela INSS
-    pdf.set_font('Arial', 'B', 10)
-    pdf.cell(0, 8, 'TABELA INSS 2025', 0, 1)
-    pdf.set_font('Arial', '', 8)
-    pdf.cell(60, 6, 'Faixa Salarial', 1)
-    pdf.cell(30, 6, 'Alíquota', 1)
-    pdf.cell(0, 6, 'Valor Máx. na Faixa', 1, 1)
-    
-    faixas_inss = [
-        (f'Até {formatar_moeda(1518.00)}', '7,5%', formatar_moeda(1518.00 * 0.075)),
-        (f'{formatar_moeda(1518.01)} a {formatar_moeda(2793.88)}', '9,0%', formatar_moeda((2793.88 - 1518.00) * 0.09)),
-        (f'{formatar_moeda(2793.89)} a {formatar_moeda(4190.83)}', '12,0%', formatar_moeda((4190.83 - 2793.88) * 0.12)),
-        (f'{formatar_moeda(4190.84)} a {formatar_moeda(8157.41)}', '14,0%', formatar_moeda((8157.41 - 4190.83) * 0.14))
-    ]
-    
-    for faixa, aliquota, valor in faixas_inss:
-        pdf.cell(60, 6, faixa, 1)
-        pdf.cell(30, 6, aliquota, 1)
-        pdf.cell(0, 6, valor, 1, 1)
-    
-    pdf.cell(0, 3, '', 0, 1)
-    pdf.cell(0, 6, f'Teto máximo do INSS: {formatar_moeda(8157.41)}', 0, 1)
-    pdf.ln(5)
-    
-    # Tabela IRRF
-    pdf.set_font('Arial', 'B', 10)
-    pdf.cell(0, 8, 'TABELA IRRF 2025', 0, 1)
-    pdf.set_font('Arial', '', 8)
-    pdf.cell(60, 6, 'Base de Cálculo', 1)
-    pdf.cell(25, 6, 'Alíquota', 1)
-    pdf.cell(35, 6, 'Parcela a Deduzir', 1)
-    pdf.cell(0, 6, 'Faixa', 1, 1)
-    
-    faixas_irrf = [
-        (f'Até {formatar_moeda(2428.80)}', '0%', formatar_moeda(0), 'Isento'),
-        (f'{formatar_moeda(2428.81)} a {formatar_moeda(2826.65)}', '7,5%', formatar_moeda(182.16), '1ª'),
-        (f'{formatar_moeda(2826.66)} a {formatar_moeda(3751.05)}', '15%', formatar_moeda(394.16), '2ª'),
-        (f'{formatar_moeda(3751.06)} a {formatar_moeda(4664.68)}', '22,5%', formatar_moeda(675.49), '3ª'),
-        (f'Acima de {formatar_moeda(4664.68)}', '27,5%', formatar_moeda(916.90), '4ª')
-    ]
-    
-    for base, aliquota, deducao, faixa in faixas_irrf:
-        pdf.cell(60, 6, base, 1)
-        pdf.cell(25, 6, aliquota, 1)
-        pdf.cell(35, 6, deducao, 1)
-        pdf.cell(0, 6, faixa, 1, 1)
-    
-    pdf.cell(0, 3, '', 0, 1)
-    pdf.cell(0, 6, f'Dedução por dependente: {formatar_moeda(DESCONTO_DEPENDENTE_IR)}', 0, 1)
+    adicionar_tabelas_referencia_pdf(pdf, competencia)
     pdf.ln(10)
     
     # Legislação e Metodologia
@@ -549,10 +459,10 @@ def gerar_pdf_auditoria_completa(df_resultado, uploaded_filename, total_salario_
     pdf.cell(0, 6, 'METODOLOGIA DE CÁLCULO APLICADA', 0, 1)
     pdf.set_font('Arial', '', 9)
     metodologia = [
-        '1. SALÁRIO FAMÍLIA: Pago para salários menores ou iguais a R$ 1.906,04, no valor de R$ 65,00 por dependente',
-        '2. INSS: Cálculo progressivo por faixas conforme tabela 2025 (Aliquota Efetiva)',
-        '3. IRRF: Base de cálculo = Salário Bruto - Dependentes × R$ 189,59 - INSS - Outros Descontos',
-        '4. Aplicadas alíquotas progressivas conforme tabela IRRF 2025',
+        f'1. SALÁRIO FAMÍLIA: Pago para salários menores ou iguais a {formatar_moeda(limite_sf)}, no valor de {formatar_moeda(valor_sf)} por dependente',
+        f'2. INSS: Cálculo progressivo por faixas conforme tabela {ano_base} (Aliquota Efetiva, teto {formatar_moeda(tabela_inss[-1]["limite"])})',
+        f'3. IRRF: Base de cálculo = Salário Bruto - Dependentes × {formatar_moeda(DESCONTO_DEPENDENTE_IR)} - INSS - Outros Descontos',
+        f'4. Aplicadas alíquotas progressivas conforme tabela IRRF ({irrf_periodo})',
         '5. Salário Líquido = Salário Bruto + Salário Família - INSS - IRRF - Outros Descontos'
     ]
     for item in metodologia:
@@ -609,9 +519,9 @@ with tab1:
     )
     
     if st.button("Calcular", type="primary"):
-        inss_valor = calcular_inss(salario)
-        sal_familia = calcular_salario_familia(salario, dependentes)
-        irrf_valor = calcular_irrf(salario, dependentes, inss_valor, outros_descontos)
+        inss_valor = calcular_inss(salario, competencia)
+        sal_familia = calcular_salario_familia(salario, dependentes, competencia)
+        irrf_valor = calcular_irrf(salario, dependentes, inss_valor, competencia, outros_descontos)
         
         total_descontos = inss_valor + irrf_valor + outros_descontos
         total_acrescimos = sal_familia
@@ -645,6 +555,7 @@ with tab1:
         dados_pdf = {
             "data_analise": formatar_data(data_hora_agora),
             "competencia": formatar_data(competencia),
+            "competencia_obj": competencia,
             "nome": nome,
             "salario_bruto": formatar_moeda(salario),
             "dependentes": dependentes,
@@ -691,6 +602,11 @@ with tab2:
         key="opcao_entrada"
     )
     
+    # Competência cujas tabelas são aplicadas a todo o lote
+    competencia_lote = st.date_input("Competência Analisada (Aplicável a todo o lote)", 
+                                     value=get_br_datetime_now().date().replace(day=1),
+                                     format="DD/MM/YYYY", key="competencia_lote")
+    
     # Template para download
     template_data = {
         'Nome': ['João Silva', 'Maria Santos', 'Pedro Oliveira', 'Ana Costa', 'Carlos Lima'],
@@ -756,6 +672,8 @@ with tab2:
                     else:
                         sheet_id = sheets_url
                     
+                    import urllib.parse
+
                     sheet_name_encoded = urllib.parse.quote(sheet_name)
                     csv_url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name_encoded}"
                     
@@ -828,12 +746,12 @@ with tab2:
                         dependentes = int(row['Dependentes'])
                         outros_desc = float(row.get('Outros_Descontos', 0))
                         
-                        inss = calcular_inss(salario_bruto)
-                        sal_familia = calcular_salario_familia(salario_bruto, dependentes)
-                        irrf = calcular_irrf(salario_bruto, dependentes, inss, outros_desc)
+                        inss = calcular_inss(salario_bruto, competencia_lote)
+                        sal_familia = calcular_salario_familia(salario_bruto, dependentes, competencia_lote)
+                        irrf = calcular_irrf(salario_bruto, dependentes, inss, competencia_lote, outros_desc)
                         salario_liquido = salario_bruto + sal_familia - inss - irrf - outros_desc
                         
-                        resultados.append({'Nome': row['Nome'], 'Salario_Bruto': salario_bruto, 'Dependentes': dependentes, 'Salario_Familia': sal_familia, 'INSS': inss, 'IRRF': irrf, 'Outros_Descontos': outros_desc, 'Salario_Liquido': salario_liquido, 'Elegivel_Salario_Familia': 'Sim' if sal_familia > 0 else 'Não'})
+                        resultados.append({'Nome': row['Nome'], 'Salario_Bruto': salario_bruto, 'Dependentes': dependentes, 'Salario_Familia': sal_familia, 'INSS': inss, 'IRRF': irrf, 'Outros_Descontos': outros_desc, 'Salario_Liquido': salario_liquido, 'Elegivel_Salario_Familia': 'Sim' if sal_familia > 0 else 'Não', 'Competencia': competencia_lote})
                     
                     df_resultado = pd.DataFrame(resultados)
                     st.session_state.df_resultado = df_resultado
@@ -860,7 +778,7 @@ with tab2:
         df_display = df_resultado.copy()
         colunas_monetarias = ['Salario_Bruto', 'Salario_Familia', 'INSS', 'IRRF', 'Outros_Descontos', 'Salario_Liquido']
         for coluna in colunas_monetarias:
-            df_display[coluna] = df_display[coluna].apply(formatar_moeda)
+            df_display[coluna] = formatar_moeda_coluna(df_display[coluna])
         st.dataframe(df_display, use_container_width=True)
         
         st.subheader("📊 Resumo Financeiro")
@@ -882,10 +800,8 @@ with tab2:
         col_csv, col_pdf = st.columns(2)
         
         with col_csv:
-            df_csv = df_resultado.copy()
-            for coluna in colunas_monetarias:
-                df_csv[coluna] = df_csv[coluna].apply(lambda x: f"{x:.2f}".replace('.', ','))
-            csv_resultado = df_csv.to_csv(index=False, sep=';')
+            # Colunas monetárias com 2 casas e vírgula decimal (Excel/sistemas), formatadas coluna a coluna
+            csv_resultado = resultado_para_csv(df_resultado.astype({coluna: float for coluna in colunas_monetarias}))
             st.download_button(label="📥 Baixar CSV",data=csv_resultado,file_name=f"auditoria_folha_{get_br_datetime_now().strftime('%d%m%Y_%H%M')}.csv",mime="text/csv",help="Baixe os resultados em CSV (separador ponto e vírgula, decimal vírgula)")
         
         with col_pdf:
@@ -913,52 +829,52 @@ with tab2:
                         st.error(f"❌ Erro ao gerar PDF: {e}")
 
 with tab3:
-    st.header("Informações Técnicas 2025")
+    # Tabelas em vigor no mês atual
+    tabela_inss_atual, tabela_irrf_atual, limite_sf_atual, valor_sf_atual, ano_base_atual, irrf_periodo_atual, _ = selecionar_tabelas(
+        get_br_datetime_now().date().replace(day=1)
+    )
+    st.header(f"Informações Técnicas {ano_base_atual}")
     
     col_info1, col_info2 = st.columns(2)
     
     with col_info1:
         st.subheader("💰 Salário Família & Dedução IR")
         st.write(f"""
-        - **Limite Salário Família:** {formatar_moeda(SALARIO_FAMILIA_LIMITE)}
-        - **Valor por Dependente (Sal. Fam):** {formatar_moeda(VALOR_POR_DEPENDENTE)}
+        - **Limite Salário Família:** {formatar_moeda(limite_sf_atual)}
+        - **Valor por Dependente (Sal. Fam):** {formatar_moeda(valor_sf_atual)}
         - **Dedução IR por Dependente:** {formatar_moeda(DESCONTO_DEPENDENTE_IR)}
         - **Requisito:** Salário **<=** ao limite (para Salário Família)
         """)
         
         st.subheader("📋 Como Calcular - Salário Família")
         st.code(f"""
-Se Salário Bruto <= {formatar_moeda(SALARIO_FAMILIA_LIMITE)}:
-    Salário Família = Nº Dependentes × {formatar_moeda(VALOR_POR_DEPENDENTE)}
+Se Salário Bruto <= {formatar_moeda(limite_sf_atual)}:
+    Salário Família = Nº Dependentes × {formatar_moeda(valor_sf_atual)}
 Senão:
     Salário Família = R$ 0,00
         """)
     
     with col_info2:
-        st.subheader("📊 Tabela INSS 2025 (Alíquota Efetiva)")
+        st.subheader(f"📊 Tabela INSS {ano_base_atual} (Alíquota Efetiva)")
         tabela_inss_df = pd.DataFrame([
-            {"Faixa": "1ª", "Salário de Contribuição": "Até " + formatar_moeda(1518.00), "Alíquota": "7,5%"},
-            {"Faixa": "2ª", "Salário de Contribuição": formatar_moeda(1518.01) + " a " + formatar_moeda(2793.88), "Alíquota": "9,0%"},
-            {"Faixa": "3ª", "Salário de Contribuição": formatar_moeda(2793.89) + " a " + formatar_moeda(4190.83), "Alíquota": "12,0%"},
-            {"Faixa": "4ª", "Salário de Contribuição": formatar_moeda(4190.84) + " a " + formatar_moeda(8157.41), "Alíquota": "14,0%"}
+            {"Faixa": f"{i}ª", "Salário de Contribuição": faixa, "Alíquota": aliquota}
+            for i, (faixa, aliquota, _) in enumerate(faixas_inss(tabela_inss_atual), start=1)
         ])
         st.dataframe(tabela_inss_df, use_container_width=True, hide_index=True)
-        st.caption(f"**Teto máximo do INSS:** {formatar_moeda(8157.41)}")
+        st.caption(f"**Teto máximo do INSS:** {formatar_moeda(tabela_inss_atual[-1]['limite'])}")
         
+        primeira_faixa, segunda_faixa = tabela_inss_atual[:2]
         st.subheader("📋 Como Calcular - INSS")
-        st.code("""
+        st.code(f"""
 Fórmula Progressiva (Alíquota Efetiva):
     Soma dos valores calculados sobre cada faixa
-    (Ex: R$ 1.518,00 * 7,5% + (R$ 2.793,88 - R$ 1.518,00) * 9% + ...)
+    (Ex: {formatar_moeda(primeira_faixa['limite'])} * {_percentual(primeira_faixa['aliquota'])} + ({formatar_moeda(segunda_faixa['limite'])} - {formatar_moeda(primeira_faixa['limite'])}) * {_percentual(segunda_faixa['aliquota'])} + ...)
         """)
 
-    st.subheader("📈 Tabela IRRF 2025")
+    st.subheader(f"📈 Tabela IRRF ({irrf_periodo_atual})")
     tabela_irrf_df = pd.DataFrame([
-        {"Faixa": "1ª", "Base de Cálculo": "Até " + formatar_moeda(2428.80), "Alíquota": "0%", "Parcela a Deduzir": formatar_moeda(0.00)},
-        {"Faixa": "2ª", "Base de Cálculo": formatar_moeda(2428.81) + " a " + formatar_moeda(2826.65), "Alíquota": "7,5%", "Parcela a Deduzir": formatar_moeda(182.16)},
-        {"Faixa": "3ª", "Base de Cálculo": formatar_moeda(2826.66) + " a " + formatar_moeda(3751.05), "Alíquota": "15%", "Parcela a Deduzir": formatar_moeda(394.16)},
-        {"Faixa": "4ª", "Base de Cálculo": formatar_moeda(3751.06) + " a " + formatar_moeda(4664.68), "Alíquota": "22,5%", "Parcela a Deduzir": formatar_moeda(675.49)},
-        {"Faixa": "5ª", "Base de Cálculo": "Acima de " + formatar_moeda(4664.68), "Alíquota": "27,5%", "Parcela a Deduzir": formatar_moeda(916.90)}
+        {"Faixa": f"{i}ª", "Base de Cálculo": base, "Alíquota": aliquota, "Parcela a Deduzir": deducao}
+        for i, (base, aliquota, deducao, _) in enumerate(faixas_irrf(tabela_irrf_atual), start=1)
     ])
     st.dataframe(tabela_irrf_df, use_container_width=True, hide_index=True)
     
@@ -1,12 +1,23 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 from datetime import datetime, date
-from zoneinfo import ZoneInfo
-from fpdf import FPDF
-import base64
-from io import BytesIO
-import urllib.parse
-import locale
+
+from folha import (
+    DESCONTO_DEPENDENTE_IR,
+    VIGENCIAS_IRRF,
+    calcular_inss,
+    calcular_irrf,
+    calcular_salario_familia,
+    cobertura_vigencias,
+    detalhar_faixas,
+    formatar_moeda_coluna,
+    preparar_entrada,
+    processar_lote,
+    resultado_para_csv,
+    selecionar_tabelas,
+    selecionar_tabelas_simuladas,
+)
 
 # Configuração básica da página
 st.set_page_config(
@@ -15,15 +26,6 @@ st.set_page_config(
     layout="wide"
 )
 
-# Configurar locale para formatação de moeda em algumas plataformas
-try:
-    locale.setlocale(locale.LC_ALL, 'pt_BR.UTF-8')
-except locale.Error:
-    try:
-        locale.setlocale(locale.LC_ALL, 'pt_BR')
-    except locale.Error:
-        pass
-
 # INICIALIZAR SESSION STATE
 if 'df_resultado' not in st.session_state:
     st.session_state.df_resultado = None
@@ -42,81 +44,8 @@ st.title("💰 Auditoria de Folha de Pagamento - Ana Clara")
 st.markdown("### Cálculo de Salário Família, INSS e IRRF")
 
 # --- TABELAS LEGAIS ---
-
-# Datas de Referência
-DATA_INICIO_2024_IRRF = date(2024, 2, 1)
-DATA_INICIO_2025_IRRF = date(2025, 5, 1)
-
-# --- Salário Família & Dedução IR ---
-DESCONTO_DEPENDENTE_IR = 189.59 
-
-# --- NOVO: Salário Família 2023 ---
-SF_LIMITE_2023 = 1754.18  # Valor aproximado baseado no salário mínimo de 2023 (R$ 1.320,00)
-SF_VALOR_2023 = 56.47     # Valor por dependente em 2023
-
-# Salário Família 2024
-SF_LIMITE_2024 = 1819.26
-SF_VALOR_2024 = 62.04
-
-# Salário Família 2025
-SF_LIMITE_2025 = 1906.04
-SF_VALOR_2025 = 65.00
-
-# --- Tabela INSS ---
-# NOVA: Tabela INSS 2023
-TABELA_INSS_2023 = [
-    {"limite": 1320.00, "aliquota": 0.075},
-    {"limite": 2571.29, "aliquota": 0.09},
-    {"limite": 3856.94, "aliquota": 0.12},
-    {"limite": 7507.49, "aliquota": 0.14}
-]
-
-TABELA_INSS_2024 = [
-    {"limite": 1412.00, "aliquota": 0.075},
-    {"limite": 2666.68, "aliquota": 0.09},
-    {"limite": 4000.03, "aliquota": 0.12},
-    {"limite": 7786.02, "aliquota": 0.14}
-]
-
-TABELA_INSS_2025 = [
-    {"limite": 1518.00, "aliquota": 0.075},
-    {"limite": 2793.88, "aliquota": 0.09},
-    {"limite": 4190.83, "aliquota": 0.12},
-    {"limite": 8157.41, "aliquota": 0.14}
-]
-
-# --- Desconto Simplificado (Opcional) ---
-# Para 2023: 25% de 2.112,00 = 528,00
-DS_MAX_2023 = 528.00
-DS_MAX_FEV2024_ABR2025 = 564.80 
-DS_MAX_MAI2025_DEZ2025 = 607.20 
-
-# --- Tabela IRRF 2023 (01/05/2023 a 31/01/2024) ---
-TABELA_IRRF_2023_JAN2024 = [
-    {"limite": 2112.00, "aliquota": 0.0, "deducao": 0.00},
-    {"limite": 2826.65, "aliquota": 0.075, "deducao": 158.40},
-    {"limite": 3751.05, "aliquota": 0.15, "deducao": 370.40},
-    {"limite": 4664.68, "aliquota": 0.225, "deducao": 651.73},
-    {"limite": float('inf'), "aliquota": 0.275, "deducao": 884.96}
-]
-
-# --- Tabela IRRF (01/02/2024 a 30/04/2025 - MP 1.206/2024) ---
-TABELA_IRRF_FEV2024_ABR2025 = [
-    {"limite": 2259.20, "aliquota": 0.0, "deducao": 0.00},
-    {"limite": 2826.65, "aliquota": 0.075, "deducao": 169.44},
-    {"limite": 3751.05, "aliquota": 0.15, "deducao": 381.44},
-    {"limite": 4664.68, "aliquota": 0.225, "deducao": 662.77},
-    {"limite": float('inf'), "aliquota": 0.275, "deducao": 896.00}
-]
-
-# --- Tabela IRRF (01/05/2025 em diante - MP 1.294/2025) ---
-TABELA_IRRF_MAI2025_DEZ2025 = [
-    {"limite": 2428.80, "aliquota": 0.0, "deducao": 0.0},
-    {"limite": 2826.65, "aliquota": 0.075, "deducao": 182.16},
-    {"limite": 3751.05, "aliquota": 0.15, "deducao": 394.16},
-    {"limite": 4664.68, "aliquota": 0.225, "deducao": 675.49},
-    {"limite": float('inf'), "aliquota": 0.275, "deducao": 908.73} 
-]
+# As tabelas de INSS/IRRF/Salário Família, o Desconto Simplificado e a
+# seleção por competência vêm do registro de vigências do pacote `folha`.
 
 # --- FUNÇÕES DE UTILIDADE ---
 
@@ -136,6 +65,8 @@ def formatar_data(data):
 
 def get_br_datetime_now():
     """Retorna o objeto datetime configurado para o fuso horário de São Paulo (BRT/GMT-3)"""
+    from zoneinfo import ZoneInfo
+
     return datetime.now(ZoneInfo("America/Sao_Paulo"))
 
 def criar_link_download_pdf(pdf_output, filename):
@@ -143,159 +74,19 @@ def criar_link_download_pdf(pdf_output, filename):
     if isinstance(pdf_output, str):
         pdf_output = pdf_output.encode('latin1')
         
+    import base64
+
     b64 = base64.b64encode(pdf_output).decode('utf-8')
     
     href = f'<a href="data:application/octet-stream;base64,{b64}" download="{filename}">📄 Clique aqui para baixar o PDF</a>'
     return href
 
-# --- FUNÇÕES PARA SIMULAÇÃO ANO ANTERIOR ---
-
-def selecionar_tabelas_ano_anterior(competencia: date):
-    """
-    Seleciona as tabelas do ano anterior para simulação.
-    Para 2024 -> 2023, para 2025 -> 2024
-    """
-    ano_anterior = competencia.year - 1
-    
-    if ano_anterior == 2023:
-        tabela_inss = TABELA_INSS_2023
-        limite_sf = SF_LIMITE_2023
-        valor_sf = SF_VALOR_2023
-        ano_base = "2023"
-        # Para 2023, usamos a tabela IRRF de 2023
-        tabela_irrf = TABELA_IRRF_2023_JAN2024
-        irrf_periodo = "01/05/2023 a 31/01/2024"
-        ds_maximo = DS_MAX_2023
-    elif ano_anterior == 2024:
-        tabela_inss = TABELA_INSS_2024
-        limite_sf = SF_LIMITE_2024
-        valor_sf = SF_VALOR_2024
-        ano_base = "2024"
-        # Para simulação com 2024 em 2025, usamos a tabela IRRF de 2024
-        tabela_irrf = TABELA_IRRF_FEV2024_ABR2025
-        irrf_periodo = "01/02/2024 a 30/04/2025 (MP 1.206/2024)"
-        ds_maximo = DS_MAX_FEV2024_ABR2025
-    else:
-        # Fallback para o ano atual se não houver tabela específica
-        return selecionar_tabelas(competencia)
-        
-    return tabela_inss, tabela_irrf, limite_sf, valor_sf, ano_base, irrf_periodo, ds_maximo
-
-def selecionar_tabelas(competencia: date):
-    """
-    Seleciona as tabelas de INSS, IRRF e parâmetros de Salário Família e Desconto Simplificado
-    com base na competência.
-    """
-    
-    # Lógica INSS e Salário Família (Baseada no ano)
-    if competencia.year == 2023:
-        tabela_inss = TABELA_INSS_2023
-        limite_sf = SF_LIMITE_2023
-        valor_sf = SF_VALOR_2023
-        ano_base = "2023"
-    elif competencia.year == 2024:
-        tabela_inss = TABELA_INSS_2024
-        limite_sf = SF_LIMITE_2024
-        valor_sf = SF_VALOR_2024
-        ano_base = "2024"
-    else: # 2025 ou anos seguintes
-        tabela_inss = TABELA_INSS_2025
-        limite_sf = SF_LIMITE_2025
-        valor_sf = SF_VALOR_2025
-        ano_base = "2025"
-
-    # Lógica IRRF (Baseada na data específica)
-    if competencia >= DATA_INICIO_2025_IRRF:
-        tabela_irrf = TABELA_IRRF_MAI2025_DEZ2025
-        irrf_periodo = "01/05/2025 em diante (MP 1.294/2025)"
-        ds_maximo = DS_MAX_MAI2025_DEZ2025
-    elif competencia >= DATA_INICIO_2024_IRRF:
-        tabela_irrf = TABELA_IRRF_FEV2024_ABR2025
-        irrf_periodo = "01/02/2024 a 30/04/2025 (MP 1.206/2024)"
-        ds_maximo = DS_MAX_FEV2024_ABR2025
-    else: # Antes de 01/02/2024
-        tabela_irrf = TABELA_IRRF_2023_JAN2024
-        irrf_periodo = "01/05/2023 a 31/01/2024"
-        ds_maximo = DS_MAX_2023 
-        
-    return tabela_inss, tabela_irrf, limite_sf, valor_sf, ano_base, irrf_periodo, ds_maximo
-
-def calcular_irrf_base(base_calculo, tabela_irrf):
-    """Calcula o IRRF dado uma base de cálculo específica."""
-    if base_calculo <= 0:
-        return 0.0
-    
-    irrf = 0.0
-    for faixa in tabela_irrf:
-        if base_calculo <= faixa["limite"]:
-            irrf = (base_calculo * faixa["aliquota"]) - faixa["deducao"]
-            return max(round(irrf, 2), 0.0)
-    
-    return 0.0
-
-def calcular_inss(salario_bruto, tabela_inss):
-    """Calcula desconto do INSS com base na tabela progressiva fornecida."""
-    if salario_bruto <= 0:
-        return 0.0
-    
-    teto_inss = tabela_inss[-1]["limite"]
-    salario_calculo = min(salario_bruto, teto_inss)
-    inss = 0.0
-    salario_restante = salario_calculo
-    
-    for i, faixa in enumerate(tabela_inss):
-        if salario_restante <= 0:
-            break
-            
-        if i == 0:
-            valor_faixa = min(salario_restante, faixa["limite"])
-            inss += valor_faixa * faixa["aliquota"]
-            salario_restante -= valor_faixa
-        else:
-            faixa_anterior = tabela_inss[i-1]
-            limite_faixa = faixa["limite"] - faixa_anterior["limite"]
-            
-            valor_faixa = min(salario_restante, limite_faixa)
-            inss += valor_faixa * faixa["aliquota"]
-            salario_restante -= valor_faixa
-    
-    return round(inss, 2)
-
-def calcular_salario_familia(salario, dependentes, limite_sf, valor_sf):
-    """Calcula salário família com base nos parâmetros de limite e valor por dependente."""
-    if salario <= limite_sf:
-        return dependentes * valor_sf
-    return 0.0
-
-def calcular_irrf(salario_bruto, dependentes, inss, outros_descontos, tabela_irrf, ds_maximo):
-    """
-    Calcula IRRF comparando o Desconto Legal com o Desconto Simplificado
-    e utilizando o método mais benéfico.
-    """
-    
-    # 1. CÁLCULO LEGAL (Padrão)
-    deducao_legal = (dependentes * DESCONTO_DEPENDENTE_IR) + inss + outros_descontos
-    base_legal = salario_bruto - deducao_legal
-    irrf_legal = calcular_irrf_base(base_legal, tabela_irrf)
-    
-    # 2. CÁLCULO SIMPLIFICADO (Simulando a forma mais benéfica encontrada em sites)
-    deducao_simplificada_valor = ds_maximo
-    base_simplificada_site = salario_bruto - deducao_simplificada_valor
-    irrf_simplificado_site = calcular_irrf_base(base_simplificada_site, tabela_irrf)
-    
-    # 3. ESCOLHA DO MAIS BENÉFICO (Menor IRRF)
-    
-    if irrf_legal <= irrf_simplificado_site:
-        return irrf_legal, "Legal", base_legal, deducao_legal
-    else:
-        return irrf_simplificado_site, "Simplificado", base_simplificada_site, deducao_simplificada_valor
-
 # --- FUNÇÃO PARA CALCULAR SIMULAÇÃO ANO ANTERIOR ---
 def calcular_simulacao_ano_anterior(salario, dependentes, outros_descontos, competencia):
     """
     Calcula uma simulação usando as tabelas do ano anterior
     """
-    tabela_inss_anterior, tabela_irrf_anterior, limite_sf_anterior, valor_sf_anterior, ano_base_anterior, irrf_periodo_anterior, ds_maximo_anterior = selecionar_tabelas_ano_anterior(competencia)
+    tabela_inss_anterior, tabela_irrf_anterior, limite_sf_anterior, valor_sf_anterior, ano_base_anterior, irrf_periodo_anterior, ds_maximo_anterior = selecionar_tabelas_simuladas(competencia)
     
     inss_anterior = calcular_inss(salario, tabela_inss_anterior)
     sal_familia_anterior = calcular_salario_familia(salario, dependentes, limite_sf_anterior, valor_sf_anterior)
@@ -324,6 +115,8 @@ def calcular_simulacao_ano_anterior(salario, dependentes, outros_descontos, comp
 
 def gerar_pdf_individual(dados, obs):
     """Gera PDF profissional para cálculo individual (MODIFICADO para incluir OBS e DEDUÇÃO)"""
+    from fpdf import FPDF
+
     pdf = FPDF()
     pdf.add_page()
     
@@ -449,22 +242,17 @@ def gerar_pdf_individual(dados, obs):
     pdf.cell(30, 6, 'Alíquota', 1)
     pdf.cell(0, 6, 'Valor Máx. na Faixa', 1, 1)
     
+    # Detalhamento das faixas calculado uma vez por tabela (memoizado em folha)
     faixas_inss = []
-    limite_anterior = 0.0
-    for i, faixa in enumerate(tabela_inss_referencia):
-        limite = faixa["limite"]
-        aliquota_percentual = f"{faixa['aliquota'] * 100:.1f}%"
+    for i, (limite_anterior, limite, aliquota, _, valor_maximo) in enumerate(detalhar_faixas(tabela_inss_referencia)):
+        aliquota_percentual = f"{aliquota * 100:.1f}%"
         
         if i == 0:
             faixa_desc = f'Até {formatar_moeda(limite)}'
-            valor_max_faixa = formatar_moeda(limite * faixa["aliquota"])
         else:
-            faixa_anterior = tabela_inss_referencia[i-1]
             faixa_desc = f'{formatar_moeda(limite_anterior + 0.01)} a {formatar_moeda(limite)}'
-            valor_max_faixa = formatar_moeda((limite - limite_anterior) * faixa["aliquota"])
             
-        faixas_inss.append((faixa_desc, aliquota_percentual, valor_max_faixa))
-        limite_anterior = limite
+        faixas_inss.append((faixa_desc, aliquota_percentual, formatar_moeda(valor_maximo)))
         
     for faixa, aliquota, valor in faixas_inss:
         pdf.cell(60, 6, faixa, 1)
@@ -485,11 +273,8 @@ def gerar_pdf_individual(dados, obs):
     pdf.cell(0, 6, 'Faixa', 1, 1)
     
     faixas_irrf = []
-    limite_anterior = 0.0
-    for i, faixa in enumerate(tabela_irrf_referencia):
-        limite = faixa["limite"]
-        aliquota_percentual = f"{faixa['aliquota'] * 100:.1f}%" if faixa['aliquota'] > 0 else '0%'
-        deducao = formatar_moeda(faixa["deducao"])
+    for i, (limite_anterior, limite, aliquota, deducao, _) in enumerate(detalhar_faixas(tabela_irrf_referencia)):
+        aliquota_percentual = f"{aliquota * 100:.1f}%" if aliquota > 0 else '0%'
         
         if limite == float('inf'):
             base_desc = f'Acima de {formatar_moeda(limite_anterior)}'
@@ -501,8 +286,7 @@ def gerar_pdf_individual(dados, obs):
             base_desc = f'{formatar_moeda(limite_anterior + 0.01)} a {formatar_moeda(limite)}'
             faixa_num = f'{i+1}ª'
             
-        faixas_irrf.append((base_desc, aliquota_percentual, deducao, faixa_num))
-        limite_anterior = limite
+        faixas_irrf.append((base_desc, aliquota_percentual, formatar_moeda(deducao), faixa_num))
     
     for base, aliquota, deducao, faixa in faixas_irrf:
         pdf.cell(60, 6, base, 1)
@@ -563,6 +347,8 @@ def gerar_pdf_auditoria_completa(df_resultado, uploaded_filename, total_salario_
     Gera PDF com o resumo da auditoria em lote e os dados detalhados.
     """
     # Usando orientação Paisagem (L) para caber mais colunas
+    from fpdf import FPDF
+
     pdf = FPDF(orientation='L', unit='mm', format='A4')
     pdf.add_page()
 
@@ -962,6 +748,8 @@ with tab2:
                     else:
                         sheet_id = sheets_url
                     
+                    import urllib.parse
+
                     sheet_name_encoded = urllib.parse.quote(sheet_name)
                     # URL de exportação direta como CSV
                     csv_url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name_encoded}"
@@ -1022,49 +810,16 @@ with tab2:
     if df is not None and not df.empty:
         try:
             # Garante a conversão correta de tipos
-            df['Salario_Bruto'] = pd.to_numeric(df['Salario_Bruto'], errors='coerce').fillna(0)
-            df['Dependentes'] = pd.to_numeric(df['Dependentes'], errors='coerce').fillna(0).astype(int)
-            if 'Outros_Descontos' in df.columns:
-                df['Outros_Descontos'] = pd.to_numeric(df['Outros_Descontos'], errors='coerce').fillna(0)
-            else:
-                df['Outros_Descontos'] = 0.0
+            df = preparar_entrada(df)
             
             if st.button("🚀 Processar Auditoria Completa", type="primary", key="processar_auditoria"):
                 with st.spinner("Processando auditoria..."):
                     
-                    # Seleciona as tabelas APENAS UMA VEZ para o lote
-                    tabela_inss_aplicada, tabela_irrf_aplicada, limite_sf_aplicado, valor_sf_aplicado, ano_base, irrf_periodo, ds_maximo = selecionar_tabelas(competencia_lote)
+                    # Tabelas do registro em vigor na competência (as mesmas do cálculo em lote)
+                    _, _, _, _, ano_base, irrf_periodo, _ = selecionar_tabelas(competencia_lote)
 
-                    resultados = []
-                    for _, row in df.iterrows():
-                        salario_bruto = float(row['Salario_Bruto'])
-                        dependentes = int(row['Dependentes'])
-                        outros_desc = float(row.get('Outros_Descontos', 0))
-                        
-                        # Usa as tabelas selecionadas
-                        inss = calcular_inss(salario_bruto, tabela_inss_aplicada)
-                        sal_familia = calcular_salario_familia(salario_bruto, dependentes, limite_sf_aplicado, valor_sf_aplicado)
-                        
-                        # Calcula IRRF e DEDUÇÃO MAIS BENÉFICA
-                        irrf, metodo_deducao, base_irrf_valor, valor_deducao = calcular_irrf(salario_bruto, dependentes, inss, outros_desc, tabela_irrf_aplicada, ds_maximo)
-                        
-                        salario_liquido = salario_bruto + sal_familia - inss - irrf - outros_desc
-                        
-                        resultados.append({
-                            'Nome': row['Nome'], 
-                            'Salario_Bruto': salario_bruto, 
-                            'Dependentes': dependentes, 
-                            'Salario_Familia': sal_familia, 
-                            'INSS': inss, 
-                            'IRRF': irrf, 
-                            'Outros_Descontos': outros_desc, 
-                            'Salario_Liquido': salario_liquido, 
-                            'Elegivel_Salario_Familia': 'Sim' if sal_familia > 0 else 'Não', 
-                            'Competencia': competencia_lote,
-                            'Metodo_Deducao': metodo_deducao
-                        })
-                        
-                    df_resultado = pd.DataFrame(resultados)
+                    # Cálculo vetorizado sobre as colunas inteiras
+                    df_resultado = processar_lote(df, competencia_lote)
                     st.session_state.df_resultado = df_resultado
                     st.session_state.uploaded_filename = uploaded_filename
                     st.session_state.processar_sheets = False # Reseta a flag do Sheets
@@ -1093,8 +848,9 @@ with tab2:
         st.subheader("📈 Resultados da Auditoria")
         df_display = df_resultado.copy()
         colunas_monetarias = ['Salario_Bruto', 'Salario_Familia', 'INSS', 'IRRF', 'Outros_Descontos', 'Salario_Liquido']
+        df_display.insert(df_display.columns.get_loc('Competencia'), 'Elegivel_Salario_Familia', np.where(df_resultado['Salario_Familia'] > 0, 'Sim', 'Não'))
         for coluna in colunas_monetarias:
-            df_display[coluna] = df_display[coluna].apply(formatar_moeda)
+            df_display[coluna] = formatar_moeda_coluna(df_display[coluna])
         
         st.dataframe(
             df_display.drop(columns=['Competencia']).rename(columns={'Metodo_Deducao': 'Ded. IR'}), 
@@ -1120,11 +876,8 @@ with tab2:
         col_csv, col_pdf = st.columns(2)
         
         with col_csv:
-            df_csv = df_resultado.copy()
-            # Garante que o CSV usa vírgula como decimal para facilitar a abertura no Excel/sistemas
-            for coluna in colunas_monetarias:
-                df_csv[coluna] = df_csv[coluna].apply(lambda x: f"{x:.2f}".replace('.', ','))
-            csv_resultado = df_csv.to_csv(index=False, sep=';', encoding='utf-8')
+            # Colunas monetárias com 2 casas e vírgula decimal (Excel/sistemas), formatadas coluna a coluna
+            csv_resultado = resultado_para_csv(df_resultado.astype({coluna: float for coluna in colunas_monetarias}))
             st.download_button(label="📥 Baixar CSV",data=csv_resultado,file_name=f"auditoria_folha_{get_br_datetime_now().strftime('%d%m%Y_%H%M')}.csv",mime="text/csv",help="Baixe os resultados em CSV (separador ponto e vírgula, decimal vírgula)")
         
         with col_pdf:
@@ -1150,16 +903,22 @@ with tab3:
     st.markdown("### 📊 Tabelas Legais - INSS e IRRF")
     
     st.subheader("📅 Regra de Vigência (Competência)")
-    st.info("""
+    cobertura = cobertura_vigencias()
+    st.info(f"""
     O sistema utiliza as seguintes tabelas com base na **Competência Analisada**:
-    - **INSS/Salário Família:** Selecionado pelo ano (2023, 2024 ou 2025).
-    - **IRRF:** Selecionado pela data específica da competência (três períodos de vigência).
+    - **INSS/Salário Família:** Selecionado pela data de início de vigência de cada tabela (INSS de {cobertura['inss']}; Salário Família de {cobertura['salario_familia']}).
+    - **IRRF:** Selecionado pela data específica da competência ({cobertura['irrf_periodos']} períodos de vigência a partir de {cobertura['irrf_inicio']}; competências anteriores usam a primeira tabela como fallback).
     - **Dedução IRRF:** O sistema compara o Desconto Legal (INSS + Ded. Dependente) com o Desconto Simplificado Opcional e aplica o que resultar no **menor imposto**.
     - **Simulação Ano Anterior:** Permite comparar os cálculos atuais com as tabelas do ano anterior.
     """)
     
     col_info1, col_info2 = st.columns(2)
     
+    limites_desconto_simplificado = "\n        ".join(
+        f"- **Vigência {periodo}:** Máximo de **{formatar_moeda(ds_maximo)}**"
+        for _, _, ds_maximo, periodo, _ in VIGENCIAS_IRRF
+    )
+
     with col_info1:
         st.subheader("💰 Regras de Dedução IRRF")
         st.markdown(f"""
@@ -1167,9 +926,7 @@ with tab3:
         - **Fórmula:** Salário Bruto - INSS - (Dependentes * {formatar_moeda(DESCONTO_DEPENDENTE_IR)}) - Outros Descontos
         
         #### **Desconto Simplificado Opcional**
-        - **2023:** Máximo de **{formatar_moeda(DS_MAX_2023)}**
-        - **Vigência 01/02/2024 a 30/04/2025:** Máximo de **{formatar_moeda(DS_MAX_FEV2024_ABR2025)}**
-        - **Vigência 01/05/2025 em diante:** Máximo de **{formatar_moeda(DS_MAX_MAI2025_DEZ2025)}**
+        {limites_desconto_simplificado}
         - **Fórmula:** Salário Bruto - Desconto Simplificado (Valor Máximo)
         
         *O sistema escolhe o método que resulta no **menor imposto**.*
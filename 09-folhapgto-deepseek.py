@@ -1,11 +1,17 @@
 import streamlit as st
 import pandas as pd
 from datetime import datetime
-from zoneinfo import ZoneInfo
-from fpdf import FPDF
-import base64
-from io import BytesIO
-import urllib.parse
+
+import folha
+from folha import (
+    DESCONTO_DEPENDENTE_IR,
+    VIGENCIAS_SALARIO_FAMILIA,
+    cobertura_vigencias,
+    detalhar_faixas,
+    formatar_moeda_coluna,
+    resultado_para_csv,
+    selecionar_tabelas,
+)
 
 # Configuração básica da página
 st.set_page_config(
@@ -27,79 +33,19 @@ if 'ultima_opcao' not in st.session_state:
 st.title("💰 Auditoria de Folha de Pagamento - Ana Clara")
 st.markdown("### Cálculo de Salário Família, INSS e IRRF")
 
-# --- DETECTAR ANO DA COMPETÊNCIA ---
-def obter_tabelas_por_ano(ano_competencia):
-    """Retorna as tabelas corretas baseadas no ano da competência"""
-    
-    if ano_competencia == 2024:
-        # --- TABELAS 2024 (ATUALIZADAS CONFORME MP 1.206/2024) ---
-        SALARIO_FAMILIA_LIMITE = 1819.26
-        VALOR_POR_DEPENDENTE = 62.04
-        DESCONTO_DEPENDENTE_IR = 189.59
-
-        # Tabela INSS 2024
-        TABELA_INSS = [
-            {"limite": 1412.00, "aliquota": 0.075},
-            {"limite": 2666.68, "aliquota": 0.09},
-            {"limite": 4000.03, "aliquota": 0.12},
-            {"limite": 7786.02, "aliquota": 0.14}
-        ]
-
-        # Tabela IRRF 2024 - CORRIGIDA conforme MP 1.206/2024
-        TABELA_IRRF = [
-            {"limite": 2259.20, "aliquota": 0.0, "deducao": 0.0},
-            {"limite": 2826.65, "aliquota": 0.075, "deducao": 169.44},
-            {"limite": 3751.05, "aliquota": 0.15, "deducao": 381.44},
-            {"limite": 4664.68, "aliquota": 0.225, "deducao": 662.77},
-            {"limite": float('inf'), "aliquota": 0.275, "deducao": 896.00}
-        ]
-        
-        TETO_INSS = 908.85
-        
-        return {
-            'SALARIO_FAMILIA_LIMITE': SALARIO_FAMILIA_LIMITE,
-            'VALOR_POR_DEPENDENTE': VALOR_POR_DEPENDENTE,
-            'DESCONTO_DEPENDENTE_IR': DESCONTO_DEPENDENTE_IR,
-            'TABELA_INSS': TABELA_INSS,
-            'TABELA_IRRF': TABELA_IRRF,
-            'TETO_INSS': TETO_INSS,
-            'ANO': 2024
-        }
-    
-    else:  # 2025 (valores mantidos do código original)
-        # --- TABELAS 2025 ---
-        SALARIO_FAMILIA_LIMITE = 1906.04
-        VALOR_POR_DEPENDENTE = 65.00
-        DESCONTO_DEPENDENTE_IR = 189.59
-
-        # Tabela INSS 2025
-        TABELA_INSS = [
-            {"limite": 1518.00, "aliquota": 0.075},
-            {"limite": 2793.88, "aliquota": 0.09},
-            {"limite": 4190.83, "aliquota": 0.12},
-            {"limite": 8157.41, "aliquota": 0.14}
-        ]
-
-        # Tabela IRRF 2025
-        TABELA_IRRF = [
-            {"limite": 2428.80, "aliquota": 0.0, "deducao": 0.0},
-            {"limite": 2826.65, "aliquota": 0.075, "deducao": 182.16},
-            {"limite": 3751.05, "aliquota": 0.15, "deducao": 394.16},
-            {"limite": 4664.68, "aliquota": 0.225, "deducao": 675.49},
-            {"limite": float('inf'), "aliquota": 0.275, "deducao": 916.90}
-        ]
-        
-        TETO_INSS = 8157.41 * 0.14  # Teto calculado
-        
-        return {
-            'SALARIO_FAMILIA_LIMITE': SALARIO_FAMILIA_LIMITE,
-            'VALOR_POR_DEPENDENTE': VALOR_POR_DEPENDENTE,
-            'DESCONTO_DEPENDENTE_IR': DESCONTO_DEPENDENTE_IR,
-            'TABELA_INSS': TABELA_INSS,
-            'TABELA_IRRF': TABELA_IRRF,
-            'TETO_INSS': TETO_INSS,
-            'ANO': 2025
-        }
+# --- TABELAS DA COMPETÊNCIA (registro de vigências do pacote `folha`) ---
+def obter_tabelas(competencia):
+    """Retorna as tabelas em vigor na competência, no formato usado pela página"""
+    tabela_inss, tabela_irrf, limite_sf, valor_sf, ano_base, irrf_periodo, _ = selecionar_tabelas(competencia)
+    return {
+        'SALARIO_FAMILIA_LIMITE': limite_sf,
+        'VALOR_POR_DEPENDENTE': valor_sf,
+        'DESCONTO_DEPENDENTE_IR': DESCONTO_DEPENDENTE_IR,
+        'TABELA_INSS': tabela_inss,
+        'TABELA_IRRF': tabela_irrf,
+        'ANO': ano_base,
+        'IRRF_PERIODO': irrf_periodo,
+    }
 
 # --- FUNÇÕES DE UTILIDADE ---
 
@@ -117,58 +63,53 @@ def formatar_data(data):
 
 def get_br_datetime_now():
     """Retorna o objeto datetime configurado para o fuso horário de São Paulo (BRT/GMT-3)"""
+    from zoneinfo import ZoneInfo
+
     return datetime.now(ZoneInfo("America/Sao_Paulo"))
 
 # --- FUNÇÕES DE CÁLCULO ---
 
-def calcular_inss(salario_bruto, tabela_inss, teto_inss):
+def calcular_inss(salario_bruto, tabela_inss):
     """Calcula desconto do INSS com a tabela correta (progressiva)"""
-    if salario_bruto <= 0:
-        return 0.0
-    
-    salario_calculo = min(salario_bruto, tabela_inss[3]["limite"])
-    inss = 0.0
-    salario_restante = salario_calculo
-    
-    for i, faixa in enumerate(tabela_inss):
-        if salario_restante <= 0:
-            break
-            
-        if i == 0:
-            valor_faixa = min(salario_restante, faixa["limite"])
-            inss += valor_faixa * faixa["aliquota"]
-            salario_restante -= valor_faixa
-        else:
-            faixa_anterior = tabela_inss[i-1]
-            limite_faixa = faixa["limite"] - faixa_anterior["limite"]
-            
-            valor_faixa = min(salario_restante, limite_faixa)
-            inss += valor_faixa * faixa["aliquota"]
-            salario_restante -= valor_faixa
-    
-    return round(inss, 2)
+    return folha.calcular_inss(salario_bruto, tabela_inss)
 
 def calcular_salario_familia(salario, dependentes, salario_familia_limite, valor_por_dependente):
     """Calcula salário família"""
-    if salario <= salario_familia_limite:
-        return dependentes * valor_por_dependente
-    return 0.0
+    return folha.calcular_salario_familia(salario, dependentes, salario_familia_limite, valor_por_dependente)
 
 def calcular_irrf(salario_bruto, dependentes, inss, desconto_dependente_ir, tabela_irrf, outros_descontos=0):
     """Calcula IRRF"""
     # Base = Salário Bruto - Dedução por Dependente - INSS - Outros Descontos
     base_calculo = salario_bruto - (dependentes * desconto_dependente_ir) - inss - outros_descontos
-    
-    if base_calculo <= 0:
-        return 0.0
-    
-    irrf = 0.0
-    for faixa in tabela_irrf:
-        if base_calculo <= faixa["limite"]:
-            irrf = (base_calculo * faixa["aliquota"]) - faixa["deducao"]
-            return max(round(irrf, 2), 0.0)
-    
-    return 0.0
+    return folha.calcular_irrf_base(base_calculo, tabela_irrf)
+
+# --- TABELAS PARA EXIBIÇÃO ---
+
+def _percentual(aliquota, casas=None):
+    """Alíquota no formato brasileiro (0,075 -> '7,5%')."""
+    texto = f"{aliquota * 100:.{casas}f}" if casas is not None else f"{aliquota * 100:g}"
+    return texto.replace('.', ',') + '%'
+
+def faixas_inss(tabela_inss):
+    """Linhas (faixa salarial, alíquota, valor máximo na faixa) de uma tabela INSS."""
+    linhas = []
+    for i, (limite_anterior, limite, aliquota, _, valor_maximo) in enumerate(detalhar_faixas(tabela_inss)):
+        faixa = f'Até {formatar_moeda(limite)}' if i == 0 else f'{formatar_moeda(limite_anterior + 0.01)} a {formatar_moeda(limite)}'
+        linhas.append((faixa, _percentual(aliquota, casas=1), formatar_moeda(valor_maximo)))
+    return linhas
+
+def faixas_irrf(tabela_irrf):
+    """Linhas (base de cálculo, alíquota, parcela a deduzir, faixa) de uma tabela IRRF."""
+    linhas = []
+    for i, (limite_anterior, limite, aliquota, deducao, _) in enumerate(detalhar_faixas(tabela_irrf)):
+        if i == 0:
+            base = f'Até {formatar_moeda(limite)}'
+        elif limite == float('inf'):
+            base = f'Acima de {formatar_moeda(limite_anterior)}'
+        else:
+            base = f'{formatar_moeda(limite_anterior + 0.01)} a {formatar_moeda(limite)}'
+        linhas.append((base, _percentual(aliquota), formatar_moeda(deducao), f'{i}ª' if i else 'Isento'))
+    return linhas
 
 # --- FUNÇÕES DE GERAÇÃO DE PDF ---
 
@@ -180,6 +121,8 @@ def criar_link_download_pdf(pdf_output, filename):
     if isinstance(pdf_output, str):
         pdf_output = pdf_output.encode('latin1')
         
+    import base64
+
     b64 = base64.b64encode(pdf_output).decode('utf-8')
     
     href = f'<a href="data:application/octet-stream;base64,{b64}" download="{filename}">📄 Clique aqui para baixar o PDF</a>'
@@ -187,6 +130,8 @@ def criar_link_download_pdf(pdf_output, filename):
 
 def gerar_pdf_individual(dados, tabelas):
     """Gera PDF profissional para cálculo individual"""
+    from fpdf import FPDF
+
     pdf = FPDF()
     pdf.add_page()
     
@@ -302,24 +247,10 @@ def gerar_pdf_individual(dados, tabelas):
     pdf.cell(30, 6, 'Alíquota', 1)
     pdf.cell(0, 6, 'Valor Máx. na Faixa', 1, 1)
     
-    if ano == 2024:
-        faixas_inss = [
-            (f'Até {formatar_moeda(1412.00)}', '7,5%', formatar_moeda(1412.00 * 0.075)),
-            (f'{formatar_moeda(1412.01)} a {formatar_moeda(2666.68)}', '9,0%', formatar_moeda((2666.68 - 1412.00) * 0.09)),
-            (f'{formatar_moeda(2666.69)} a {formatar_moeda(4000.03)}', '12,0%', formatar_moeda((4000.03 - 2666.68) * 0.12)),
-            (f'{formatar_moeda(4000.04)} a {formatar_moeda(7786.02)}', '14,0%', formatar_moeda((7786.02 - 4000.03) * 0.14))
-        ]
-        teto_inss = formatar_moeda(908.85)
-    else:  # 2025
-        faixas_inss = [
-            (f'Até {formatar_moeda(1518.00)}', '7,5%', formatar_moeda(1518.00 * 0.075)),
-            (f'{formatar_moeda(1518.01)} a {formatar_moeda(2793.88)}', '9,0%', formatar_moeda((2793.88 - 1518.00) * 0.09)),
-            (f'{formatar_moeda(2793.89)} a {formatar_moeda(4190.83)}', '12,0%', formatar_moeda((4190.83 - 2793.88) * 0.12)),
-            (f'{formatar_moeda(4190.84)} a {formatar_moeda(8157.41)}', '14,0%', formatar_moeda((8157.41 - 4190.83) * 0.14))
-        ]
-        teto_inss = formatar_moeda(8157.41)
+    faixas_inss_ano = faixas_inss(tabelas['TABELA_INSS'])
+    teto_inss = formatar_moeda(tabelas['TABELA_INSS'][-1]['limite'])
     
-    for faixa, aliquota, valor in faixas_inss:
+    for faixa, aliquota, valor in faixas_inss_ano:
         pdf.cell(60, 6, faixa, 1)
         pdf.cell(30, 6, aliquota, 1)
         pdf.cell(0, 6, valor, 1, 1)
@@ -330,31 +261,16 @@ def gerar_pdf_individual(dados, tabelas):
     
     # Tabela IRRF
     pdf.set_font('Arial', 'B', 10)
-    pdf.cell(0, 8, f'TABELA IRRF {ano}', 0, 1)
+    pdf.cell(0, 8, f'TABELA IRRF ({tabelas["IRRF_PERIODO"]})', 0, 1)
     pdf.set_font('Arial', '', 8)
     pdf.cell(60, 6, 'Base de Cálculo', 1)
     pdf.cell(25, 6, 'Alíquota', 1)
     pdf.cell(35, 6, 'Parcela a Deduzir', 1)
     pdf.cell(0, 6, 'Faixa', 1, 1)
     
-    if ano == 2024:
-        faixas_irrf = [
-            (f'Até {formatar_moeda(2259.20)}', '0%', formatar_moeda(0), 'Isento'),
-            (f'{formatar_moeda(2259.21)} a {formatar_moeda(2826.65)}', '7,5%', formatar_moeda(169.44), '1ª'),
-            (f'{formatar_moeda(2826.66)} a {formatar_moeda(3751.05)}', '15%', formatar_moeda(381.44), '2ª'),
-            (f'{formatar_moeda(3751.06)} a {formatar_moeda(4664.68)}', '22,5%', formatar_moeda(662.77), '3ª'),
-            (f'Acima de {formatar_moeda(4664.68)}', '27,5%', formatar_moeda(896.00), '4ª')
-        ]
-    else:  # 2025
-        faixas_irrf = [
-            (f'Até {formatar_moeda(2428.80)}', '0%', formatar_moeda(0), 'Isento'),
-            (f'{formatar_moeda(2428.81)} a {formatar_moeda(2826.65)}', '7,5%', formatar_moeda(182.16), '1ª'),
-            (f'{formatar_moeda(2826.66)} a {formatar_moeda(3751.05)}', '15%', formatar_moeda(394.16), '2ª'),
-            (f'{formatar_moeda(3751.06)} a {formatar_moeda(4664.68)}', '22,5%', formatar_moeda(675.49), '3ª'),
-            (f'Acima de {formatar_moeda(4664.68)}', '27,5%', formatar_moeda(916.90), '4ª')
-        ]
+    faixas_irrf_ano = faixas_irrf(tabelas['TABELA_IRRF'])
     
-    for base, aliquota, deducao, faixa in faixas_irrf:
+    for base, aliquota, deducao, faixa in faixas_irrf_ano:
         pdf.cell(60, 6, base, 1)
         pdf.cell(25, 6, aliquota, 1)
         pdf.cell(35, 6, deducao, 1)
@@ -372,7 +288,7 @@ def gerar_pdf_individual(dados, tabelas):
     pdf.cell(0, 6, 'LEGISLAÇÃO DE REFERÊNCIA', 0, 1)
     pdf.set_font('Arial', '', 9)
     
-    if ano == 2024:
+    if ano == '2024':
         legislacao = [
             '- Salário Família: Lei 8.213/1991',
             '- INSS: Lei 8.212/1991 e Portaria Interministerial MPS/MF nº 2/2024',
@@ -420,6 +336,8 @@ def gerar_pdf_individual(dados, tabelas):
 
 def gerar_pdf_auditoria_completa(df_resultado, uploaded_filename, total_salario_familia, total_inss, total_irrf, folha_liquida_total, tabelas, observacoes=""):
     """Gera PDF para auditoria completa"""
+    from fpdf import FPDF
+
     pdf = FPDF()
     pdf.add_page()
     
@@ -562,24 +480,10 @@ def gerar_pdf_auditoria_completa(df_resultado, uploaded_filename, total_salario_
     pdf.cell(30, 6, 'Alíquota', 1)
     pdf.cell(0, 6, 'Valor Máx. na Faixa', 1, 1)
     
-    if ano == 2024:
-        faixas_inss = [
-            (f'Até {formatar_moeda(1412.00)}', '7,5%', formatar_moeda(1412.00 * 0.075)),
-            (f'{formatar_moeda(1412.01)} a {formatar_moeda(2666.68)}', '9,0%', formatar_moeda((2666.68 - 1412.00) * 0.09)),
-            (f'{formatar_moeda(2666.69)} a {formatar_moeda(4000.03)}', '12,0%', formatar_moeda((4000.03 - 2666.68) * 0.12)),
-            (f'{formatar_moeda(4000.04)} a {formatar_moeda(7786.02)}', '14,0%', formatar_moeda((7786.02 - 4000.03) * 0.14))
-        ]
-        teto_inss = formatar_moeda(908.85)
-    else:  # 2025
-        faixas_inss = [
-            (f'Até {formatar_moeda(1518.00)}', '7,5%', formatar_moeda(1518.00 * 0.075)),
-            (f'{formatar_moeda(1518.01)} a {formatar_moeda(2793.88)}', '9,0%', formatar_moeda((2793.88 - 1518.00) * 0.09)),
-            (f'{formatar_moeda(2793.89)} a {formatar_moeda(4190.83)}', '12,0%', formatar_moeda((4190.83 - 2793.88) * 0.12)),
-            (f'{formatar_moeda(4190.84)} a {formatar_moeda(8157.41)}', '14,0%', formatar_moeda((8157.41 - 4190.83) * 0.14))
-        ]
-        teto_inss = formatar_moeda(8157.41)
+    faixas_inss_ano = faixas_inss(tabelas['TABELA_INSS'])
+    teto_inss = formatar_moeda(tabelas['TABELA_INSS'][-1]['limite'])
     
-    for faixa, aliquota, valor in faixas_inss:
+    for faixa, aliquota, valor in faixas_inss_ano:
         pdf.cell(60, 6, faixa, 1)
         pdf.cell(30, 6, aliquota, 1)
         pdf.cell(0, 6, valor, 1, 1)
@@ -590,31 +494,16 @@ def gerar_pdf_auditoria_completa(df_resultado, uploaded_filename, total_salario_
     
     # Tabela IRRF
     pdf.set_font('Arial', 'B', 10)
-    pdf.cell(0, 8, f'TABELA IRRF {ano}', 0, 1)
+    pdf.cell(0, 8, f'TABELA IRRF ({tabelas["IRRF_PERIODO"]})', 0, 1)
     pdf.set_font('Arial', '', 8)
     pdf.cell(60, 6, 'Base de Cálculo', 1)
     pdf.cell(25, 6, 'Alíquota', 1)
     pdf.cell(35, 6, 'Parcela a Deduzir', 1)
     pdf.cell(0, 6, 'Faixa', 1, 1)
     
-    if ano == 2024:
-        faixas_irrf = [
-            (f'Até {formatar_moeda(2259.20)}', '0%', formatar_moeda(0), 'Isento'),
-            (f'{formatar_moeda(2259.21)} a {formatar_moeda(2826.65)}', '7,5%', formatar_moeda(169.44), '1ª'),
-            (f'{formatar_moeda(2826.66)} a {formatar_moeda(3751.05)}', '15%', formatar_moeda(381.44), '2ª'),
-            (f'{formatar_moeda(3751.06)} a {formatar_moeda(4664.68)}', '22,5%', formatar_moeda(662.77), '3ª'),
-            (f'Acima de {formatar_moeda(4664.68)}', '27,5%', formatar_moeda(896.00), '4ª')
-        ]
-    else:  # 2025
-        faixas_irrf = [
-            (f'Até {formatar_moeda(2428.80)}', '0%', formatar_moeda(0), 'Isento'),
-            (f'{formatar_moeda(2428.81)} a {formatar_moeda(2826.65)}', '7,5%', formatar_moeda(182.16), '1ª'),
-            (f'{formatar_moeda(2826.66)} a {formatar_moeda(3751.05)}', '15%', formatar_moeda(394.16), '2ª'),
-            (f'{formatar_moeda(3751.06)} a {formatar_moeda(4664.68)}', '22,5%', formatar_moeda(675.49), '3ª'),
-            (f'Acima de {formatar_moeda(4664.68)}', '27,5%', formatar_moeda(916.90), '4ª')
-        ]
+    faixas_irrf_ano = faixas_irrf(tabelas['TABELA_IRRF'])
     
-    for base, aliquota, deducao, faixa in faixas_irrf:
+    for base, aliquota, deducao, faixa in faixas_irrf_ano:
         pdf.cell(60, 6, base, 1)
         pdf.cell(25, 6, aliquota, 1)
         pdf.cell(35, 6, deducao, 1)
@@ -632,7 +521,7 @@ def gerar_pdf_auditoria_completa(df_resultado, uploaded_filename, total_salario_
     pdf.cell(0, 6, 'LEGISLAÇÃO DE REFERÊNCIA', 0, 1)
     pdf.set_font('Arial', '', 9)
     
-    if ano == 2024:
+    if ano == '2024':
         legislacao = [
             '- Salário Família: Lei 8.213/1991',
             '- INSS: Lei 8.212/1991 e Portaria Interministerial MPS/MF nº 2/2024',
@@ -717,11 +606,10 @@ with tab1:
     )
     
     if st.button("Calcular", type="primary"):
-        # Obter tabelas conforme ano da competência
-        ano_competencia = competencia.year
-        tabelas = obter_tabelas_por_ano(ano_competencia)
+        # Obter tabelas em vigor na competência
+        tabelas = obter_tabelas(competencia)
         
-        inss_valor = calcular_inss(salario, tabelas['TABELA_INSS'], tabelas['TETO_INSS'])
+        inss_valor = calcular_inss(salario, tabelas['TABELA_INSS'])
         sal_familia = calcular_salario_familia(salario, dependentes, tabelas['SALARIO_FAMILIA_LIMITE'], tabelas['VALOR_POR_DEPENDENTE'])
         irrf_valor = calcular_irrf(salario, dependentes, inss_valor, tabelas['DESCONTO_DEPENDENTE_IR'], tabelas['TABELA_IRRF'], outros_descontos)
         
@@ -875,6 +763,8 @@ with tab2:
                     else:
                         sheet_id = sheets_url
                     
+                    import urllib.parse
+
                     sheet_name_encoded = urllib.parse.quote(sheet_name)
                     csv_url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name_encoded}"
                     
@@ -941,9 +831,8 @@ with tab2:
             
             if st.button("🚀 Processar Auditoria Completa", type="primary", key="processar_auditoria"):
                 with st.spinner("Processando auditoria..."):
-                    # Obter tabelas conforme ano da competência
-                    ano_competencia = competencia_lote.year
-                    tabelas = obter_tabelas_por_ano(ano_competencia)
+                    # Obter tabelas em vigor na competência
+                    tabelas = obter_tabelas(competencia_lote)
                     
                     resultados = []
                     for _, row in df.iterrows():
@@ -951,7 +840,7 @@ with tab2:
                         dependentes = int(row['Dependentes'])
                         outros_desc = float(row.get('Outros_Descontos', 0))
                         
-                        inss = calcular_inss(salario_bruto, tabelas['TABELA_INSS'], tabelas['TETO_INSS'])
+                        inss = calcular_inss(salario_bruto, tabelas['TABELA_INSS'])
                         sal_familia = calcular_salario_familia(salario_bruto, dependentes, tabelas['SALARIO_FAMILIA_LIMITE'], tabelas['VALOR_POR_DEPENDENTE'])
                         irrf = calcular_irrf(salario_bruto, dependentes, inss, tabelas['DESCONTO_DEPENDENTE_IR'], tabelas['TABELA_IRRF'], outros_desc)
                         salario_liquido = salario_bruto + sal_familia - inss - irrf - outros_desc
@@ -987,7 +876,7 @@ with tab2:
         df_display = df_resultado.copy()
         colunas_monetarias = ['Salario_Bruto', 'Salario_Familia', 'INSS', 'IRRF', 'Outros_Descontos', 'Salario_Liquido']
         for coluna in colunas_monetarias:
-            df_display[coluna] = df_display[coluna].apply(formatar_moeda)
+            df_display[coluna] = formatar_moeda_coluna(df_display[coluna])
         st.dataframe(df_display, use_container_width=True)
         
         st.subheader("📊 Resumo Financeiro")
@@ -1009,10 +898,8 @@ with tab2:
         col_csv, col_pdf = st.columns(2)
         
         with col_csv:
-            df_csv = df_resultado.copy()
-            for coluna in colunas_monetarias:
-                df_csv[coluna] = df_csv[coluna].apply(lambda x: f"{x:.2f}".replace('.', ','))
-            csv_resultado = df_csv.to_csv(index=False, sep=';')
+            # Colunas monetárias com 2 casas e vírgula decimal (Excel/sistemas), formatadas coluna a coluna
+            csv_resultado = resultado_para_csv(df_resultado.astype({coluna: float for coluna in colunas_monetarias}))
             st.download_button(label="📥 Baixar CSV",data=csv_resultado,file_name=f"auditoria_folha_{get_br_datetime_now().strftime('%d%m%Y_%H%M')}.csv",mime="text/csv",help="Baixe os resultados em CSV (separador ponto e vírgula, decimal vírgula)")
         
         with col_pdf:
@@ -1042,31 +929,29 @@ with tab2:
 with tab3:
     st.header("Informações Técnicas")
     
-    st.info("""
+    cobertura = cobertura_vigencias()
+    st.info(f"""
     **🔍 Sistema de Detecção Automática:**
-    O sistema detecta automaticamente o ano da competência e aplica as tabelas corretas:
-    - **2024:** Tabelas atualizadas conforme MP 1.206/2024
-    - **2025:** Tabelas projetadas (valores estimados)
+    O sistema aplica as tabelas em vigor na competência, pela data de início de vigência de cada uma:
+    - **INSS:** {cobertura['inss']}; **Salário Família:** {cobertura['salario_familia']}
+    - **IRRF:** {cobertura['irrf_periodos']} períodos de vigência a partir de {cobertura['irrf_inicio']}
     """)
     
+    # Tabelas em vigor no mês atual
+    tabelas_atuais = obter_tabelas(get_br_datetime_now().date().replace(day=1))
+    
     col_info1, col_info2 = st.columns(2)
     
     with col_info1:
         st.subheader("💰 Salário Família & Dedução IR")
         
-        # Mostrar valores para ambos os anos
-        st.write("**2024:**")
-        st.write(f"""
-        - Limite Salário Família: {formatar_moeda(1819.26)}
-        - Valor por Dependente: {formatar_moeda(62.04)}
-        - Dedução IR por Dependente: {formatar_moeda(189.59)}
-        """)
-        
-        st.write("**2025:**")
-        st.write(f"""
-        - Limite Salário Família: {formatar_moeda(1906.04)}
-        - Valor por Dependente: {formatar_moeda(65.00)}
-        - Dedução IR por Dependente: {formatar_moeda(189.59)}
+        # Valores de cada vigência do Salário Família
+        for inicio, limite_sf, valor_sf in VIGENCIAS_SALARIO_FAMILIA:
+            st.write(f"**A partir de {formatar_data(inicio)}:**")
+            st.write(f"""
+        - Limite Salário Família: {formatar_moeda(limite_sf)}
+        - Valor por Dependente: {formatar_moeda(valor_sf)}
+        - Dedução IR por Dependente: {formatar_moeda(DESCONTO_DEPENDENTE_IR)}
         """)
         
         st.subheader("📋 Como Calcular - Salário Família")
@@ -1078,32 +963,29 @@ Senão:
         """)
     
     with col_info2:
-        st.subheader("📊 Tabela INSS 2024")
-        tabela_inss_2024_df = pd.DataFrame([
-            {"Faixa": "1ª", "Salário de Contribuição": "Até " + formatar_moeda(1412.00), "Alíquota": "7,5%"},
-            {"Faixa": "2ª", "Salário de Contribuição": formatar_moeda(1412.01) + " a " + formatar_moeda(2666.68), "Alíquota": "9,0%"},
-            {"Faixa": "3ª", "Salário de Contribuição": formatar_moeda(2666.69) + " a " + formatar_moeda(4000.03), "Alíquota": "12,0%"},
-            {"Faixa": "4ª", "Salário de Contribuição": formatar_moeda(4000.04) + " a " + formatar_moeda(7786.02), "Alíquota": "14,0%"}
+        tabela_inss_atual = tabelas_atuais['TABELA_INSS']
+        st.subheader(f"📊 Tabela INSS {tabelas_atuais['ANO']}")
+        tabela_inss_atual_df = pd.DataFrame([
+            {"Faixa": f"{i}ª", "Salário de Contribuição": faixa, "Alíquota": aliquota}
+            for i, (faixa, aliquota, _) in enumerate(faixas_inss(tabela_inss_atual), start=1)
         ])
-        st.dataframe(tabela_inss_2024_df, use_container_width=True, hide_index=True)
-        st.caption(f"**Teto máximo do INSS 2024:** {formatar_moeda(908.85)}")
+        st.dataframe(tabela_inss_atual_df, use_container_width=True, hide_index=True)
+        st.caption(f"**Teto máximo do INSS {tabelas_atuais['ANO']}:** {formatar_moeda(tabela_inss_atual[-1]['limite'])}")
         
+        primeira_faixa, segunda_faixa = tabela_inss_atual[:2]
         st.subheader("📋 Como Calcular - INSS")
-        st.code("""
+        st.code(f"""
 Fórmula Progressiva (Aliquota Efetiva):
     Soma dos valores calculados sobre cada faixa
-    (Ex: R$ 1.412,00 * 7,5% + (R$ 2.666,68 - R$ 1.412,00) * 9% + ...)
+    (Ex: {formatar_moeda(primeira_faixa['limite'])} * {_percentual(primeira_faixa['aliquota'])} + ({formatar_moeda(segunda_faixa['limite'])} - {formatar_moeda(primeira_faixa['limite'])}) * {_percentual(segunda_faixa['aliquota'])} + ...)
         """)
 
-    st.subheader("📈 Tabela IRRF 2024 (MP 1.206/2024)")
-    tabela_irrf_2024_df = pd.DataFrame([
-        {"Faixa": "1ª", "Base de Cálculo": "Até " + formatar_moeda(2259.20), "Alíquota": "0%", "Parcela a Deduzir": formatar_moeda(0.00)},
-        {"Faixa": "2ª", "Base de Cálculo": formatar_moeda(2259.21) + " a " + formatar_moeda(2826.65), "Alíquota": "7,5%", "Parcela a Deduzir": formatar_moeda(169.44)},
-        {"Faixa": "3ª", "Base de Cálculo": formatar_moeda(2826.66) + " a " + formatar_moeda(3751.05), "Alíquota": "15%", "Parcela a Deduzir": formatar_moeda(381.44)},
-        {"Faixa": "4ª", "Base de Cálculo": formatar_moeda(3751.06) + " a " + formatar_moeda(4664.68), "Alíquota": "22,5%", "Parcela a Deduzir": formatar_moeda(662.77)},
-        {"Faixa": "5ª", "Base de Cálculo": "Acima de " + formatar_moeda(4664.68), "Alíquota": "27,5%", "Parcela a Deduzir": formatar_moeda(896.00)}
+    st.subheader(f"📈 Tabela IRRF ({tabelas_atuais['IRRF_PERIODO']})")
+    tabela_irrf_atual_df = pd.DataFrame([
+        {"Faixa": f"{i}ª", "Base de Cálculo": base, "Alíquota": aliquota, "Parcela a Deduzir": deducao}
+        for i, (base, aliquota, deducao, _) in enumerate(faixas_irrf(tabelas_atuais['TABELA_IRRF']), start=1)
     ])
-    st.dataframe(tabela_irrf_2024_df, use_container_width=True, hide_index=True)
+    st.dataframe(tabela_irrf_atual_df, use_container_width=True, hide_index=True)
     
     st.subheader("📋 Como Calcular - IRRF")
     st.code("""
@@ -1,12 +1,23 @@
 import streamlit as st
 import pandas as pd
-from datetime import datetime, date
-from zoneinfo import ZoneInfo
-from fpdf import FPDF
-import base64
-from io import BytesIO
-import urllib.parse
-import locale
+from datetime import date
+import os
+
+from folha import (
+    DESCONTO_DEPENDENTE_IR,
+    calcular_inss,
+    calcular_irrf,
+    calcular_salario_familia,
+    cobertura_vigencias,
+    detalhar_faixas,
+    estatisticas_cache,
+    formatar_data,
+    formatar_moeda,
+    get_br_datetime_now,
+    preparar_entrada,
+    selecionar_tabelas,
+    selecionar_tabelas_simuladas,
+)
 
 # Configuração básica da página
 st.set_page_config(
@@ -15,15 +26,6 @@ st.set_page_config(
     layout="wide"
 )
 
-# Configurar locale para formatação de moeda em algumas plataformas
-try:
-    locale.setlocale(locale.LC_ALL, 'pt_BR.UTF-8')
-except locale.Error:
-    try:
-        locale.setlocale(locale.LC_ALL, 'pt_BR')
-    except locale.Error:
-        pass # Ignora se não conseguir configurar o locale
-
 # INICIALIZAR SESSION STATE
 if 'df_resultado' not in st.session_state:
     st.session_state.df_resultado = None
@@ -35,270 +37,35 @@ if 'ultima_opcao' not in st.session_state:
     st.session_state.ultima_opcao = "📁 Upload de CSV"
 if 'observacao_lote' not in st.session_state:
     st.session_state.observacao_lote = ""
+if 'resumo_blocos' not in st.session_state:
+    st.session_state.resumo_blocos = None
 
 st.title("💰 Auditoria de Folha de Pagamento - Ana Clara")
 st.markdown("### Cálculo de Salário Família, INSS e IRRF")
 
 # --- TABELAS LEGAIS ---
-
-# Datas de Referência
-DATA_INICIO_2024_IRRF = date(2024, 2, 1) # Início do período da MP 1.206/2024
-DATA_INICIO_2025_IRRF = date(2025, 5, 1) # Início do período da MP 1.294/2025
-DATA_INICIO_2023_IRRF = date(2023, 5, 1) # Início do período da alteração de 2023
-
-# --- Salário Família & Dedução IR ---
-DESCONTO_DEPENDENTE_IR = 189.59 
-
-# Salário Família 2025 (Padrão 2025)
-SF_LIMITE_2025 = 1906.04
-SF_VALOR_2025 = 65.00
-
-# Salário Família 2024
-SF_LIMITE_2024 = 1819.26
-SF_VALOR_2024 = 62.04
-
-# Salário Família 2023
-SF_LIMITE_2023 = 1754.18
-SF_VALOR_2023 = 59.83
-
-# --- Tabela INSS ---
-TABELA_INSS_2025 = [
-    {"limite": 1518.00, "aliquota": 0.075},
-    {"limite": 2793.88, "aliquota": 0.09},
-    {"limite": 4190.83, "aliquota": 0.12},
-    {"limite": 8157.41, "aliquota": 0.14}
-]
-
-TABELA_INSS_2024 = [
-    {"limite": 1412.00, "aliquota": 0.075},
-    {"limite": 2666.68, "aliquota": 0.09},
-    {"limite": 4000.03, "aliquota": 0.12},
-    {"limite": 7786.02, "aliquota": 0.14}
-]
-
-# Tabela INSS 2023
-TABELA_INSS_2023 = [
-    {"limite": 1320.00, "aliquota": 0.075},
-    {"limite": 2571.29, "aliquota": 0.09},
-    {"limite": 3856.94, "aliquota": 0.12},
-    {"limite": 7507.49, "aliquota": 0.14} 
-]
-
-# --- Desconto Simplificado (Opcional) ---
-DS_MAX_FEV2024_ABR2025 = 564.80 
-DS_MAX_MAI2025_DEZ2025 = 607.20 
-DS_MAX_MAI2023_JAN2024 = 528.00 
-
-# --- Tabela IRRF (01/05/2023 a 31/01/2024) ---
-TABELA_IRRF_2023_MAI2024 = [
-    {"limite": 2112.00, "aliquota": 0.0, "deducao": 0.00},
-    {"limite": 2826.65, "aliquota": 0.075, "deducao": 158.40},
-    {"limite": 3751.05, "aliquota": 0.15, "deducao": 370.40},
-    {"limite": 4664.68, "aliquota": 0.225, "deducao": 651.73},
-    {"limite": float('inf'), "aliquota": 0.275, "deducao": 884.96}
-]
-
-# --- Tabela IRRF (01/02/2024 a 30/04/2025 - MP 1.206/2024) ---
-TABELA_IRRF_FEV2024_ABR2025 = [
-    {"limite": 2259.20, "aliquota": 0.0, "deducao": 0.00},
-    {"limite": 2826.65, "aliquota": 0.075, "deducao": 169.44},
-    {"limite": 3751.05, "aliquota": 0.15, "deducao": 381.44},
-    {"limite": 4664.68, "aliquota": 0.225, "deducao": 662.77},
-    {"limite": float('inf'), "aliquota": 0.275, "deducao": 896.00}
-]
-
-# --- Tabela IRRF (01/05/2025 em diante - MP 1.294/2025) ---
-TABELA_IRRF_MAI2025_DEZ2025 = [
-    {"limite": 2428.80, "aliquota": 0.0, "deducao": 0.0},
-    {"limite": 2826.65, "aliquota": 0.075, "deducao": 182.16},
-    {"limite": 3751.05, "aliquota": 0.15, "deducao": 394.16},
-    {"limite": 4664.68, "aliquota": 0.225, "deducao": 675.49},
-    {"limite": float('inf'), "aliquota": 0.275, "deducao": 908.73} 
-]
-
+# As tabelas de INSS/IRRF/Salário Família e as funções de cálculo ficam no
+# pacote `folha`, carregado uma única vez por processo do servidor.
 
 # --- FUNÇÕES DE UTILIDADE ---
 
-def formatar_moeda(valor):
-    """Formata valor em moeda brasileira"""
-    if pd.isna(valor) or valor is None:
-        return "R$ 0,00"
-    return f"R$ {float(valor):,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
-
-def formatar_data(data):
-    """Formata data no padrão brasileiro"""
-    if isinstance(data, str):
-        return data
-    if isinstance(data, date):
-        return data.strftime("%d/%m/%Y")
-    return data.strftime("%d/%m/%Y")
-
-def get_br_datetime_now():
-    """Retorna o objeto datetime configurado para o fuso horário de São Paulo (BRT/GMT-3)"""
-    return datetime.now(ZoneInfo("America/Sao_Paulo"))
+# formatar_moeda, formatar_data e get_br_datetime_now vêm de `folha.relatorio`
 
 # --- FUNÇÃO DE DOWNLOAD DE PDF (MANTIDA) ---
 def criar_link_download_pdf(pdf_output, filename):
     """Cria link para download do PDF a partir de um objeto bytes (output do FPDF)."""
+    import base64
+
     b64 = base64.b64encode(pdf_output).decode('utf-8')
     href = f'<a href="data:application/octet-stream;base64,{b64}" download="{filename}">📄 Clique aqui para baixar o PDF</a>'
     return href
 
-# --- FUNÇÕES DE CÁLCULO (MANTIDAS) ---
-
-def selecionar_tabelas(competencia: date):
-    """
-    Seleciona as tabelas de INSS, IRRF e parâmetros de Salário Família e Desconto Simplificado
-    com base na competência.
-    """
-    
-    if competencia.year == 2025:
-        tabela_inss = TABELA_INSS_2025
-        limite_sf = SF_LIMITE_2025
-        valor_sf = SF_VALOR_2025
-        ano_base = "2025"
-    elif competencia.year == 2024:
-        tabela_inss = TABELA_INSS_2024
-        limite_sf = SF_LIMITE_2024
-        valor_sf = SF_VALOR_2024
-        ano_base = "2024"
-    else: 
-        tabela_inss = TABELA_INSS_2023
-        limite_sf = SF_LIMITE_2023
-        valor_sf = SF_VALOR_2023
-        ano_base = "2023"
-
-    if competencia >= DATA_INICIO_2025_IRRF:
-        tabela_irrf = TABELA_IRRF_MAI2025_DEZ2025
-        irrf_periodo = "01/05/2025 em diante (MP 1.294/2025)"
-        ds_maximo = DS_MAX_MAI2025_DEZ2025
-    elif competencia >= DATA_INICIO_2024_IRRF:
-        tabela_irrf = TABELA_IRRF_FEV2024_ABR2025
-        irrf_periodo = "01/02/2024 a 30/04/2025 (MP 1.206/2024)"
-        ds_maximo = DS_MAX_FEV2024_ABR2025
-    elif competencia >= DATA_INICIO_2023_IRRF: 
-        tabela_irrf = TABELA_IRRF_2023_MAI2024
-        irrf_periodo = "01/05/2023 a 31/01/2024 (Tabela 2023)"
-        ds_maximo = DS_MAX_MAI2023_JAN2024
-    else: 
-        tabela_irrf = TABELA_IRRF_2023_MAI2024
-        irrf_periodo = "Tabelas Antigas (Utilizando 2023 como Referência)"
-        ds_maximo = DS_MAX_MAI2023_JAN2024
-        
-    return tabela_inss, tabela_irrf, limite_sf, valor_sf, ano_base, irrf_periodo, ds_maximo
-
-def selecionar_tabelas_simuladas(competencia: date):
-    """
-    Seleciona as tabelas do ano **anterior** à competência.
-    """
-    ano_simulado = competencia.year - 1
-    
-    if ano_simulado == 2024:
-        tabela_inss = TABELA_INSS_2024
-        limite_sf = SF_LIMITE_2024
-        valor_sf = SF_VALOR_2024
-        ano_base = "2024 (Simulação)"
-    elif ano_simulado == 2023:
-        tabela_inss = TABELA_INSS_2023
-        limite_sf = SF_LIMITE_2023
-        valor_sf = SF_VALOR_2023
-        ano_base = "2023 (Simulação)"
-    else: 
-        tabela_inss = TABELA_INSS_2023
-        limite_sf = SF_LIMITE_2023
-        valor_sf = SF_VALOR_2023
-        ano_base = f"{ano_simulado} (Simulação - Fallback 2023)"
-
-    if ano_simulado >= 2024:
-        tabela_irrf = TABELA_IRRF_FEV2024_ABR2025 
-        irrf_periodo = "01/02/2024 a 30/04/2025 (Simulação)"
-        ds_maximo = DS_MAX_FEV2024_ABR2025
-    elif ano_simulado == 2023:
-        tabela_irrf = TABELA_IRRF_2023_MAI2024 
-        irrf_periodo = "01/05/2023 a 31/01/2024 (Simulação)"
-        ds_maximo = DS_MAX_MAI2023_JAN2024
-    else: 
-        tabela_irrf = TABELA_IRRF_2023_MAI2024 
-        irrf_periodo = f"IRRF {ano_simulado} (Simulação - Fallback 2023)"
-        ds_maximo = DS_MAX_MAI2023_JAN2024
-
-    return tabela_inss, tabela_irrf, limite_sf, valor_sf, ano_base, irrf_periodo, ds_maximo
-
-def calcular_irrf_base(base_calculo, tabela_irrf):
-    """Calcula o IRRF dado uma base de cálculo específica."""
-    if base_calculo <= 0:
-        return 0.0
-    
-    irrf = 0.0
-    for faixa in tabela_irrf:
-        if base_calculo <= faixa["limite"]:
-            irrf = (base_calculo * faixa["aliquota"]) - faixa["deducao"]
-            return max(round(irrf, 2), 0.0)
-    
-    return 0.0
-
-def calcular_inss(salario_bruto, tabela_inss):
-    """Calcula desconto do INSS com base na tabela progressiva fornecida."""
-    if salario_bruto <= 0:
-        return 0.0
-    
-    teto_inss = tabela_inss[-1]["limite"]
-    salario_calculo = min(salario_bruto, teto_inss)
-    inss = 0.0
-    salario_restante = salario_calculo
-    
-    for i, faixa in enumerate(tabela_inss):
-        if salario_restante <= 0:
-            break
-            
-        if i == 0:
-            valor_faixa = min(salario_restante, faixa["limite"])
-            inss += valor_faixa * faixa["aliquota"]
-            salario_restante -= valor_faixa
-        else:
-            faixa_anterior = tabela_inss[i-1]
-            limite_faixa = faixa["limite"] - faixa_anterior["limite"]
-            
-            valor_faixa = min(salario_restante, limite_faixa)
-            inss += valor_faixa * faixa["aliquota"]
-            salario_restante -= valor_faixa
-    
-    return round(inss, 2)
-
-def calcular_salario_familia(salario, dependentes, limite_sf, valor_sf):
-    """Calcula salário família com base nos parâmetros de limite e valor por dependente."""
-    if salario <= limite_sf:
-        return dependentes * valor_sf
-    return 0.0
-
-def calcular_irrf(salario_bruto, dependentes, inss, outros_descontos, tabela_irrf, ds_maximo):
-    """
-    Calcula IRRF comparando o Desconto Legal com o Desconto Simplificado
-    e utilizando o método mais benéfico.
-    """
-    
-    # 1. CÁLCULO LEGAL (Padrão)
-    deducao_legal = (dependentes * DESCONTO_DEPENDENTE_IR) + inss + outros_descontos
-    base_legal = salario_bruto - deducao_legal
-    irrf_legal = calcular_irrf_base(base_legal, tabela_irrf)
-    
-    # 2. CÁLCULO SIMPLIFICADO (Simulando a forma mais benéfica encontrada em sites)
-    deducao_simplificada_valor = ds_maximo
-    base_simplificada_site = salario_bruto - deducao_simplificada_valor
-    irrf_simplificado_site = calcular_irrf_base(base_simplificada_site, tabela_irrf)
-    
-    # 3. ESCOLHA DO MAIS BENÉFICO (Menor IRRF)
-    
-    if irrf_legal <= irrf_simplificado_site:
-        return irrf_legal, "Legal", base_legal, deducao_legal
-    else:
-        # Retorna o cálculo do Desconto Simplificado que foi mais benéfico
-        return irrf_simplificado_site, "Simplificado", base_simplificada_site, deducao_simplificada_valor
-
 # --- FUNÇÕES DE GERAÇÃO DE PDF (CORRIGIDAS E ATUALIZADAS) ---
 
 def gerar_pdf_individual(dados, obs):
     """Gera PDF profissional para cálculo individual com Comparativo (FINAL)."""
+    from fpdf import FPDF
+
     pdf = FPDF()
     pdf.add_page()
     
@@ -447,22 +214,17 @@ def gerar_pdf_individual(dados, obs):
     pdf.cell(30, 6, 'Alíquota', 1)
     pdf.cell(0, 6, 'Valor Máx. na Faixa', 1, 1)
     
+    # Detalhamento das faixas calculado uma vez por tabela (memoizado em folha)
     faixas_inss = []
-    limite_anterior = 0.0
-    for i, faixa in enumerate(tabela_inss_referencia):
-        limite = faixa["limite"]
-        aliquota_percentual = f"{faixa['aliquota'] * 100:.1f}%"
+    for i, (limite_anterior, limite, aliquota, _, valor_maximo) in enumerate(detalhar_faixas(tabela_inss_referencia)):
+        aliquota_percentual = f"{aliquota * 100:.1f}%"
         
         if i == 0:
             faixa_desc = f'Até {formatar_moeda(limite)}'
-            valor_max_faixa = formatar_moeda(limite * faixa["aliquota"])
         else:
-            faixa_anterior = tabela_inss_referencia[i-1]
             faixa_desc = f'{formatar_moeda(limite_anterior + 0.01)} a {formatar_moeda(limite)}'
-            valor_max_faixa = formatar_moeda((limite - limite_anterior) * faixa["aliquota"])
             
-        faixas_inss.append((faixa_desc, aliquota_percentual, valor_max_faixa))
-        limite_anterior = limite
+        faixas_inss.append((faixa_desc, aliquota_percentual, formatar_moeda(valor_maximo)))
         
     for faixa, aliquota, valor in faixas_inss:
         pdf.cell(60, 6, faixa, 1)
@@ -483,11 +245,8 @@ def gerar_pdf_individual(dados, obs):
     pdf.cell(0, 6, 'Faixa', 1, 1)
     
     faixas_irrf = []
-    limite_anterior = 0.0
-    for i, faixa in enumerate(tabela_irrf_referencia):
-        limite = faixa["limite"]
-        aliquota_percentual = f"{faixa['aliquota'] * 100:.1f}%" if faixa['aliquota'] > 0 else '0%'
-        deducao = formatar_moeda(faixa["deducao"])
+    for i, (limite_anterior, limite, aliquota, deducao, _) in enumerate(detalhar_faixas(tabela_irrf_referencia)):
+        aliquota_percentual = f"{aliquota * 100:.1f}%" if aliquota > 0 else '0%'
         
         if limite == float('inf'):
             base_desc = f'Acima de {formatar_moeda(limite_anterior)}'
@@ -499,8 +258,7 @@ def gerar_pdf_individual(dados, obs):
             base_desc = f'{formatar_moeda(limite_anterior + 0.01)} a {formatar_moeda(limite)}'
             faixa_num = f'{i+1}ª'
             
-        faixas_irrf.append((base_desc, aliquota_percentual, deducao, faixa_num))
-        limite_anterior = limite
+        faixas_irrf.append((base_desc, aliquota_percentual, formatar_moeda(deducao), faixa_num))
     
     for base, aliquota, deducao, faixa in faixas_irrf:
         pdf.cell(60, 6, base, 1)
@@ -556,163 +314,7 @@ def gerar_pdf_individual(dados, obs):
     # Retorna o output em bytes, codificado em latin1
     return pdf.output(dest='S').encode('latin1')
 
-def gerar_pdf_auditoria_completa(df_resultado, uploaded_filename, total_salario_familia, total_inss, total_irrf, folha_liquida_total, obs_lote):
-    """
-    Gera PDF com o resumo da auditoria em lote e os dados detalhados (FINAL).
-    """
-    pdf = FPDF(orientation='L', unit='mm', format='A4')
-    pdf.add_page()
-    pdf.set_font('Arial', '', 10)
-    
-    data_hora_agora = get_br_datetime_now()
-    data_hora_formatada = data_hora_agora.strftime("%d/%m/%Y %H:%M")
-    
-    competencia_lote = df_resultado['Competencia'].iloc[0]
-    _, _, _, _, ano_base, irrf_periodo, _ = selecionar_tabelas(competencia_lote)
-    
-    simulacao_ativa = 'IRRF_Sim' in df_resultado.columns
-
-    # Cabeçalho
-    pdf.set_font('Arial', 'B', 16)
-    pdf.cell(0, 10, 'RELATÓRIO DE AUDITORIA DE FOLHA DE PAGAMENTO - LOTE', 0, 1, 'C')
-    
-    pdf.set_font('Arial', '', 10)
-    pdf.cell(0, 5, f'Arquivo/Fonte: {uploaded_filename}', 0, 1)
-    pdf.cell(0, 5, f'Competência Analisada: {formatar_data(competencia_lote)}', 0, 1)
-    pdf.cell(0, 5, f'Processado em: {data_hora_formatada}', 0, 1)
-    pdf.cell(0, 5, f'Tabelas Oficiais: INSS ({ano_base}), IRRF ({irrf_periodo})', 0, 1)
-    
-    if simulacao_ativa:
-        ano_base_sim = df_resultado['Ano_Base_Sim'].iloc[0]
-        irrf_periodo_sim = df_resultado['IRRF_Periodo_Sim'].iloc[0]
-        pdf.cell(0, 5, f'Tabelas Simulação: INSS ({ano_base_sim}), IRRF ({irrf_periodo_sim})', 0, 1)
-        
-    pdf.ln(5)
-
-    # Resumo Financeiro
-    pdf.set_font('Arial', 'B', 12)
-    pdf.cell(0, 10, 'RESUMO FINANCEIRO DO LOTE', 0, 1)
-    
-    pdf.set_font('Arial', '', 10)
-    
-    resumo_headers = ['Descrição', 'Valor Oficial', 'Valor Simulado', 'Diferença'] if simulacao_ativa else ['Descrição', 'Valor Oficial']
-    col_widths_resumo = [70, 40, 40, 40] if simulacao_ativa else [70, 40]
-    
-    # Títulos
-    pdf.set_font('Arial', 'B', 10)
-    for i, header in enumerate(resumo_headers):
-        pdf.cell(col_widths_resumo[i], 7, header, 1, 0, 'C')
-    pdf.ln()
-
-    # Dados do Resumo
-    if simulacao_ativa:
-        total_salario_familia_sim = df_resultado['Salario_Familia_Sim'].sum()
-        total_inss_sim = df_resultado['INSS_Sim'].sum()
-        total_irrf_sim = df_resultado['IRRF_Sim'].sum()
-        folha_liquida_total_sim = df_resultado['Salario_Liquido_Sim'].sum()
-        
-        resumo_dados = [
-            ('Total Salário Bruto', df_resultado['Salario_Bruto'].sum(), df_resultado['Salario_Bruto'].sum()),
-            ('Total Salário Família', total_salario_familia, total_salario_familia_sim),
-            ('Total INSS Descontado', total_inss, total_inss_sim),
-            ('Total IRRF Descontado', total_irrf, total_irrf_sim),
-            ('Total Folha Líquida', folha_liquida_total, folha_liquida_total_sim),
-        ]
-    else:
-        resumo_dados = [
-            ('Total Salário Bruto', df_resultado['Salario_Bruto'].sum()),
-            ('Total Salário Família', total_salario_familia),
-            ('Total INSS Descontado', total_inss),
-            ('Total IRRF Descontado', total_irrf),
-            ('Total Folha Líquida', folha_liquida_total),
-        ]
-
-    pdf.set_font('Arial', '', 10)
-    for item in resumo_dados:
-        pdf.cell(col_widths_resumo[0], 6, item[0], 1, 0)
-        pdf.cell(col_widths_resumo[1], 6, formatar_moeda(item[1]), 1, 0, 'R')
-        
-        if simulacao_ativa:
-            delta = item[1] - item[2]
-            pdf.cell(col_widths_resumo[2], 6, formatar_moeda(item[2]), 1, 0, 'R')
-            pdf.cell(col_widths_resumo[3], 6, formatar_moeda(delta).replace('R$ ', ''), 1, 1, 'R')
-        else:
-            pdf.ln()
-            
-    pdf.ln(5)
-
-    # Observações do Lote
-    if obs_lote:
-        pdf.set_font('Arial', 'B', 12)
-        pdf.cell(0, 10, 'OBSERVAÇÕES GERAIS DO ANALISTA', 0, 1)
-        pdf.set_font('Arial', '', 10)
-        pdf.multi_cell(0, 6, obs_lote)
-        pdf.ln(5)
-
-    # Tabela de Detalhamento
-    pdf.set_font('Arial', 'B', 12)
-    pdf.cell(0, 10, 'DETALHAMENTO POR FUNCIONÁRIO', 0, 1)
-
-    df_pdf = df_resultado.copy()
-    
-    # Definição das colunas e larguras
-    if simulacao_ativa:
-        df_pdf = df_pdf[['Nome', 'Salario_Bruto', 'Dependentes', 'Salario_Familia', 'Salario_Familia_Sim', 
-                         'INSS', 'INSS_Sim', 'IRRF', 'IRRF_Sim', 'Outros_Descontos', 'Salario_Liquido', 'Salario_Liquido_Sim', 
-                         'Metodo_Deducao', 'Metodo_Deducao_Sim']]
-        df_pdf.columns = ['Nome', 'Sal. Bruto', 'Deps.', 'SF Of.', 'SF Sim.', 'INSS Of.', 'INSS Sim.', 'IRRF Of.', 'IRRF Sim.', 'Outros Desc.', 'Líq. Of.', 'Líq. Sim.', 'Ded Of.', 'Ded Sim.']
-        col_widths = [25, 17, 10, 16, 16, 16, 16, 16, 16, 16, 18, 18, 10, 10]
-    else:
-        df_pdf = df_pdf[['Nome', 'Salario_Bruto', 'Dependentes', 'Salario_Familia', 'INSS', 'IRRF', 'Outros_Descontos', 'Salario_Liquido', 'Metodo_Deducao']]
-        df_pdf.columns = ['Nome', 'Sal. Bruto', 'Deps.', 'Sal. Fam.', 'INSS', 'IRRF', 'Outros Desc.', 'Sal. Líquido', 'Ded. IR']
-        col_widths = [45, 20, 10, 20, 20, 20, 20, 20, 20]
-        
-    # Títulos da tabela
-    pdf.set_font('Arial', 'B', 8)
-    for i, header in enumerate(df_pdf.columns):
-        pdf.cell(col_widths[i], 7, header, 1, 0, 'C')
-    pdf.ln()
-
-    # Dados da tabela
-    pdf.set_font('Arial', '', 7)
-    for _, row in df_pdf.iterrows():
-        i = 0
-        
-        # Nome
-        pdf.cell(col_widths[i], 6, row[df_pdf.columns[i]], 1, 0); i += 1
-        
-        # Valores (Monetários e Dependentes/Dedução)
-        for col_name in df_pdf.columns[i:]:
-            if col_name in ['Deps.']:
-                pdf.cell(col_widths[i], 6, str(row[col_name]), 1, 0, 'C')
-            elif 'Ded' in col_name or col_name in ['Ded Of.', 'Ded Sim.', 'Ded. IR']:
-                pdf.cell(col_widths[i], 6, row[col_name], 1, 0, 'C')
-            else:
-                # Converte para float e formata como moeda 
-                valor = float(row[col_name])
-                pdf.cell(col_widths[i], 6, formatar_moeda(valor), 1, 0, 'R')
-            i += 1
-            
-        pdf.ln()
-        
-        # Se a página estiver cheia, adiciona uma nova
-        if pdf.get_y() > 185:
-            pdf.add_page()
-            pdf.set_font('Arial', 'B', 8)
-            for i, header in enumerate(df_pdf.columns):
-                pdf.cell(col_widths[i], 7, header, 1, 0, 'C')
-            pdf.ln()
-            pdf.set_font('Arial', '', 7)
-
-    pdf.ln(10)
-
-    # Rodapé Legal (REMOVIDA A FRASE SOBRE GERAÇÃO AUTOMÁTICA)
-    pdf.set_font('Arial', 'I', 8)
-    pdf.cell(0, 5, 'Consulte um contador para validação oficial dos cálculos e interpretação da legislação.', 0, 1, 'C')
-    pdf.cell(0, 5, f'Processado em: {data_hora_formatada}', 0, 1, 'C')
-
-    # Retorna o output em bytes, codificado em latin1
-    return pdf.output(dest='S').encode('latin1')
+# gerar_pdf_auditoria_completa vem de `folha.relatorio` (compartilhada com o auditor de linha de comando)
 
 # --- INTERFACE STREAMLIT (INÍCIO DA INTERFACE) ---
 
@@ -950,6 +552,7 @@ with tab2:
     
     with st.expander("📝 Estrutura do Arquivo Esperado"):
         st.dataframe(template_df, use_container_width=True)
+        st.caption("Coluna opcional **Competencia** (MM/AAAA ou DD/MM/AAAA): cada linha é calculada com as tabelas da sua competência. Linhas sem competência usam a Competência Analisada.")
         csv_template = template_df.to_csv(index=False, sep=';')
         st.download_button(
             label="📥 Baixar Template CSV",
@@ -960,6 +563,7 @@ with tab2:
     
     df = None
     uploaded_filename = "dados_manuais"
+    conteudo_entrada = None  # bytes do arquivo enviado (chave do cache de resultados)
     
     if st.session_state.ultima_opcao != opcao_entrada:
         st.session_state.df_resultado = None
@@ -967,37 +571,65 @@ with tab2:
         st.session_state.ultima_opcao = opcao_entrada
     
     if opcao_entrada == "📁 Upload de CSV":
-        st.subheader("📤 Upload de Arquivo CSV")
+        from folha import ler_entrada, processar_csv_em_blocos
+
+        st.subheader("📤 Upload de Arquivo (CSV, Parquet ou Feather)")
         uploaded_file = st.file_uploader(
-            "Escolha um arquivo CSV", 
-            type="csv",
-            help="Arquivo deve ter as colunas: Nome, Salario_Bruto, Dependentes, Outros_Descontos"
+            "Escolha um arquivo CSV, Parquet ou Feather", 
+            type=["csv", "parquet", "feather"],
+            help="Arquivo deve ter as colunas: Nome, Salario_Bruto, Dependentes, Outros_Descontos (opcional: Competencia, em MM/AAAA). Parquet e Feather são lidos já com tipos numéricos, sem conversão de texto."
         )
         
-        if uploaded_file is not None:
+        processar_em_blocos = st.checkbox(
+            "Arquivo grande: processar em blocos (streaming)",
+            value=False,
+            key="processar_em_blocos",
+            help="Lê o arquivo em blocos, grava o resultado em disco e acumula os totais do Resumo Financeiro. A memória usada não cresce com o tamanho do arquivo."
+        )
+        
+        if uploaded_file is not None and processar_em_blocos:
+            if st.button("🚀 Processar em Blocos", type="primary", key="processar_blocos"):
+                with st.spinner("Processando o arquivo em blocos..."):
+                    try:
+                        if st.session_state.resumo_blocos is not None:
+                            for arquivo_anterior in (st.session_state.resumo_blocos['arquivo_resultado'], st.session_state.resumo_blocos['arquivo_parquet']):
+                                if arquivo_anterior and os.path.exists(arquivo_anterior):
+                                    os.remove(arquivo_anterior)
+                        st.session_state.resumo_blocos = processar_csv_em_blocos(uploaded_file, competencia_lote, simular_lote_ano_anterior, gravar_parquet=True)
+                        st.session_state.uploaded_filename = uploaded_file.name
+                        st.session_state.df_resultado = None
+                    except Exception as e:
+                        st.error(f"❌ Erro ao processar arquivo em blocos: {e}")
+        
+        elif uploaded_file is not None:
             try:
-                try:
-                    # Tenta ponto e vírgula
-                    df = pd.read_csv(uploaded_file, sep=';')
-                except:
-                    # Tenta vírgula se o primeiro falhar
-                    uploaded_file.seek(0)
-                    df = pd.read_csv(uploaded_file, sep=',')
+                # Parquet/Feather pelos bytes iniciais; CSV com formato detectado por amostra (uma única leitura)
+                df = ler_entrada(uploaded_file)
+                conteudo_entrada = uploaded_file.getvalue()
                 
                 uploaded_filename = uploaded_file.name
-                st.success("✅ Arquivo CSV carregado com sucesso!")
+                st.success("✅ Arquivo carregado com sucesso!")
                 
             except Exception as e:
-                st.error(f"❌ Erro ao ler arquivo CSV: {e}")
+                st.error(f"❌ Erro ao ler arquivo: {e}")
     
     elif opcao_entrada == "🌐 Google Sheets":
+        # Cliente HTTP, asyncio e cache de abas só são carregados ao abrir esta opção
+        from folha import carregar_abas
+
         st.subheader("🔗 Integração com Google Sheets")
         st.warning("⚠️ **Aviso:** A integração com Google Sheets depende da URL pública do arquivo. Certifique-se de que o link esteja configurado para acesso irrestrito.")
         col_sheet1, col_sheet2 = st.columns([2, 1])
         with col_sheet1:
             sheets_url = st.text_input("URL do Google Sheets:",value="https://docs.google.com/spreadsheets/d/1G-O5sNYWGLDYG8JG3FXom4BpBrVFRnrxVal-LwmH9Gc/edit?usp=sharing",key="sheets_url")
         with col_sheet2:
-            sheet_name = st.text_input("Nome da Aba:",value="Página1",key="sheet_name")
+            sheet_name = st.text_input("Nome da Aba:",value="Página1",key="sheet_name",help="Para auditar várias abas juntas, separe os nomes com ponto e vírgula (ex.: Filial 1; Filial 2).")
+        
+        with st.expander("⚙️ Leitura seletiva (colunas e filtro aplicados pelo Google Sheets)"):
+            colunas_sheets = st.text_input("Colunas (letras):", value="", key="colunas_sheets", placeholder="Automático: A, B, C, D e a coluna Competência, se houver", help="Só estas colunas são baixadas, na ordem Nome, Salário Bruto, Dependentes, Outros Descontos (e Competência). Vazio: as colunas são conferidas pelo cabeçalho da aba. Colunas do cabeçalho fora da seleção são avisadas.")
+            filtro_sheets = st.text_input("Filtro de linhas (opcional):", value="", key="filtro_sheets", help="Condição da consulta do Google Sheets, com as letras das colunas. Exemplo: B > 0 and C >= 1")
+            limite_sheets = st.number_input("Limite de linhas (0 = todas):", min_value=0, value=0, step=1000, key="limite_sheets")
+            outras_planilhas = st.text_area("Outras planilhas (opcional, uma URL por linha):", value="", key="outras_planilhas", help="As mesmas abas são lidas de cada planilha, em paralelo.")
         
         if sheets_url and 'processar_sheets' not in st.session_state:
              st.session_state.processar_sheets = False
@@ -1008,29 +640,23 @@ with tab2:
         if st.session_state.processar_sheets and sheets_url:
             with st.spinner("Conectando e lendo o Google Sheets..."):
                 try:
-                    if "/d/" in sheets_url:
-                        sheet_id = sheets_url.split("/d/")[1].split("/")[0]
-                    else:
-                        sheet_id = sheets_url
-                    
-                    sheet_name_encoded = urllib.parse.quote(sheet_name)
-                    # URL de exportação direta como CSV
-                    csv_url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name_encoded}"
+                    # Aba em cache por TTL; vencido o TTL, só é relida se o conteúdo mudou.
+                    # Colunas, filtro e limite vão na consulta: só os dados auditados são baixados
+                    colunas_consulta = tuple(letra.strip().upper() for letra in colunas_sheets.split(',') if letra.strip()) or None
+                    abas_sheets = [aba.strip() for aba in sheet_name.split(';') if aba.strip()]
+                    planilhas_sheets = [sheets_url] + [url.strip() for url in outras_planilhas.splitlines() if url.strip()]
                     
-                    df = pd.read_csv(csv_url, encoding='utf-8')
+                    # Abas lidas em paralelo e concatenadas, com a coluna Origem; colunas já padronizadas
+                    df = carregar_abas(
+                        [(planilha, aba) for planilha in planilhas_sheets for aba in abas_sheets],
+                        colunas=colunas_consulta, filtro=filtro_sheets.strip() or None, limite=limite_sheets or None,
+                    )
+                    for origem, erro in df.attrs['erros_abas'].items():
+                        st.warning(f"⚠️ Aba '{origem}' ignorada: {erro}")
+                    for origem, ignoradas in df.attrs['colunas_ignoradas'].items():
+                        st.warning(f"⚠️ Aba '{origem}': colunas fora da seleção não foram lidas: {', '.join(f'{letra} ({nome})' for letra, nome in ignoradas.items())}")
                     uploaded_filename = f"Google_Sheets_{sheet_name}"
-                    st.success("✅ Conexão com Google Sheets estabelecida!")
-                    
-                    # Renomeia colunas para o padrão esperado
-                    if len(df.columns) >= 3:
-                        df.columns = ['Nome', 'Salario_Bruto', 'Dependentes'] + list(df.columns[3:])
-                        if len(df.columns) > 3:
-                            df = df.rename(columns={df.columns[3]: 'Outros_Descontos'})
-                        else:
-                            df['Outros_Descontos'] = 0.0
-                    else:
-                         st.warning("O Google Sheet precisa de pelo menos 3 colunas (Nome, Salario_Bruto, Dependentes).")
-                         df = None
+                    st.success(f"✅ Conexão com Google Sheets estabelecida! {len(df)} linhas de {df['Origem'].nunique()} aba(s).")
                 except Exception as e:
                     st.error(f"❌ Erro ao conectar com Google Sheets. Verifique a URL e se a aba '{sheet_name}' existe e está pública. Erro: {e}")
     
@@ -1073,66 +699,23 @@ with tab2:
     if df is not None and not df.empty:
         try:
             # Garante a conversão correta de tipos
-            df['Salario_Bruto'] = pd.to_numeric(df['Salario_Bruto'], errors='coerce').fillna(0)
-            df['Dependentes'] = pd.to_numeric(df['Dependentes'], errors='coerce').fillna(0).astype(int)
-            if 'Outros_Descontos' in df.columns:
-                df['Outros_Descontos'] = pd.to_numeric(df['Outros_Descontos'], errors='coerce').fillna(0)
-            else:
-                df['Outros_Descontos'] = 0.0
+            df = preparar_entrada(df)
             
             if st.button("🚀 Processar Auditoria Completa", type="primary", key="processar_auditoria"):
                 with st.spinner("Processando auditoria..."):
                     
                     # Seleciona as tabelas OFICIAIS
-                    tabela_inss_aplicada, tabela_irrf_aplicada, limite_sf_aplicado, valor_sf_aplicado, ano_base, irrf_periodo, ds_maximo = selecionar_tabelas(competencia_lote)
+                    _, _, _, _, ano_base, irrf_periodo, _ = selecionar_tabelas(competencia_lote)
 
                     # Seleciona as tabelas SIMULADAS (se a checkbox estiver marcada)
                     if simular_lote_ano_anterior:
-                         t_inss_sim, t_irrf_sim, l_sf_sim, v_sf_sim, ano_base_sim, irrf_periodo_sim, ds_max_sim = selecionar_tabelas_simuladas(competencia_lote)
+                         _, _, _, _, ano_base_sim, _, _ = selecionar_tabelas_simuladas(competencia_lote)
                     
-                    resultados = []
-                    for _, row in df.iterrows():
-                        salario_bruto = float(row['Salario_Bruto'])
-                        dependentes = int(row['Dependentes'])
-                        outros_desc = float(row.get('Outros_Descontos', 0))
-                        
-                        # CÁLCULO OFICIAL
-                        inss_oficial = calcular_inss(salario_bruto, tabela_inss_aplicada)
-                        sal_familia_oficial = calcular_salario_familia(salario_bruto, dependentes, limite_sf_aplicado, valor_sf_aplicado)
-                        irrf_oficial, metodo_deducao_oficial, _, _ = calcular_irrf(salario_bruto, dependentes, inss_oficial, outros_desc, tabela_irrf_aplicada, ds_maximo)
-                        salario_liquido_oficial = salario_bruto + sal_familia_oficial - inss_oficial - irrf_oficial - outros_desc
-                        
-                        registro = {
-                            'Nome': row['Nome'], 
-                            'Salario_Bruto': salario_bruto, 
-                            'Dependentes': dependentes, 
-                            'Outros_Descontos': outros_desc, 
-                            'Salario_Familia': sal_familia_oficial, 
-                            'INSS': inss_oficial, 
-                            'IRRF': irrf_oficial, 
-                            'Salario_Liquido': salario_liquido_oficial, 
-                            'Metodo_Deducao': metodo_deducao_oficial,
-                            'Competencia': competencia_lote
-                        }
-
-                        # ADICIONA CÁLCULO DE SIMULAÇÃO
-                        if simular_lote_ano_anterior:
-                            inss_sim = calcular_inss(salario_bruto, t_inss_sim)
-                            sal_familia_sim = calcular_salario_familia(salario_bruto, dependentes, l_sf_sim, v_sf_sim)
-                            irrf_sim, metodo_deducao_sim, _, _ = calcular_irrf(salario_bruto, dependentes, inss_sim, outros_desc, t_irrf_sim, ds_max_sim)
-                            salario_liquido_sim = salario_bruto + sal_familia_sim - inss_sim - irrf_sim - outros_desc
-                            
-                            registro['Salario_Familia_Sim'] = sal_familia_sim
-                            registro['INSS_Sim'] = inss_sim
-                            registro['IRRF_Sim'] = irrf_sim
-                            registro['Salario_Liquido_Sim'] = salario_liquido_sim
-                            registro['Metodo_Deducao_Sim'] = metodo_deducao_sim
-                            registro['Ano_Base_Sim'] = ano_base_sim
-                            registro['IRRF_Periodo_Sim'] = irrf_periodo_sim
-                            
-                        resultados.append(registro)
-                        
-                    df_resultado = pd.DataFrame(resultados)
+                    # Cálculo vetorizado sobre as colunas inteiras (oficial e simulação),
+                    # reaproveitado do cache se a mesma entrada já foi auditada
+                    from folha import processar_lote_em_cache
+
+                    df_resultado = processar_lote_em_cache(df, competencia_lote, simular_lote_ano_anterior, conteudo=conteudo_entrada)
                     st.session_state.df_resultado = df_resultado
                     st.session_state.uploaded_filename = uploaded_filename
                     st.session_state.processar_sheets = False # Reseta a flag do Sheets
@@ -1146,10 +729,49 @@ with tab2:
         except Exception as e:
             st.error(f"❌ Erro ao processar dados: {e}")
     
+    # Resultado do processamento em blocos (somente totais e amostra em memória)
+    if st.session_state.resumo_blocos is not None and opcao_entrada == "📁 Upload de CSV":
+        resumo_blocos = st.session_state.resumo_blocos
+        totais = resumo_blocos['totais']
+        st.subheader("📈 Resultados da Auditoria (em blocos)")
+        st.info(f"📊 **Dados processados de:** {st.session_state.uploaded_filename} — {resumo_blocos['linhas']} linhas, {resumo_blocos['combinacoes_calculadas']} combinações calculadas (deduplicadas em cada bloco)")
+        
+        st.caption("Amostra das primeiras 1.000 linhas do resultado:")
+        st.dataframe(pd.read_csv(resumo_blocos['arquivo_resultado'], sep=';', nrows=1000, dtype=str), use_container_width=True, hide_index=True)
+        
+        st.subheader("📊 Resumo Financeiro")
+        col_b1, col_b2, col_b3, col_b4 = st.columns(4)
+        for coluna_metric, chave, rotulo in ((col_b1, 'Salario_Familia', 'Total Salário Família'), (col_b2, 'INSS', 'Total INSS'),
+                                             (col_b3, 'IRRF', 'Total IRRF'), (col_b4, 'Salario_Liquido', 'Folha Líquida Total')):
+            with coluna_metric:
+                st.metric(f"{rotulo} (Oficial)", formatar_moeda(totais.get(chave, 0.0)))
+                if f"{chave}_Sim" in totais:
+                    st.metric(f"{rotulo} (Simulado)", formatar_moeda(totais[f"{chave}_Sim"]), delta=formatar_moeda(totais[chave] - totais[f"{chave}_Sim"]).replace('R$ ', ''))
+        
+        col_csv_blocos, col_limpar_blocos = st.columns(2)
+        with col_csv_blocos:
+            with open(resumo_blocos['arquivo_resultado'], 'rb') as arquivo_resultado:
+                st.download_button(label="📥 Baixar CSV", data=arquivo_resultado, file_name=f"auditoria_folha_{get_br_datetime_now().strftime('%d%m%Y_%H%M')}.csv", mime="text/csv", help="Resultado completo (separador ponto e vírgula, decimal vírgula)")
+            if resumo_blocos['arquivo_parquet'] and os.path.exists(resumo_blocos['arquivo_parquet']):
+                with open(resumo_blocos['arquivo_parquet'], 'rb') as arquivo_parquet:
+                    st.download_button(label="📥 Baixar Parquet", data=arquivo_parquet, file_name=f"auditoria_folha_{get_br_datetime_now().strftime('%d%m%Y_%H%M')}.parquet", mime="application/octet-stream", help="Resultado completo em Parquet (valores numéricos, sem formatação)")
+        with col_limpar_blocos:
+            if st.button("🗑️ Limpar Resultados", type="secondary", key="limpar_resultados_blocos"):
+                for arquivo_blocos in (resumo_blocos['arquivo_resultado'], resumo_blocos['arquivo_parquet']):
+                    if arquivo_blocos and os.path.exists(arquivo_blocos):
+                        os.remove(arquivo_blocos)
+                st.session_state.resumo_blocos = None
+                st.rerun()
+    
     # Exibir resultados
     if st.session_state.df_resultado is not None:
         df_resultado = st.session_state.df_resultado
         st.info(f"📊 **Dados processados de:** {st.session_state.uploaded_filename}")
+        deduplicacao = df_resultado.attrs.get('deduplicacao')
+        if deduplicacao:
+            st.caption(f"⚡ {deduplicacao['combinacoes_unicas']} combinações únicas calculadas para {deduplicacao['linhas']} linhas ({deduplicacao['razao']:.1f}x menos cálculos).")
+        if df_resultado.attrs.get('cache_resultado'):
+            st.caption("♻️ Resultado reaproveitado do cache: esta entrada já havia sido auditada com a mesma competência e as mesmas tabelas.")
         
         # ... (Lógica de Limpar Resultados) ...
         col_limpar, col_vazio = st.columns([1, 3])
@@ -1160,14 +782,16 @@ with tab2:
                  st.session_state.dados_manuais = []
                  st.session_state.observacao_lote = ""
                  st.session_state.processar_sheets = False
+                 st.session_state.pop('grade_resultado', None)
                  st.success("🗑️ Resultados limpos!")
                  st.rerun()
         
         st.subheader("📈 Resultados da Auditoria")
         
-        df_display = df_resultado.copy()
-        
-        # Prepara o DataFrame para exibição (Simulação incluída)
+        # Grade paginada: busca, filtro, ordem e página resolvidos no servidor sobre os valores
+        # numéricos; só a página visível vai para o navegador, já formatada em R$ como no PDF
+        from folha import pagina_resultado, posicoes_visiveis, total_paginas
+
         if 'IRRF_Sim' in df_resultado.columns:
             # Seleciona as colunas para o display (Oficial e Simulado)
             colunas_display = ['Nome', 'Salario_Bruto', 'Dependentes', 'Outros_Descontos', 
@@ -1176,28 +800,60 @@ with tab2:
                                'IRRF', 'IRRF_Sim', 
                                'Salario_Liquido', 'Salario_Liquido_Sim', 
                                'Metodo_Deducao', 'Metodo_Deducao_Sim']
+            rotulos_display = {'Nome': 'Nome', 'Salario_Bruto': 'Sal. Bruto', 'Dependentes': 'Deps.', 'Outros_Descontos': 'Outros Desc.',
+                               'Salario_Familia': 'SF Of.', 'Salario_Familia_Sim': 'SF Sim.',
+                               'INSS': 'INSS Of.', 'INSS_Sim': 'INSS Sim.',
+                               'IRRF': 'IRRF Of.', 'IRRF_Sim': 'IRRF Sim.',
+                               'Salario_Liquido': 'Líq. Of.', 'Salario_Liquido_Sim': 'Líq. Sim.',
+                               'Metodo_Deducao': 'Ded IR Of.', 'Metodo_Deducao_Sim': 'Ded IR Sim.'}
             
-            df_display = df_display[colunas_display]
-            df_display.columns = ['Nome', 'Sal. Bruto', 'Deps.', 'Outros Desc.', 
-                                  'SF Of.', 'SF Sim.', 
-                                  'INSS Of.', 'INSS Sim.', 
-                                  'IRRF Of.', 'IRRF Sim.', 
-                                  'Líq. Of.', 'Líq. Sim.', 
-                                  'Ded IR Of.', 'Ded IR Sim.']
-            
-            colunas_monetarias_display = ['Sal. Bruto', 'Outros Desc.', 'SF Of.', 'SF Sim.', 'INSS Of.', 'INSS Sim.', 'IRRF Of.', 'IRRF Sim.', 'Líq. Of.', 'Líq. Sim.']
-            for coluna in colunas_monetarias_display:
-                 df_display[coluna] = df_display[coluna].apply(formatar_moeda)
-            
-            st.warning(f"Comparativo Ativo: Oficial (INSS {df_resultado['Competencia'].iloc[0].year}) vs. Simulado (INSS {df_resultado['Competencia'].iloc[0].year - 1})")
+            if df_resultado['Competencia'].nunique() > 1:
+                st.warning("Comparativo Ativo: Oficial (tabelas da competência de cada linha) vs. Simulado (tabelas do ano anterior de cada linha)")
+            else:
+                st.warning(f"Comparativo Ativo: Oficial (INSS {df_resultado['Competencia'].iloc[0].year}) vs. Simulado (INSS {df_resultado['Competencia'].iloc[0].year - 1})")
         else:
-            colunas_monetarias = ['Salario_Bruto', 'Salario_Familia', 'INSS', 'IRRF', 'Outros_Descontos', 'Salario_Liquido']
-            for coluna in colunas_monetarias:
-                df_display[coluna] = df_display[coluna].apply(formatar_moeda)
-            df_display = df_display.drop(columns=['Competencia']).rename(columns={'Metodo_Deducao': 'Ded. IR'})
+            colunas_display = [coluna for coluna in df_resultado.columns if coluna != 'Competencia' or df_resultado['Competencia'].nunique() > 1]
+            rotulos_display = {'Metodo_Deducao': 'Ded. IR'}
             st.info("Simulação de ano anterior desativada. Exibindo apenas resultados oficiais.")
 
-        st.dataframe(df_display, use_container_width=True, hide_index=True) 
+        config_colunas = {}
+        for coluna in colunas_display:
+            rotulo = rotulos_display.get(coluna, coluna)
+            if coluna == 'Competencia':
+                config_colunas[coluna] = st.column_config.DateColumn(rotulo, format="MM/YYYY")
+            else:
+                config_colunas[coluna] = rotulo
+
+        col_busca, col_metodo, col_ordem, col_sentido = st.columns([2, 1, 2, 1])
+        with col_busca:
+            busca_grade = st.text_input("🔎 Buscar por nome:", key="busca_grade")
+        with col_metodo:
+            metodo_grade = st.selectbox("Dedução IR:", ["Todos", "Legal", "Simplificado"], key="metodo_grade")
+        with col_ordem:
+            ordenar_grade = st.selectbox("Ordenar por:", [None] + colunas_display, key="ordenar_grade",
+                                         format_func=lambda coluna: "Ordem do arquivo" if coluna is None else rotulos_display.get(coluna, coluna))
+        with col_sentido:
+            crescente_grade = st.radio("Sentido:", ["Crescente", "Decrescente"], key="sentido_grade") == "Crescente"
+
+        # Posições filtradas/ordenadas recalculadas só quando o resultado ou a consulta mudam
+        chave_grade = (busca_grade, metodo_grade, ordenar_grade, crescente_grade)
+        grade = st.session_state.get('grade_resultado')
+        if grade is None or grade['resultado'] is not df_resultado or grade['chave'] != chave_grade:
+            filtros_grade = {} if metodo_grade == "Todos" else {'Metodo_Deducao': metodo_grade}
+            grade = {'resultado': df_resultado, 'chave': chave_grade,
+                     'posicoes': posicoes_visiveis(df_resultado, busca_grade, filtros_grade, ordenar_grade, crescente_grade)}
+            st.session_state.grade_resultado = grade
+            st.session_state.pagina_grade = 1
+        posicoes_grade = grade['posicoes']
+        paginas_grade = total_paginas(len(posicoes_grade))
+
+        col_pagina, col_vazio_pagina = st.columns([1, 3])
+        with col_pagina:
+            pagina_grade = st.number_input("Página:", min_value=1, max_value=paginas_grade, step=1, key="pagina_grade")
+        df_pagina, primeira_linha, ultima_linha = pagina_resultado(df_resultado, posicoes_grade, pagina_grade, colunas=colunas_display, moeda=True)
+
+        st.dataframe(df_pagina, use_container_width=True, hide_index=True, column_config=config_colunas)
+        st.caption(f"Linhas {primeira_linha} a {ultima_linha} de {len(posicoes_grade)} encontradas ({len(df_resultado)} no total) · página {pagina_grade} de {paginas_grade}")
         
         st.subheader("📊 Resumo Financeiro")
         col_r1, col_r2, col_r3, col_r4 = st.columns(4)
@@ -1231,23 +887,20 @@ with tab2:
         col_csv, col_pdf = st.columns(2)
         
         with col_csv:
-            df_csv = df_resultado.copy()
-            # Garante que o CSV usa vírgula como decimal para facilitar a abertura no Excel/sistemas
-            colunas_monetarias_export = ['Salario_Bruto', 'Salario_Familia', 'INSS', 'IRRF', 'Outros_Descontos', 'Salario_Liquido']
-            if 'IRRF_Sim' in df_resultado.columns:
-                colunas_monetarias_export.extend(['Salario_Familia_Sim', 'INSS_Sim', 'IRRF_Sim', 'Salario_Liquido_Sim'])
-            
-            for coluna in colunas_monetarias_export:
-                df_csv[coluna] = df_csv[coluna].apply(lambda x: f"{x:.2f}".replace('.', ','))
-            
-            csv_resultado = df_csv.to_csv(index=False, sep=';', encoding='utf-8')
+            # Colunas monetárias com 2 casas e vírgula decimal (Excel/sistemas), formatadas coluna a coluna
+            from folha import resultado_para_csv, resultado_para_parquet
+
+            csv_resultado = resultado_para_csv(df_resultado)
             st.download_button(label="📥 Baixar CSV",data=csv_resultado,file_name=f"auditoria_folha_{get_br_datetime_now().strftime('%d%m%Y_%H%M')}.csv",mime="text/csv",help="Baixe os resultados em CSV (separador ponto e vírgula, decimal vírgula)")
+            st.download_button(label="📥 Baixar Parquet", data=resultado_para_parquet(df_resultado), file_name=f"auditoria_folha_{get_br_datetime_now().strftime('%d%m%Y_%H%M')}.parquet", mime="application/octet-stream", help="Baixe os resultados em Parquet (valores numéricos, sem formatação)")
         
         with col_pdf:
             if st.button("📄 Gerar PDF Completo", type="secondary", key="gerar_pdf_completo"):
                 with st.spinner("Gerando relatório PDF..."):
                     try:
                         # CORRIGIDO: Chama a função que agora retorna bytes codificados em latin1
+                        from folha import gerar_pdf_auditoria_completa
+
                         pdf_output = gerar_pdf_auditoria_completa(df_resultado, st.session_state.uploaded_filename,total_salario_familia,total_inss,total_irrf,folha_liquida_total, st.session_state.observacao_lote)
                         
                         st.markdown(
@@ -1259,15 +912,56 @@ with tab2:
 
 # ----------------------------------------------------------------------
 
+@st.cache_data(show_spinner=False)
+def montar_tabelas_informacoes():
+    """Tabelas da aba Informações, montadas uma única vez (e não a cada interação com as outras abas)."""
+    return {
+        'tabela_inss_df_2025': pd.DataFrame([
+            {"Faixa": "1ª", "Salário de Contribuição": "Até " + formatar_moeda(1518.00), "Alíquota": "7,5%"},
+            {"Faixa": "2ª", "Salário de Contribuição": formatar_moeda(1518.01) + " a " + formatar_moeda(2793.88), "Alíquota": "9,0%"},
+            {"Faixa": "3ª", "Salário de Contribuição": formatar_moeda(2793.89) + " a " + formatar_moeda(4190.83), "Alíquota": "12,0%"},
+            {"Faixa": "4ª", "Salário de Contribuição": formatar_moeda(4190.84) + " a " + formatar_moeda(8157.41), "Alíquota": "14,0%"}
+        ]),
+        'tabela_inss_df_2024': pd.DataFrame([
+            {"Faixa": "1ª", "Salário de Contribuição": "Até " + formatar_moeda(1412.00), "Alíquota": "7,5%"},
+            {"Faixa": "2ª", "Salário de Contribuição": formatar_moeda(1412.01) + " a " + formatar_moeda(2666.68), "Alíquota": "9,0%"},
+            {"Faixa": "3ª", "Salário de Contribuição": formatar_moeda(2666.69) + " a " + formatar_moeda(4000.03), "Alíquota": "12,0%"},
+            {"Faixa": "4ª", "Salário de Contribuição": formatar_moeda(4000.04) + " a " + formatar_moeda(7786.02), "Alíquota": "14,0%"}
+        ]),
+        'tabela_inss_df_2023': pd.DataFrame([
+            {"Faixa": "1ª", "Salário de Contribuição": "Até " + formatar_moeda(1320.00), "Alíquota": "7,5%"},
+            {"Faixa": "2ª", "Salário de Contribuição": formatar_moeda(1320.01) + " a " + formatar_moeda(2571.29), "Alíquota": "9,0%"},
+            {"Faixa": "3ª", "Salário de Contribuição": formatar_moeda(2571.30) + " a " + formatar_moeda(3856.94), "Alíquota": "12,0%"},
+            {"Faixa": "4ª", "Salário de Contribuição": formatar_moeda(3856.95) + " a " + formatar_moeda(7507.49), "Alíquota": "14,0%"}
+        ]),
+        'tabela_irrf_df_mai2025': pd.DataFrame([
+            {"Faixa": "1ª", "Base de Cálculo": "Até " + formatar_moeda(2428.80), "Alíquota": "0%", "Parcela a Deduzir": formatar_moeda(0.00)},
+            {"Faixa": "2ª", "Base de Cálculo": formatar_moeda(2428.81) + " a " + formatar_moeda(2826.65), "Alíquota": "7,5%", "Parcela a Deduzir": formatar_moeda(182.16)},
+            {"Faixa": "3ª", "Base de Cálculo": formatar_moeda(2826.66) + " a " + formatar_moeda(3751.05), "Alíquota": "15%", "Parcela a Deduzir": formatar_moeda(394.16)},
+        ]),
+        'tabela_irrf_df_fev2024': pd.DataFrame([
+            {"Faixa": "1ª", "Base de Cálculo": "Até " + formatar_moeda(2259.20), "Alíquota": "0%", "Parcela a Deduzir": formatar_moeda(0.00)},
+            {"Faixa": "2ª", "Base de Cálculo": formatar_moeda(2259.21) + " a " + formatar_moeda(2826.65), "Alíquota": "7,5%", "Parcela a Deduzir": formatar_moeda(169.44)},
+            {"Faixa": "3ª", "Base de Cálculo": formatar_moeda(2826.66) + " a " + formatar_moeda(3751.05), "Alíquota": "15%", "Parcela a Deduzir": formatar_moeda(381.44)},
+        ]),
+        'tabela_irrf_df_2023': pd.DataFrame([
+            {"Faixa": "1ª", "Base de Cálculo": "Até " + formatar_moeda(2112.00), "Alíquota": "0%", "Parcela a Deduzir": formatar_moeda(0.00)},
+            {"Faixa": "2ª", "Base de Cálculo": formatar_moeda(2112.01) + " a " + formatar_moeda(2826.65), "Alíquota": "7,5%", "Parcela a Deduzir": formatar_moeda(158.40)},
+            {"Faixa": "3ª", "Base de Cálculo": formatar_moeda(2826.66) + " a " + formatar_moeda(3751.05), "Alíquota": "15%", "Parcela a Deduzir": formatar_moeda(370.40)},
+        ]),
+    }
+
 with tab3:
+    tabelas_informacoes = montar_tabelas_informacoes()
     st.header("Informações Técnicas")
     st.markdown("### 📊 Tabelas Legais - INSS e IRRF")
     
     st.subheader("📅 Regra de Vigência (Competência)")
-    st.info("""
+    cobertura = cobertura_vigencias()
+    st.info(f"""
     O sistema utiliza as seguintes tabelas com base na **Competência Analisada**:
-    - **INSS/Salário Família:** Selecionado pelo ano (2023, 2024 ou 2025).
-    - **IRRF:** Selecionado pela data específica da competência (quatro períodos de vigência, incluindo o reajuste de 01/05/2023).
+    - **INSS/Salário Família:** Selecionado pela data de início de vigência de cada tabela (INSS de {cobertura['inss']}; Salário Família de {cobertura['salario_familia']}).
+    - **IRRF:** Selecionado pela data específica da competência ({cobertura['irrf_periodos']} períodos de vigência a partir de {cobertura['irrf_inicio']}; competências anteriores usam a primeira tabela como fallback).
     - **Dedução IRRF:** O sistema compara o Desconto Legal (INSS + Ded. Dependente) com o Desconto Simplificado Opcional e aplica o que resultar no **menor imposto**.
     - **Simulação Ativa:** Se marcada, a simulação utiliza as tabelas do **ano imediatamente anterior** (Ex: Comp. 2025 -> Tabela 2024).
     """)
@@ -1276,61 +970,34 @@ with tab3:
     
     with col_info1:
         st.subheader("📋 Tabela INSS 2025")
-        tabela_inss_df_2025 = pd.DataFrame([
-            {"Faixa": "1ª", "Salário de Contribuição": "Até " + formatar_moeda(1518.00), "Alíquota": "7,5%"},
-            {"Faixa": "2ª", "Salário de Contribuição": formatar_moeda(1518.01) + " a " + formatar_moeda(2793.88), "Alíquota": "9,0%"},
-            {"Faixa": "3ª", "Salário de Contribuição": formatar_moeda(2793.89) + " a " + formatar_moeda(4190.83), "Alíquota": "12,0%"},
-            {"Faixa": "4ª", "Salário de Contribuição": formatar_moeda(4190.84) + " a " + formatar_moeda(8157.41), "Alíquota": "14,0%"}
-        ])
+        tabela_inss_df_2025 = tabelas_informacoes['tabela_inss_df_2025']
         st.dataframe(tabela_inss_df_2025, use_container_width=True, hide_index=True)
         st.caption(f"**Teto 2025:** {formatar_moeda(8157.41)}")
     
     with col_info2:
         st.subheader("📋 Tabela INSS 2024")
-        tabela_inss_df_2024 = pd.DataFrame([
-            {"Faixa": "1ª", "Salário de Contribuição": "Até " + formatar_moeda(1412.00), "Alíquota": "7,5%"},
-            {"Faixa": "2ª", "Salário de Contribuição": formatar_moeda(1412.01) + " a " + formatar_moeda(2666.68), "Alíquota": "9,0%"},
-            {"Faixa": "3ª", "Salário de Contribuição": formatar_moeda(2666.69) + " a " + formatar_moeda(4000.03), "Alíquota": "12,0%"},
-            {"Faixa": "4ª", "Salário de Contribuição": formatar_moeda(4000.04) + " a " + formatar_moeda(7786.02), "Alíquota": "14,0%"}
-        ])
+        tabela_inss_df_2024 = tabelas_informacoes['tabela_inss_df_2024']
         st.dataframe(tabela_inss_df_2024, use_container_width=True, hide_index=True)
         st.caption(f"**Teto 2024:** {formatar_moeda(7786.02)}")
 
     with col_info3:
         st.subheader("📋 Tabela INSS 2023")
-        tabela_inss_df_2023 = pd.DataFrame([
-            {"Faixa": "1ª", "Salário de Contribuição": "Até " + formatar_moeda(1320.00), "Alíquota": "7,5%"},
-            {"Faixa": "2ª", "Salário de Contribuição": formatar_moeda(1320.01) + " a " + formatar_moeda(2571.29), "Alíquota": "9,0%"},
-            {"Faixa": "3ª", "Salário de Contribuição": formatar_moeda(2571.30) + " a " + formatar_moeda(3856.94), "Alíquota": "12,0%"},
-            {"Faixa": "4ª", "Salário de Contribuição": formatar_moeda(3856.95) + " a +formatar_moeda(7507.49)", "Alíquota": "14,0%"}
-        ])
+        tabela_inss_df_2023 = tabelas_informacoes['tabela_inss_df_2023']
         st.dataframe(tabela_inss_df_2023, use_container_width=True, hide_index=True)
         st.caption(f"**Teto 2023:** {formatar_moeda(7507.49)}")
 
     st.subheader("📈 Tabela IRRF - Vigências Específicas")
     
     st.markdown("#### **Vigência: 01/05/2025 em diante** (MP 1.294/2025)")
-    tabela_irrf_df_mai2025 = pd.DataFrame([
-        {"Faixa": "1ª", "Base de Cálculo": "Até " + formatar_moeda(2428.80), "Alíquota": "0%", "Parcela a Deduzir": formatar_moeda(0.00)},
-        {"Faixa": "2ª", "Base de Cálculo": formatar_moeda(2428.81) + " a " + formatar_moeda(2826.65), "Alíquota": "7,5%", "Parcela a Deduzir": formatar_moeda(182.16)},
-        {"Faixa": "3ª", "Base de Cálculo": formatar_moeda(2826.66) + " a " + formatar_moeda(3751.05), "Alíquota": "15%", "Parcela a Deduzir": formatar_moeda(394.16)},
-    ])
+    tabela_irrf_df_mai2025 = tabelas_informacoes['tabela_irrf_df_mai2025']
     st.dataframe(tabela_irrf_df_mai2025.head(3), use_container_width=True, hide_index=True)
     
     st.markdown("#### **Vigência: 01/02/2024 a 30/04/2025** (MP 1.206/2024)")
-    tabela_irrf_df_fev2024 = pd.DataFrame([
-        {"Faixa": "1ª", "Base de Cálculo": "Até " + formatar_moeda(2259.20), "Alíquota": "0%", "Parcela a Deduzir": formatar_moeda(0.00)},
-        {"Faixa": "2ª", "Base de Cálculo": formatar_moeda(2259.21) + " a " + formatar_moeda(2826.65), "Alíquota": "7,5%", "Parcela a Deduzir": formatar_moeda(169.44)},
-        {"Faixa": "3ª", "Base de Cálculo": formatar_moeda(2826.66) + " a " + formatar_moeda(3751.05), "Alíquota": "15%", "Parcela a Deduzir": formatar_moeda(381.44)},
-    ])
+    tabela_irrf_df_fev2024 = tabelas_informacoes['tabela_irrf_df_fev2024']
     st.dataframe(tabela_irrf_df_fev2024.head(3), use_container_width=True, hide_index=True)
 
     st.markdown("#### **Vigência: 01/05/2023 a 31/01/2024** (Lei nº 14.663/2023)")
-    tabela_irrf_df_2023 = pd.DataFrame([
-        {"Faixa": "1ª", "Base de Cálculo": "Até " + formatar_moeda(2112.00), "Alíquota": "0%", "Parcela a Deduzir": formatar_moeda(0.00)},
-        {"Faixa": "2ª", "Base de Cálculo": formatar_moeda(2112.01) + " a " + formatar_moeda(2826.65), "Alíquota": "7,5%", "Parcela a Deduzir": formatar_moeda(158.40)},
-        {"Faixa": "3ª", "Base de Cálculo": formatar_moeda(2826.66) + " a " + formatar_moeda(3751.05), "Alíquota": "15%", "Parcela a Deduzir": formatar_moeda(370.40)},
-    ])
+    tabela_irrf_df_2023 = tabelas_informacoes['tabela_irrf_df_2023']
     st.dataframe(tabela_irrf_df_2023.head(3), use_container_width=True, hide_index=True)
 
     st.subheader("📝 Legislação de Referência")
@@ -1341,15 +1008,30 @@ with tab3:
     - **IRRF (Mai/2025 em diante):** MP Nº 1.294/2025.
     """)
 
+    with st.expander("⚡ Cache de Cálculos"):
+        st.caption("Memoização dos cálculos individuais (INSS, IRRF, Salário Família e faixas dos relatórios).")
+        df_cache = pd.DataFrame.from_dict(estatisticas_cache(), orient='index')
+        df_cache['taxa_acerto'] = (df_cache['taxa_acerto'] * 100).map(lambda x: f"{x:.1f}%")
+        st.dataframe(df_cache, use_container_width=True)
+        from folha import estatisticas_cache_resultados
+
+        resultados_cache = estatisticas_cache_resultados()
+        st.caption(
+            f"Cache de resultados de auditoria (compartilhado entre sessões): {resultados_cache['tamanho']} resultados, "
+            f"{resultados_cache['bytes_usados'] / 1024 / 1024:.1f} de {resultados_cache['tamanho_maximo'] / 1024 / 1024:.0f} MB, "
+            f"{resultados_cache['acertos']} acertos, {resultados_cache['falhas']} falhas, {resultados_cache['descartes']} descartes."
+        )
+
 # ----------------------------------------------------------------------
 
 st.sidebar.header("ℹ️ Sobre")
-st.sidebar.info("""
+cobertura = cobertura_vigencias()
+st.sidebar.info(f"""
 **Auditoria Folha de Pagamento**
 
 Cálculos dinâmicos com base na **Competência** informada:
-- Salário Família (2023, 2024 e 2025)
-- INSS (Tabelas 2023, 2024 e 2025)
+- Salário Família ({cobertura['salario_familia']})
+- INSS (Tabelas {cobertura['inss']})
 - IRRF (Tabelas multi-período)
 - **Comparativo Desconto Legal vs. Desconto Simplificado** (mais benéfico)
 - **NOVO:** Simulação com tabelas do ano anterior.
@@ -1364,7 +1046,7 @@ with col_rodape1:
     st.caption(f"📅 Data da Consulta: {formatar_data(get_br_datetime_now())}")
 
 with col_rodape2:
-    st.caption("🏛 Legislação 2023/2024/2025 - Vigência a partir da competência")
+    st.caption(f"🏛 Legislação {cobertura['legislacao']} - Vigência a partir da competência")
 
 with col_rodape3:
     st.caption("⚡ Desenvolvido para auditoria contábil")
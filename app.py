@@ -0,0 +1,51 @@
+"""
+Aplicativo único com todas as ferramentas (Streamlit multipage).
+
+As páginas rodam no mesmo processo do servidor e compartilham o motor de
+cálculo (`folha`), carregado e aquecido uma única vez por `st.cache_resource`:
+a memória de pandas, tabelas e caches é paga uma vez por servidor, e trocar
+de ferramenta não sobe um novo processo.
+
+    streamlit run app.py
+"""
+import streamlit as st
+
+
+@st.cache_resource(show_spinner="Carregando o motor de cálculo...")
+def carregar_motor():
+    """Pacote `folha` com as tabelas de todas as vigências já preparadas (compartilhado entre páginas e sessões)."""
+    import folha
+
+    folha.aquecer_tabelas()
+    return folha
+
+
+carregar_motor()
+
+pagina = st.navigation({
+    "Auditoria de Folha": [
+        st.Page("Audit.py", title="Auditoria de Folha", icon="💰", url_path="auditoria", default=True),
+        st.Page("07-folhapgto-gemini.py", title="Auditoria (Gemini)", icon="🧮", url_path="auditoria-gemini"),
+        st.Page("08-folhapgto-26.11.2025.py", title="Auditoria (26/11/2025)", icon="🧮", url_path="auditoria-26-11-2025"),
+        st.Page("09-folhapgto-deepseek.py", title="Auditoria (DeepSeek)", icon="🧮", url_path="auditoria-deepseek"),
+        st.Page("05-auditar-fase2.py", title="Auditoria - Fase 2", icon="🧮", url_path="auditoria-fase2"),
+        st.Page("06-anaclara.py", title="Auditoria Ana Clara", icon="🧮", url_path="auditoria-anaclara"),
+        st.Page("04-AuditarSFeIRRF.py", title="Auditar SF e IRRF", icon="🧮", url_path="auditar-sf-irrf"),
+    ],
+    "Calculadoras": [
+        st.Page("calc-re.py", title="Rescisão e FGTS", icon="⚖️", url_path="rescisao"),
+        st.Page("03-AnaClara.py", title="Cálculo Fácil", icon="💼", url_path="calculo-facil"),
+        st.Page("01-AnaClara.py", title="Vale-Transporte", icon="⭐", url_path="vale-transporte"),
+        st.Page("02-AnaClara.py", title="Vale-Transporte 2", icon="✨", url_path="vale-transporte-2"),
+    ],
+})
+
+# As páginas usam as mesmas chaves de estado (df_resultado, dados_manuais...)
+# com formatos diferentes: ao trocar de ferramenta, a sessão recomeça limpa,
+# como acontecia com os aplicativos separados.
+if st.session_state.get("_pagina_atual") != pagina.url_path:
+    for chave in list(st.session_state):
+        del st.session_state[chave]
+    st.session_state._pagina_atual = pagina.url_path
+
+pagina.run()
@@ -4,6 +4,8 @@ from datetime import datetime, timedelta
 from dateutil.relativedelta import relativedelta
 import calendar
 
+from folha import tabela_inss
+
 # ------------------------------------------------------------
 # CONFIGURAÇÕES INICIAIS
 # ------------------------------------------------------------
@@ -24,22 +26,15 @@ def parse_brasil_date(data_str):
 # ------------------------------------------------------------
 # TABELAS DE INSS
 # ------------------------------------------------------------
-TABELAS_INSS = {
-    datetime(2020, 3, 1): [(0, 1045.00, 0.075), (1045.01, 2089.60, 0.09), (2089.61, 3134.40, 0.12), (3134.41, 6101.06, 0.14)],
-    datetime(2021, 1, 1): [(0, 1100.00, 0.075), (1100.01, 2203.48, 0.09), (2203.49, 3305.22, 0.12), (3305.23, 6433.57, 0.14)],
-    datetime(2022, 1, 1): [(0, 1212.00, 0.075), (1212.01, 2427.35, 0.09), (2427.36, 3641.03, 0.12), (3641.04, 7087.22, 0.14)],
-    datetime(2023, 1, 1): [(0, 1302.00, 0.075), (1302.01, 2571.29, 0.09), (2571.30, 3856.94, 0.12), (3856.95, 7507.49, 0.14)],
-    datetime(2023, 5, 1): [(0, 1320.00, 0.075), (1320.01, 2571.29, 0.09), (2571.30, 3856.94, 0.12), (3856.95, 7507.49, 0.14)],
-    datetime(2024, 1, 1): [(0, 1412.00, 0.075), (1412.01, 2666.68, 0.09), (2666.69, 4000.03, 0.12), (4000.04, 7786.02, 0.14)],
-    datetime(2025, 1, 1): [(0, 1518.00, 0.075), (1518.01, 2793.88, 0.09), (2793.89, 4190.83, 0.12), (4190.84, 8157.41, 0.14)],
-    datetime(2026, 1, 1): [(0, 1621.00, 0.075), (1621.01, 2902.84, 0.09), (2902.85, 4354.27, 0.12), (4354.28, 8475.55, 0.14)],
-}
-
+# As vigências ficam no registro do pacote `folha` (mesma fonte das páginas
+# de auditoria); aqui as faixas são convertidas para (limite_inf, limite_sup, aliquota).
 def get_inss_aliquotas(data_referencia):
-    for data in sorted(TABELAS_INSS.keys(), reverse=True):
-        if data_referencia >= data:
-            return TABELAS_INSS[data]
-    return TABELAS_INSS[datetime(2020, 3, 1)]
+    faixas = []
+    limite_inf = 0
+    for faixa in tabela_inss(data_referencia):
+        faixas.append((limite_inf, faixa["limite"], faixa["aliquota"]))
+        limite_inf = round(faixa["limite"] + 0.01, 2)
+    return faixas
 
 def calcular_inss(base, data):
     aliquotas = get_inss_aliquotas(data)
@@ -0,0 +1,186 @@
+"""
+Motor de cálculo da folha de pagamento (INSS, IRRF e Salário Família).
+
+Pacote independente do Streamlit, importado por todas as páginas e
+utilizável em rotinas em lote sem subir a interface.
+"""
+import importlib
+
+from .tabelas import (
+    DATA_INICIO_2023_IRRF,
+    DATA_INICIO_2024_IRRF,
+    DATA_INICIO_2025_IRRF,
+    DESCONTO_DEPENDENTE_IR,
+    DS_MAX_FEV2024_ABR2025,
+    DS_MAX_MAI2023_JAN2024,
+    DS_MAX_MAI2025_DEZ2025,
+    SF_LIMITE_2023,
+    SF_LIMITE_2024,
+    SF_LIMITE_2025,
+    SF_VALOR_2023,
+    SF_VALOR_2024,
+    SF_VALOR_2025,
+    TABELA_INSS_2020,
+    TABELA_INSS_2021,
+    TABELA_INSS_2022,
+    TABELA_INSS_2023,
+    TABELA_INSS_2024,
+    TABELA_INSS_2025,
+    TABELA_INSS_2026,
+    TABELA_INSS_JAN2023_ABR2023,
+    TABELA_IRRF_2023_MAI2024,
+    TABELA_IRRF_FEV2024_ABR2025,
+    TABELA_IRRF_MAI2025_DEZ2025,
+)
+from .registro import (
+    VIGENCIAS_INSS,
+    VIGENCIAS_IRRF,
+    VIGENCIAS_SALARIO_FAMILIA,
+    VERSAO_REGISTRO,
+    cobertura_vigencias,
+    id_conjunto,
+    resolver_competencias,
+    selecionar_tabelas,
+    selecionar_tabelas_simuladas,
+    tabela_inss,
+    tabelas_do_conjunto,
+)
+from .faixas import (
+    TabelaProgressiva,
+    compilar_tabela,
+    detalhar_faixas,
+)
+from .memo import (
+    CacheLRU,
+    configurar_cache,
+    estatisticas_cache,
+    limpar_cache,
+)
+from .calculos import (
+    calcular_inss,
+    calcular_irrf,
+    calcular_irrf_base,
+    calcular_salario_familia,
+)
+from .vetorizado import (
+    arredondar_centavos,
+    calcular_inss_vetorizado,
+    calcular_irrf_base_vetorizado,
+    calcular_irrf_vetorizado,
+    calcular_salario_familia_vetorizado,
+)
+from .centavos import (
+    REGRAS_ARREDONDAMENTO,
+    TabelaCentavos,
+    arredondar_unidades,
+    calcular_folha_centavos,
+    calcular_inss_centavos,
+    calcular_irrf_base_centavos,
+    calcular_irrf_centavos,
+    calcular_salario_familia_centavos,
+    compilar_tabela_centavos,
+    formatar_centavos,
+    para_centavos,
+    para_reais,
+)
+from .lote import (
+    aquecer_tabelas,
+    calcular_folha_vetorizada,
+    preparar_entrada,
+    processar_lote,
+)
+from .formato import (
+    TIPOS_COLUNAS,
+    detectar_formato,
+    ler_csv,
+    ler_csv_em_blocos,
+)
+# --- SUBMÓDULOS SOB DEMANDA ---
+# Leitura colunar, Sheets, PDF, cache de resultados e processamento em lote
+# só são importados no primeiro acesso ao nome (PEP 562): `import folha`
+# carrega apenas o núcleo de cálculo, e as páginas pagam o custo de asyncio,
+# http.client, multiprocessing e fpdf só quando usam esses recursos.
+_SOB_DEMANDA = {
+    'colunar': (
+        'COLUNAS_ENTRADA',
+        'GravadorParquet',
+        'detectar_tipo_arquivo',
+        'ler_entrada',
+        'ler_entrada_em_blocos',
+        'resultado_para_csv',
+        'resultado_para_parquet',
+        'texto_centavos',
+        'texto_reais',
+    ),
+    'streaming': (
+        'TAMANHO_BLOCO_PADRAO',
+        'processar_csv_em_blocos',
+    ),
+    'resultados': (
+        'TAMANHO_CACHE_RESULTADOS_PADRAO',
+        'CacheResultados',
+        'chave_resultado',
+        'configurar_cache_resultados',
+        'estatisticas_cache_resultados',
+        'hash_entrada',
+        'limpar_cache_resultados',
+        'processar_lote_em_cache',
+    ),
+    'planilhas': (
+        'COLUNAS_PLANILHA',
+        'CONCORRENCIA_PADRAO',
+        'TTL_PADRAO',
+        'URL_PLANILHAS',
+        'SessaoHTTP',
+        'carregar_abas',
+        'carregar_colunas_planilha',
+        'carregar_planilha',
+        'colunas_da_aba',
+        'estatisticas_planilhas',
+        'extrair_id_planilha',
+        'limpar_cache_planilhas',
+        'montar_consulta',
+        'padronizar_colunas_planilha',
+        'url_csv',
+    ),
+    'relatorio': (
+        'formatar_data',
+        'formatar_moeda',
+        'formatar_moeda_coluna',
+        'gerar_pdf_auditoria_completa',
+        'get_br_datetime_now',
+    ),
+    'grade': (
+        'TAMANHO_PAGINA_PADRAO',
+        'pagina_resultado',
+        'posicoes_visiveis',
+        'total_paginas',
+    ),
+    'compartilhado': (
+        'LINHAS_MINIMAS_PARALELO',
+        'processar_lote_paralelo',
+    ),
+    'auditoria': (
+        'FORMATOS_SAIDA',
+        'auditar_arquivo',
+    ),
+    'paralelo': (
+        'auditar_arquivos',
+    ),
+    'cli': (
+        'ler_competencia',
+    ),
+}
+_MODULO_DO_NOME = {nome: modulo for modulo, nomes in _SOB_DEMANDA.items() for nome in nomes}
+
+
+def __getattr__(nome):
+    modulo = _MODULO_DO_NOME.get(nome)
+    if modulo is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {nome!r}")
+    valor = getattr(importlib.import_module(f".{modulo}", __name__), nome)
+    globals()[nome] = valor
+    return valor
+
+def __dir__():
+    return sorted(set(globals()) | set(_MODULO_DO_NOME))
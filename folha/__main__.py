@@ -0,0 +1,6 @@
+"""Permite `python -m folha` (auditor em lote pela linha de comando)."""
+import sys
+
+from .cli import main
+
+sys.exit(main())
@@ -0,0 +1,91 @@
+"""
+Auditoria completa de um arquivo de folha, com gravação das saídas.
+
+Cada arquivo (CSV, Parquet ou Feather) passa pelo mesmo cálculo do botão
+"Processar Auditoria Completa" e gera, na pasta de saída,
+`<nome>_auditoria.csv` (separador ';' e decimal ','), `.parquet` e/ou `.pdf`.
+"""
+import os
+import time
+from collections import Counter
+
+from .colunar import ler_entrada, resultado_para_csv, resultado_para_parquet
+from .compartilhado import processar_lote_paralelo
+from .lote import preparar_entrada, processar_lote
+from .relatorio import gerar_pdf_auditoria_completa
+from .streaming import COLUNAS_TOTAIS
+
+FORMATOS_SAIDA = ('csv', 'parquet', 'pdf')
+
+
+def nomes_de_saida(caminhos, reservados=()):
+    """
+    `<nome>` das saídas `<nome>_auditoria.*` de cada arquivo, sem repetição
+    na pasta de saída: nomes de arquivo iguais em pastas diferentes levam a
+    pasta como prefixo (`x/folha.csv` -> `x_folha`), e o que ainda coincidir
+    (entre si ou com os `reservados`) recebe um contador (`folha_2`).
+    A comparação ignora maiúsculas, como em sistemas de arquivos Windows/macOS.
+    """
+    caminhos = list(caminhos)
+    nomes = [os.path.splitext(os.path.basename(caminho))[0] for caminho in caminhos]
+    repeticoes = Counter(nome.casefold() for nome in nomes)
+    usados = {nome.casefold() for nome in reservados}
+
+    unicos = []
+    for caminho, nome in zip(caminhos, nomes):
+        if repeticoes[nome.casefold()] > 1:
+            pasta = os.path.basename(os.path.dirname(os.path.abspath(caminho)))
+            nome = f"{pasta}_{nome}" if pasta else nome
+        candidato, contador = nome, 2
+        while candidato.casefold() in usados:
+            candidato = f"{nome}_{contador}"
+            contador += 1
+        usados.add(candidato.casefold())
+        unicos.append(candidato)
+    return unicos
+
+
+def auditar_arquivo(caminho, competencia, simular_ano_anterior=False, centavos=False, formatos=('csv',),
+                    pasta_saida='.', observacao='', processos_por_arquivo=1, nome_saida=None):
+    """
+    Audita um arquivo e grava as saídas pedidas. Retorna um resumo com o
+    número de linhas, os totais das colunas monetárias, os arquivos gerados
+    e o tempo gasto. Com `processos_por_arquivo` > 1, as linhas de um arquivo
+    grande são divididas entre processos (`processar_lote_paralelo`).
+    `nome_saida` substitui o nome do arquivo no nome das saídas (ver
+    `nomes_de_saida`).
+    """
+    inicio = time.perf_counter()
+    df = preparar_entrada(ler_entrada(caminho))
+    if processos_por_arquivo > 1:
+        df_resultado = processar_lote_paralelo(df, competencia, simular_ano_anterior, centavos, processos_por_arquivo)
+    else:
+        df_resultado = processar_lote(df, competencia, simular_ano_anterior, centavos=centavos)
+    totais = {coluna: float(df_resultado[coluna].sum()) for coluna in COLUNAS_TOTAIS if coluna in df_resultado.columns}
+
+    os.makedirs(pasta_saida, exist_ok=True)
+    nome_saida = nome_saida or os.path.splitext(os.path.basename(caminho))[0]
+    base = os.path.join(pasta_saida, nome_saida + '_auditoria')
+    saidas = []
+    if 'csv' in formatos:
+        resultado_para_csv(df_resultado, base + '.csv')
+        saidas.append(base + '.csv')
+    if 'parquet' in formatos:
+        saidas.append(resultado_para_parquet(df_resultado, base + '.parquet'))
+    if 'pdf' in formatos:
+        pdf = gerar_pdf_auditoria_completa(
+            df_resultado, os.path.basename(caminho), totais['Salario_Familia'], totais['INSS'],
+            totais['IRRF'], totais['Salario_Liquido'], observacao,
+        )
+        with open(base + '.pdf', 'wb') as arquivo_pdf:
+            arquivo_pdf.write(pdf)
+        saidas.append(base + '.pdf')
+
+    return {
+        'arquivo': caminho,
+        'linhas': len(df_resultado),
+        'combinacoes_unicas': df_resultado.attrs['deduplicacao']['combinacoes_unicas'],
+        'totais': totais,
+        'saidas': saidas,
+        'segundos': time.perf_counter() - inicio,
+    }
@@ -0,0 +1,83 @@
+"""
+Funções de cálculo da folha: INSS progressivo, Salário Família e IRRF
+(Desconto Legal vs. Desconto Simplificado).
+
+`calcular_inss`, `calcular_irrf` e `calcular_salario_familia` são memoizadas
+(ver `folha.memo`); a chave usa a tabela compilada, que identifica a tabela
+sem depender do conteúdo da lista.
+"""
+from .faixas import compilar_tabela
+from .memo import CacheLRU
+from .tabelas import DESCONTO_DEPENDENTE_IR
+
+_CACHE_INSS = CacheLRU("calcular_inss")
+_CACHE_IRRF = CacheLRU("calcular_irrf")
+_CACHE_SALARIO_FAMILIA = CacheLRU("calcular_salario_familia")
+
+
+def calcular_irrf_base(base_calculo, tabela_irrf):
+    """Calcula o IRRF dado uma base de cálculo específica."""
+    if base_calculo <= 0:
+        return 0.0
+    
+    irrf = compilar_tabela(tabela_irrf).irrf(base_calculo)
+    if irrf is None:
+        return 0.0
+    return max(round(irrf, 2), 0.0)
+
+def calcular_inss(salario_bruto, tabela_inss):
+    """Calcula desconto do INSS com base na tabela progressiva fornecida."""
+    if salario_bruto <= 0:
+        return 0.0
+    
+    tabela = compilar_tabela(tabela_inss)
+    return _CACHE_INSS.obter((tabela, salario_bruto), _calcular_inss, salario_bruto, tabela)
+
+def _calcular_inss(salario_bruto, tabela):
+    """Cálculo sem memoização de `calcular_inss`."""
+    return round(tabela.inss(salario_bruto), 2)
+
+def calcular_salario_familia(salario, dependentes, limite_sf, valor_sf):
+    """Calcula salário família com base nos parâmetros de limite e valor por dependente."""
+    return _CACHE_SALARIO_FAMILIA.obter(
+        (salario, dependentes, limite_sf, valor_sf),
+        _calcular_salario_familia, salario, dependentes, limite_sf, valor_sf,
+    )
+
+def _calcular_salario_familia(salario, dependentes, limite_sf, valor_sf):
+    """Cálculo sem memoização de `calcular_salario_familia`."""
+    if salario <= limite_sf:
+        return dependentes * valor_sf
+    return 0.0
+
+def calcular_irrf(salario_bruto, dependentes, inss, outros_descontos, tabela_irrf, ds_maximo):
+    """
+    Calcula IRRF comparando o Desconto Legal com o Desconto Simplificado
+    e utilizando o método mais benéfico.
+    """
+    tabela = compilar_tabela(tabela_irrf)
+    return _CACHE_IRRF.obter(
+        (tabela, salario_bruto, dependentes, inss, outros_descontos, ds_maximo),
+        _calcular_irrf, salario_bruto, dependentes, inss, outros_descontos, tabela, ds_maximo,
+    )
+
+def _calcular_irrf(salario_bruto, dependentes, inss, outros_descontos, tabela_irrf, ds_maximo):
+    """Cálculo sem memoização de `calcular_irrf`."""
+    
+    # 1. CÁLCULO LEGAL (Padrão)
+    deducao_legal = (dependentes * DESCONTO_DEPENDENTE_IR) + inss + outros_descontos
+    base_legal = salario_bruto - deducao_legal
+    irrf_legal = calcular_irrf_base(base_legal, tabela_irrf)
+    
+    # 2. CÁLCULO SIMPLIFICADO (Simulando a forma mais benéfica encontrada em sites)
+    deducao_simplificada_valor = ds_maximo
+    base_simplificada_site = salario_bruto - deducao_simplificada_valor
+    irrf_simplificado_site = calcular_irrf_base(base_simplificada_site, tabela_irrf)
+    
+    # 3. ESCOLHA DO MAIS BENÉFICO (Menor IRRF)
+    
+    if irrf_legal <= irrf_simplificado_site:
+        return irrf_legal, "Legal", base_legal, deducao_legal
+    else:
+        # Retorna o cálculo do Desconto Simplificado que foi mais benéfico
+        return irrf_simplificado_site, "Simplificado", base_simplificada_site, deducao_simplificada_valor
@@ -0,0 +1,198 @@
+"""
+Modo de cálculo em centavos inteiros (int64).
+
+Todos os valores monetários são carregados como centavos inteiros do início
+ao fim: as alíquotas viram inteiros na escala de 1/10.000, e os produtos
+por faixa são somados sem nenhum arredondamento intermediário. Cada tributo
+é arredondado para centavos uma única vez, segundo a regra definida em
+`REGRAS_ARREDONDAMENTO`. Como não há ponto flutuante, dois resultados
+podem ser comparados (ou usados como chave de cache) exatamente.
+"""
+import numpy as np
+
+from .faixas import compilar_tabela
+from .tabelas import DESCONTO_DEPENDENTE_IR
+from .vetorizado import _METODOS_DEDUCAO, arredondar_centavos
+
+# Alíquotas em unidades de 1/10.000 (7,5% -> 750); um produto centavos x
+# alíquota fica em "unidades" de 1/10.000 de centavo
+ESCALA_ALIQUOTA = 10_000
+
+# Limite usado no lugar da faixa infinita do IRRF
+_SEM_LIMITE = np.iinfo(np.int64).max
+
+# Regra de arredondamento para centavos de cada tributo:
+# "meio_para_cima" (0,5 centavo sobe), "meio_para_par" ou "truncar"
+REGRAS_ARREDONDAMENTO = {
+    'INSS': 'meio_para_cima',
+    'IRRF': 'meio_para_cima',
+}
+
+
+# --- CONVERSÕES ---
+
+def para_centavos(valores):
+    """Converte valores em reais para centavos int64 (arredondados como `round(valor, 2)`)."""
+    return np.rint(arredondar_centavos(valores) * 100.0).astype(np.int64)
+
+def para_reais(centavos):
+    """Converte centavos int64 para reais (float64)."""
+    return np.asarray(centavos, dtype=np.int64) / 100.0
+
+def formatar_centavos(centavos):
+    """Formata centavos inteiros no padrão brasileiro (R$ 1.234,56), sem passar por float."""
+    centavos = int(centavos)
+    sinal = '-' if centavos < 0 else ''
+    reais, resto = divmod(abs(centavos), 100)
+    return f"R$ {sinal}{reais:,}".replace(',', '.') + f",{resto:02d}"
+
+def arredondar_unidades(unidades, regra):
+    """Arredonda valores em 1/10.000 de centavo para centavos inteiros pela regra indicada."""
+    unidades = np.asarray(unidades, dtype=np.int64)
+    if regra == 'meio_para_cima':
+        return (unidades + ESCALA_ALIQUOTA // 2) // ESCALA_ALIQUOTA
+    if regra == 'truncar':
+        return unidades // ESCALA_ALIQUOTA
+    if regra == 'meio_para_par':
+        quociente, resto = np.divmod(unidades, ESCALA_ALIQUOTA)
+        metade = ESCALA_ALIQUOTA // 2
+        return quociente + (resto > metade) + ((resto == metade) & (quociente % 2 == 1))
+    raise ValueError(f"Regra de arredondamento desconhecida: {regra}")
+
+
+# --- TABELAS EM CENTAVOS ---
+
+class TabelaCentavos:
+    """Faixas de uma tabela progressiva em inteiros: limites em centavos e alíquotas em 1/10.000."""
+
+    __slots__ = ("limites", "aliquotas", "deducoes", "acumulado", "anteriores")
+
+    def __init__(self, tabela):
+        tabela = compilar_tabela(tabela)
+        limites = [_SEM_LIMITE if limite == float('inf') else round(limite * 100) for limite in tabela._limites]
+        aliquotas = [round(aliquota * ESCALA_ALIQUOTA) for aliquota in tabela._aliquotas]
+        deducoes = [round(deducao * 100) for deducao in tabela._deducoes]
+
+        # Contribuição exata (em unidades) ao completar as faixas anteriores
+        acumulado = []
+        anteriores = []
+        anterior = 0
+        total = 0
+        for limite, aliquota in zip(limites, aliquotas):
+            acumulado.append(total)
+            anteriores.append(anterior)
+            if limite != _SEM_LIMITE:
+                total += (limite - anterior) * aliquota
+            anterior = limite
+
+        for nome, valores in (("limites", limites), ("aliquotas", aliquotas), ("deducoes", deducoes),
+                              ("acumulado", acumulado), ("anteriores", anteriores)):
+            array = np.array(valores, dtype=np.int64)
+            array.flags.writeable = False
+            object.__setattr__(self, nome, array)
+
+    def __setattr__(self, nome, valor):
+        raise AttributeError("TabelaCentavos é imutável")
+
+    def __len__(self):
+        return len(self.limites)
+
+    @property
+    def teto(self):
+        """Limite da última faixa, em centavos."""
+        return int(self.limites[-1])
+
+
+# Cache por tabela compilada (que já identifica a lista original)
+_COMPILADAS_CENTAVOS = {}
+
+
+def compilar_tabela_centavos(tabela):
+    """Retorna a `TabelaCentavos` de uma tabela, convertendo-a só na primeira vez."""
+    compilada = compilar_tabela(tabela)
+    tabela_centavos = _COMPILADAS_CENTAVOS.get(compilada)
+    if tabela_centavos is None:
+        tabela_centavos = _COMPILADAS_CENTAVOS[compilada] = TabelaCentavos(compilada)
+    return tabela_centavos
+
+
+# --- CÁLCULOS EM CENTAVOS ---
+
+def calcular_inss_centavos(salarios_centavos, tabela_inss):
+    """INSS progressivo de um array de salários em centavos (regra de `REGRAS_ARREDONDAMENTO['INSS']`)."""
+    salarios = np.asarray(salarios_centavos, dtype=np.int64)
+    tabela = compilar_tabela_centavos(tabela_inss)
+
+    salario_calculo = np.minimum(salarios, tabela.teto)
+    faixa = np.minimum(np.searchsorted(tabela.limites, salario_calculo, side="left"), len(tabela) - 1)
+    unidades = tabela.acumulado[faixa] + (salario_calculo - tabela.anteriores[faixa]) * tabela.aliquotas[faixa]
+
+    inss = arredondar_unidades(unidades, REGRAS_ARREDONDAMENTO['INSS'])
+    return np.where(salarios <= 0, 0, inss)
+
+def calcular_salario_familia_centavos(salarios_centavos, dependentes, limite_sf, valor_sf):
+    """Salário família em centavos (produto exato, sem arredondamento)."""
+    salarios = np.asarray(salarios_centavos, dtype=np.int64)
+    dependentes = np.asarray(dependentes, dtype=np.int64)
+    return np.where(salarios <= round(limite_sf * 100), dependentes * round(valor_sf * 100), 0)
+
+def calcular_irrf_base_centavos(bases_centavos, tabela_irrf):
+    """IRRF de um array de bases em centavos (regra de `REGRAS_ARREDONDAMENTO['IRRF']`)."""
+    bases = np.asarray(bases_centavos, dtype=np.int64)
+    tabela = compilar_tabela_centavos(tabela_irrf)
+
+    faixa = np.minimum(np.searchsorted(tabela.limites, bases, side="left"), len(tabela) - 1)
+    unidades = bases * tabela.aliquotas[faixa] - tabela.deducoes[faixa] * ESCALA_ALIQUOTA
+
+    irrf = np.maximum(arredondar_unidades(unidades, REGRAS_ARREDONDAMENTO['IRRF']), 0)
+    return np.where((bases <= 0) | (bases > tabela.teto), 0, irrf)
+
+def calcular_irrf_centavos(salarios_centavos, dependentes, inss_centavos, outros_centavos, tabela_irrf, ds_maximo):
+    """
+    IRRF em centavos escolhendo o menor imposto entre o Desconto Legal e o
+    Desconto Simplificado. Retorna (irrf, metodo, base, deducao).
+    """
+    salarios = np.asarray(salarios_centavos, dtype=np.int64)
+    dependentes = np.asarray(dependentes, dtype=np.int64)
+    ds_centavos = round(ds_maximo * 100)
+
+    # 1. CÁLCULO LEGAL (Padrão)
+    deducao_legal = dependentes * round(DESCONTO_DEPENDENTE_IR * 100) + inss_centavos + outros_centavos
+    base_legal = salarios - deducao_legal
+    irrf_legal = calcular_irrf_base_centavos(base_legal, tabela_irrf)
+
+    # 2. CÁLCULO SIMPLIFICADO
+    base_simplificada = salarios - ds_centavos
+    irrf_simplificado = calcular_irrf_base_centavos(base_simplificada, tabela_irrf)
+
+    # 3. ESCOLHA DO MAIS BENÉFICO (Menor IRRF)
+    usa_legal = irrf_legal <= irrf_simplificado
+    irrf = np.where(usa_legal, irrf_legal, irrf_simplificado)
+    metodo = _METODOS_DEDUCAO.take(~usa_legal)
+    base = np.where(usa_legal, base_legal, base_simplificada)
+    deducao = np.where(usa_legal, deducao_legal, ds_centavos)
+    return irrf, metodo, base, deducao
+
+def calcular_folha_centavos(salarios_centavos, dependentes, outros_centavos, tabelas):
+    """
+    Equivalente de `calcular_folha_vetorizada` em centavos int64: recebe e
+    retorna valores monetários em centavos (Metodo_Deducao continua texto).
+    """
+    tabela_inss, tabela_irrf, limite_sf, valor_sf, _, _, ds_maximo = tabelas
+
+    salarios = np.asarray(salarios_centavos, dtype=np.int64)
+    dependentes = np.asarray(dependentes, dtype=np.int64)
+    outros_descontos = np.asarray(outros_centavos, dtype=np.int64)
+
+    inss = calcular_inss_centavos(salarios, tabela_inss)
+    sal_familia = calcular_salario_familia_centavos(salarios, dependentes, limite_sf, valor_sf)
+    irrf, metodo_deducao, _, _ = calcular_irrf_centavos(salarios, dependentes, inss, outros_descontos, tabela_irrf, ds_maximo)
+    salario_liquido = salarios + sal_familia - inss - irrf - outros_descontos
+
+    return {
+        'Salario_Familia': sal_familia,
+        'INSS': inss,
+        'IRRF': irrf,
+        'Salario_Liquido': salario_liquido,
+        'Metodo_Deducao': metodo_deducao,
+    }
@@ -0,0 +1,93 @@
+"""
+Auditor em lote pela linha de comando, sem Streamlit (para rotinas agendadas).
+
+Cada arquivo de entrada é auditado por `folha.auditoria.auditar_arquivo`,
+com os arquivos distribuídos entre processos (`folha.paralelo`). Ao final,
+o resumo consolidado (totais, vazão e falhas) é impresso e gravado em
+`resumo_auditoria.csv` na pasta de saída.
+
+    python -m folha folha_jan.csv folha_fev.parquet --competencia 05/2025 --simular --formatos csv,pdf --saida resultados --processos 8
+"""
+import argparse
+import sys
+from datetime import date
+
+from .auditoria import FORMATOS_SAIDA
+from .paralelo import auditar_arquivos
+from .relatorio import formatar_moeda
+
+
+def ler_competencia(texto):
+    """Competência em MM/AAAA ou AAAA-MM (primeiro dia do mês)."""
+    texto = texto.strip()
+    try:
+        if '/' in texto:
+            mes, ano = texto.split('/')[-2:]
+        else:
+            ano, mes = texto.split('-')[:2]
+        return date(int(ano), int(mes), 1)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Competência inválida: {texto} (use MM/AAAA)")
+
+def _ler_formatos(texto):
+    formatos = tuple(formato.strip().lower() for formato in texto.split(',') if formato.strip())
+    invalidos = [formato for formato in formatos if formato not in FORMATOS_SAIDA]
+    if invalidos or not formatos:
+        raise argparse.ArgumentTypeError(f"Formatos de saída válidos: {', '.join(FORMATOS_SAIDA)}")
+    return formatos
+
+
+# --- LINHA DE COMANDO ---
+
+def _argumentos():
+    parser = argparse.ArgumentParser(
+        prog='python -m folha',
+        description="Auditoria em lote de folhas de pagamento (INSS, IRRF e Salário Família) sem interface.",
+    )
+    parser.add_argument('entradas', nargs='+', help="Arquivos CSV, Parquet ou Feather")
+    parser.add_argument('-c', '--competencia', type=ler_competencia, default=date.today().replace(day=1),
+                        help="Competência padrão, em MM/AAAA (padrão: mês atual); a coluna Competencia do arquivo tem prioridade")
+    parser.add_argument('-s', '--simular', action='store_true', help="Inclui a simulação com as tabelas do ano anterior")
+    parser.add_argument('--centavos', action='store_true', help="Calcula em centavos inteiros")
+    parser.add_argument('-f', '--formatos', type=_ler_formatos, default=('csv',),
+                        help="Saídas separadas por vírgula: csv, parquet, pdf (padrão: csv)")
+    parser.add_argument('-o', '--saida', default='.', help="Pasta das saídas (padrão: pasta atual)")
+    parser.add_argument('--observacao', default='', help="Observação do analista incluída no PDF")
+    parser.add_argument('-j', '--processos', type=int, default=None,
+                        help="Arquivos auditados em paralelo (padrão: número de CPUs; 1 = sem processos extras)")
+    parser.add_argument('--processos-por-arquivo', type=int, default=1,
+                        help="Processos que dividem as linhas de cada arquivo, com memória compartilhada (para arquivos muito grandes)")
+    return parser
+
+def _imprimir(resumo):
+    if 'erro' in resumo:
+        print(f"ERRO {resumo['arquivo']}: {resumo['erro']}", file=sys.stderr)
+        return
+    totais = resumo['totais']
+    print(
+        f"OK {resumo['arquivo']}: {resumo['linhas']} linhas em {resumo['segundos']:.2f} s | "
+        f"INSS {formatar_moeda(totais['INSS'])} | IRRF {formatar_moeda(totais['IRRF'])} | "
+        f"Líquido {formatar_moeda(totais['Salario_Liquido'])} -> {', '.join(resumo['saidas'])}"
+    )
+
+def main(argv=None):
+    """Ponto de entrada; retorna 0 se todos os arquivos foram auditados, 1 se algum falhou."""
+    args = _argumentos().parse_args(argv)
+    consolidado = auditar_arquivos(
+        args.entradas, args.competencia, args.simular, args.centavos, args.formatos,
+        args.saida, args.observacao, processos=args.processos, ao_concluir=_imprimir,
+        processos_por_arquivo=args.processos_por_arquivo,
+    )
+    totais = consolidado['totais']
+    print(
+        f"\n{consolidado['concluidos']}/{consolidado['arquivos']} arquivos, {consolidado['linhas']} linhas em "
+        f"{consolidado['segundos']:.2f} s com {consolidado['processos']} processo(s) "
+        f"({consolidado['linhas_por_segundo']:,.0f} linhas/s, {consolidado['arquivos_por_segundo']:.2f} arquivos/s)"
+    )
+    if totais:
+        print(f"Totais: INSS {formatar_moeda(totais['INSS'])} | IRRF {formatar_moeda(totais['IRRF'])} | "
+              f"Líquido {formatar_moeda(totais['Salario_Liquido'])}")
+    if consolidado['falhas']:
+        print(f"{len(consolidado['falhas'])} arquivo(s) com falha", file=sys.stderr)
+    print(f"Resumo por arquivo: {consolidado['arquivo_resumo']}")
+    return 1 if consolidado['falhas'] else 0
@@ -0,0 +1,245 @@
+"""
+Entrada e saída em formatos colunares (Parquet e Feather/Arrow).
+
+Arquivos colunares chegam ao motor vetorizado já com tipos numéricos, sem
+passar por texto. O formato é reconhecido pelos bytes iniciais do arquivo,
+e o `pyarrow` só é importado quando um desses formatos é usado.
+
+A saída em CSV (separador ';' e decimal ',') também é montada coluna a
+coluna com o `pyarrow.compute`, sem formatar célula por célula.
+"""
+import io
+import os
+
+import numpy as np
+import pandas as pd
+
+from .centavos import para_centavos
+from .formato import ler_csv, ler_csv_em_blocos
+
+# Assinaturas no início do arquivo
+_MAGICO_PARQUET = b'PAR1'
+_MAGICO_FEATHER = b'ARROW1'
+
+# Colunas lidas da entrada (as demais são ignoradas na leitura colunar)
+COLUNAS_ENTRADA = ('Nome', 'Salario_Bruto', 'Dependentes', 'Outros_Descontos', 'Competencia')
+
+
+def detectar_tipo_arquivo(arquivo):
+    """Retorna 'parquet', 'feather' ou 'csv' pelos bytes iniciais do arquivo."""
+    if isinstance(arquivo, (str, os.PathLike)):
+        with open(arquivo, 'rb') as f:
+            inicio = f.read(8)
+    else:
+        posicao = arquivo.tell()
+        inicio = arquivo.read(8)
+        arquivo.seek(posicao)
+    if inicio.startswith(_MAGICO_PARQUET):
+        return 'parquet'
+    if inicio.startswith(_MAGICO_FEATHER):
+        return 'feather'
+    return 'csv'
+
+
+def _colunas_presentes(nomes):
+    return [coluna for coluna in COLUNAS_ENTRADA if coluna in nomes]
+
+
+def ler_entrada(arquivo):
+    """
+    Lê a folha de um CSV, Parquet ou Feather. Nos formatos colunares só as
+    colunas usadas na auditoria são carregadas.
+    """
+    tipo = detectar_tipo_arquivo(arquivo)
+    if tipo == 'csv':
+        return ler_csv(arquivo)
+
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+
+    if tipo == 'parquet':
+        nomes = pq.ParquetFile(arquivo).schema_arrow.names
+        if not isinstance(arquivo, (str, os.PathLike)):
+            arquivo.seek(0)
+        return pq.read_table(arquivo, columns=_colunas_presentes(nomes)).to_pandas()
+
+    tabela = feather.read_table(arquivo)
+    return tabela.select(_colunas_presentes(tabela.column_names)).to_pandas()
+
+
+def ler_entrada_em_blocos(arquivo, tamanho_bloco):
+    """
+    Gera a folha em blocos de até `tamanho_bloco` linhas. Parquet e Feather
+    são lidos por lotes de registros, sem carregar o arquivo inteiro; CSV usa
+    o leitor em blocos de `folha.formato`.
+    """
+    tipo = detectar_tipo_arquivo(arquivo)
+    if tipo == 'csv':
+        yield from ler_csv_em_blocos(arquivo, tamanho_bloco)
+        return
+
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if tipo == 'parquet':
+        arquivo_parquet = pq.ParquetFile(arquivo)
+        colunas = _colunas_presentes(arquivo_parquet.schema_arrow.names)
+        lotes = arquivo_parquet.iter_batches(batch_size=tamanho_bloco, columns=colunas)
+    else:
+        leitor = pa.ipc.open_file(arquivo)
+        colunas = _colunas_presentes(leitor.schema.names)
+        lotes = (leitor.get_batch(i).select(colunas) for i in range(leitor.num_record_batches))
+
+    for lote in lotes:
+        for inicio in range(0, lote.num_rows, tamanho_bloco):
+            yield lote.slice(inicio, tamanho_bloco).to_pandas()
+
+
+def resultado_para_parquet(df_resultado, destino=None):
+    """
+    Grava o `df_resultado` em Parquet (em `destino`, ou retorna os bytes se
+    omitido). Os valores continuam numéricos, sem formatação de moeda.
+    """
+    if destino is not None:
+        df_resultado.to_parquet(destino, index=False)
+        return destino
+    buffer = io.BytesIO()
+    df_resultado.to_parquet(buffer, index=False)
+    return buffer.getvalue()
+
+
+# --- TEXTO (MOEDA E CSV) ---
+
+def texto_centavos(centavos, milhar='', negativos=None):
+    """
+    Array de centavos inteiros -> `pyarrow.Array` de textos '1234,56' (ou
+    '1.234,56' com `milhar='.'`), montado por operações sobre a coluna inteira.
+    `negativos` (máscara) define o sinal quando ele não sai dos centavos,
+    como em '-0,00'.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    centavos = np.asarray(centavos, dtype=np.int64)
+    if negativos is None:
+        negativos = centavos < 0
+    absolutos = np.abs(centavos)
+    fracao = pc.utf8_lpad(pc.cast(pa.array(absolutos % 100), pa.string()), 2, '0')
+    inteiros = absolutos // 100
+    if milhar:
+        # Grupos de 3 dígitos da direita para a esquerda, só nas linhas que ainda têm dígitos
+        texto = pc.cast(pa.array(inteiros % 1000), pa.string())
+        restantes = inteiros // 1000
+        texto = pc.if_else(pa.array(restantes > 0), pc.utf8_lpad(texto, 3, '0'), texto)
+        while restantes.any():
+            ativos = pa.array(restantes > 0)
+            grupo = pc.cast(pa.array(restantes % 1000), pa.string())
+            restantes = restantes // 1000
+            grupo = pc.if_else(pa.array(restantes > 0), pc.utf8_lpad(grupo, 3, '0'), grupo)
+            texto = pc.if_else(ativos, pc.binary_join_element_wise(grupo, texto, milhar), texto)
+    else:
+        texto = pc.cast(pa.array(inteiros), pa.string())
+    texto = pc.binary_join_element_wise(texto, fracao, ',')
+    return pc.binary_join_element_wise(pc.if_else(pa.array(negativos), '-', ''), texto, '')
+
+def texto_reais(valores, milhar=''):
+    """
+    Array de reais -> textos com 2 casas, iguais a `format(valor, '.2f')`
+    com vírgula decimal: arredondamento exato (`para_centavos`) e '-0,00'
+    para negativos que arredondam a zero. NaN vira '0,00'.
+    """
+    valores = np.nan_to_num(np.asarray(valores, dtype=np.float64))
+    return texto_centavos(para_centavos(valores), milhar, negativos=np.signbit(valores))
+
+def _texto_coluna(serie):
+    """Coluna do resultado como texto de CSV: float com 2 casas e vírgula, demais via `str`, aspas só se preciso."""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    if serie.dtype == np.float64:
+        valores = serie.to_numpy()
+        nulos = pa.array(np.isnan(valores))
+        texto = texto_reais(valores)
+        return pc.if_else(nulos, '', texto)
+
+    if isinstance(serie.dtype, pd.StringDtype):
+        texto, codigos = pc.cast(pa.array(serie, from_pandas=True), pa.string()), None
+    else:
+        # Demais colunas: cada valor distinto é convertido e escapado uma única vez
+        codigos, unicos = pd.factorize(serie)
+        texto = pa.array([str(valor) for valor in unicos], pa.string())
+    precisa_aspas = pc.match_substring_regex(texto, '[;"\\n\\r]')
+    entre_aspas = pc.binary_join_element_wise('"', pc.replace_substring(texto, '"', '""'), '"', '')
+    texto = pc.if_else(precisa_aspas, entre_aspas, texto)
+    if codigos is not None:
+        texto = pc.take(texto, pa.array(codigos, mask=codigos < 0))
+    return pc.fill_null(texto, '')
+
+def resultado_para_csv(df_resultado, destino=None, cabecalho=True):
+    """
+    Grava o `df_resultado` no CSV de exportação (separador ';', decimal ',',
+    2 casas), no mesmo formato de `to_csv(sep=';', decimal=',')`. `destino`
+    pode ser um caminho ou um arquivo de texto aberto; se omitido, retorna
+    os bytes (UTF-8).
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    linhas = ''
+    if len(df_resultado) and len(df_resultado.columns):
+        colunas = [_texto_coluna(df_resultado[coluna]) for coluna in df_resultado.columns]
+        registros = pc.binary_join_element_wise(*colunas, ';') if len(colunas) > 1 else colunas[0]
+        lista = pa.ListArray.from_arrays(pa.array([0, len(registros)], pa.int32()), registros)
+        linhas = pc.binary_join(lista, '\n')[0].as_py() + '\n'
+    if cabecalho:
+        linhas = ';'.join(map(str, df_resultado.columns)) + '\n' + linhas
+
+    if destino is None:
+        return linhas.encode('utf-8')
+    if hasattr(destino, 'write'):
+        destino.write(linhas)
+    else:
+        with open(destino, 'w', encoding='utf-8', newline='') as arquivo:
+            arquivo.write(linhas)
+    return destino
+
+
+def _esquema_em_blocos(esquema):
+    """
+    Esquema do primeiro bloco com inteiros em int64 e índices de dicionário
+    em int32: blocos seguintes podem trazer dependentes maiores ou mais
+    categorias (o resultado usa o menor tipo de cada bloco).
+    """
+    import pyarrow as pa
+
+    campos = []
+    for campo in esquema:
+        if pa.types.is_integer(campo.type):
+            campo = campo.with_type(pa.int64())
+        elif pa.types.is_dictionary(campo.type):
+            campo = campo.with_type(pa.dictionary(pa.int32(), campo.type.value_type, campo.type.ordered))
+        campos.append(campo)
+    return pa.schema(campos, metadata=esquema.metadata)
+
+
+class GravadorParquet:
+    """Grava blocos de resultado em um único arquivo Parquet, com o esquema do primeiro bloco (tipos ampliados)."""
+
+    def __init__(self, destino):
+        self.destino = destino
+        self._escritor = None
+        self._esquema = None
+
+    def gravar(self, df):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        tabela = pa.Table.from_pandas(df, preserve_index=False)
+        if self._escritor is None:
+            self._esquema = _esquema_em_blocos(tabela.schema)
+            self._escritor = pq.ParquetWriter(self.destino, self._esquema)
+        self._escritor.write_table(tabela.cast(self._esquema))
+
+    def fechar(self):
+        if self._escritor is not None:
+            self._escritor.close()
@@ -0,0 +1,141 @@
+"""
+Paralelismo dentro de um único arquivo grande, com memória compartilhada.
+
+As colunas numéricas de entrada (salário, dependentes, outros descontos e
+competência) são copiadas uma única vez para blocos de
+`multiprocessing.shared_memory`, e as colunas de saída são pré-alocadas da
+mesma forma. Cada processo se conecta aos blocos ao iniciar e recebe só os
+limites (início, fim) do trecho a calcular: nenhum DataFrame é serializado
+entre processos. Os trechos usam o mesmo núcleo de `processar_lote` e gravam
+o resultado diretamente nas colunas de saída compartilhadas.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .lote import (
+    _calcular_verbas, _deduplicar, _entradas_numericas, _montar_resultado, _rotulos_por_grupo, processar_lote,
+)
+from .registro import selecionar_tabelas_simuladas
+from .vetorizado import _METODOS_DEDUCAO
+
+# Abaixo deste número de linhas, o custo de subir os processos não compensa
+LINHAS_MINIMAS_PARALELO = 200_000
+
+# Trechos por processo (trechos menores equilibram melhor a carga)
+_TRECHOS_POR_PROCESSO = 4
+
+_VERBAS_NUMERICAS = ('Salario_Familia', 'INSS', 'IRRF', 'Salario_Liquido')
+
+# Colunas compartilhadas do processo filho: nome -> array sobre o bloco
+_COLUNAS = {}
+_BLOCOS = []
+
+
+# --- BLOCOS COMPARTILHADOS ---
+
+def _criar_coluna(array_ou_dtype, linhas, blocos, descritores, nome):
+    """Cria um bloco compartilhado para a coluna (copiando o array, se dado) e retorna a visão numpy."""
+    dtype = np.dtype(array_ou_dtype.dtype if isinstance(array_ou_dtype, np.ndarray) else array_ou_dtype)
+    bloco = shared_memory.SharedMemory(create=True, size=max(linhas * dtype.itemsize, 1))
+    blocos.append(bloco)
+    visao = np.ndarray(linhas, dtype=dtype, buffer=bloco.buf)
+    if isinstance(array_ou_dtype, np.ndarray):
+        visao[:] = array_ou_dtype
+    descritores[nome] = (bloco.name, dtype.str, linhas)
+    return visao
+
+def _conectar(descritores):
+    """Inicializador dos processos: conecta-se aos blocos e cria as visões numpy."""
+    for nome, (nome_bloco, dtype, linhas) in descritores.items():
+        bloco = shared_memory.SharedMemory(name=nome_bloco)
+        _BLOCOS.append(bloco)
+        _COLUNAS[nome] = np.ndarray(linhas, dtype=np.dtype(dtype), buffer=bloco.buf)
+
+def _calcular_trecho(inicio, fim, competencia, simular_ano_anterior, centavos):
+    """Calcula as linhas [inicio, fim) e grava as verbas nas colunas de saída."""
+    verbas, _ = _calcular_verbas(
+        _COLUNAS['salarios'][inicio:fim], _COLUNAS['dependentes'][inicio:fim],
+        _COLUNAS['outros_descontos'][inicio:fim], _COLUNAS['competencias'][inicio:fim],
+        competencia, simular_ano_anterior, centavos,
+    )
+    for sufixo in ('', '_Sim') if simular_ano_anterior else ('',):
+        for nome in _VERBAS_NUMERICAS:
+            _COLUNAS[nome + sufixo][inicio:fim] = verbas[nome + sufixo]
+        _COLUNAS['Metodo_Deducao' + sufixo][inicio:fim] = verbas['Metodo_Deducao' + sufixo] == _METODOS_DEDUCAO[1]
+
+
+def _rotulos_simulacao(competencias, competencia):
+    """
+    Ano_Base_Sim e IRRF_Periodo_Sim por linha (um rótulo por ano de
+    competência), com as categorias na ordem dos anos, como em `processar_lote`.
+    """
+    anos = competencias.astype("datetime64[Y]").astype(np.int64) + 1970
+    anos_unicos, codigos = np.unique(anos, return_inverse=True)
+    if not len(anos_unicos):
+        anos_unicos = [competencia.year]
+    tabelas = [selecionar_tabelas_simuladas(date(int(ano), 1, 1)) for ano in anos_unicos]
+    return (_rotulos_por_grupo([tabela[4] for tabela in tabelas], codigos),
+            _rotulos_por_grupo([tabela[5] for tabela in tabelas], codigos))
+
+
+# --- PROCESSAMENTO PARALELO ---
+
+def processar_lote_paralelo(df, competencia, simular_ano_anterior=False, centavos=False, processos=None):
+    """
+    Mesmo resultado de `processar_lote`, com as linhas divididas em trechos
+    calculados em paralelo sobre colunas em memória compartilhada. Folhas
+    com menos de `LINHAS_MINIMAS_PARALELO` linhas (ou `processos=1`) são
+    calculadas no próprio processo.
+
+    `attrs['deduplicacao']` conta as combinações únicas da folha inteira,
+    como em `processar_lote` (cada trecho ainda calcula as suas: uma
+    combinação repetida em trechos diferentes é calculada em cada um).
+    """
+    processos = processos or os.cpu_count() or 1
+    linhas = len(df)
+    if processos == 1 or linhas < LINHAS_MINIMAS_PARALELO:
+        return processar_lote(df, competencia, simular_ano_anterior, centavos=centavos)
+
+    salarios, dependentes, outros_descontos, competencias, coluna_competencia = _entradas_numericas(df, competencia, centavos)
+    primeiras, _ = _deduplicar(salarios, dependentes, outros_descontos, competencias.view(np.int64))
+    combinacoes_unicas = len(primeiras)
+
+    blocos = []
+    descritores = {}
+    try:
+        _criar_coluna(salarios, linhas, blocos, descritores, 'salarios')
+        _criar_coluna(dependentes, linhas, blocos, descritores, 'dependentes')
+        _criar_coluna(outros_descontos, linhas, blocos, descritores, 'outros_descontos')
+        _criar_coluna(competencias, linhas, blocos, descritores, 'competencias')
+        saidas = {}
+        for sufixo in ('', '_Sim') if simular_ano_anterior else ('',):
+            for nome in _VERBAS_NUMERICAS:
+                saidas[nome + sufixo] = _criar_coluna(np.float64, linhas, blocos, descritores, nome + sufixo)
+            saidas['Metodo_Deducao' + sufixo] = _criar_coluna(np.bool_, linhas, blocos, descritores, 'Metodo_Deducao' + sufixo)
+
+        limites = np.linspace(0, linhas, processos * _TRECHOS_POR_PROCESSO + 1).astype(np.int64)
+        with ProcessPoolExecutor(max_workers=processos, initializer=_conectar, initargs=(descritores,)) as executor:
+            tarefas = [
+                executor.submit(_calcular_trecho, int(inicio), int(fim), competencia, simular_ano_anterior, centavos)
+                for inicio, fim in zip(limites[:-1], limites[1:]) if fim > inicio
+            ]
+            for tarefa in tarefas:
+                tarefa.result()
+
+        # Copia as saídas para a memória do processo antes de liberar os blocos
+        verbas = {}
+        for nome, valores in saidas.items():
+            verbas[nome] = _METODOS_DEDUCAO.take(valores) if nome.startswith('Metodo_Deducao') else valores.copy()
+    finally:
+        for bloco in blocos:
+            bloco.close()
+            bloco.unlink()
+
+    if simular_ano_anterior:
+        verbas['Ano_Base_Sim'], verbas['IRRF_Periodo_Sim'] = _rotulos_simulacao(competencias, competencia)
+    return _montar_resultado(df, salarios, dependentes, outros_descontos, coluna_competencia, verbas,
+                             combinacoes_unicas, centavos)
@@ -0,0 +1,121 @@
+"""
+Tabelas progressivas compiladas.
+
+As tabelas legais são listas de dicionários (`{"limite": ..., "aliquota": ...,
+"deducao": ...}`). Para o cálculo, cada lista é convertida uma única vez em
+uma `TabelaProgressiva` imutável, com limites, alíquotas, deduções e o INSS
+acumulado em cada limite guardados em arrays contíguos.
+"""
+from bisect import bisect_left
+
+import numpy as np
+
+from .memo import CacheLRU
+
+
+class TabelaProgressiva:
+    """Faixas de uma tabela progressiva (INSS ou IRRF) em arrays somente leitura."""
+
+    __slots__ = (
+        "limites", "aliquotas", "deducoes", "larguras", "acumulado",
+        "_limites", "_aliquotas", "_deducoes", "_larguras", "_acumulado",
+    )
+
+    def __init__(self, faixas):
+        limites = [float(faixa["limite"]) for faixa in faixas]
+        aliquotas = [float(faixa["aliquota"]) for faixa in faixas]
+        deducoes = [float(faixa.get("deducao", 0.0)) for faixa in faixas]
+
+        # Largura de cada faixa e INSS devido ao completar as faixas anteriores,
+        # somados na mesma ordem do laço original para manter os mesmos floats
+        larguras = []
+        acumulado = []
+        anterior = 0.0
+        total = 0.0
+        for limite, aliquota in zip(limites, aliquotas):
+            largura = limite - anterior
+            acumulado.append(total)
+            larguras.append(largura)
+            total += largura * aliquota
+            anterior = limite
+
+        # Tuplas para o caminho escalar (bisect) e arrays para o vetorizado
+        for nome, valores in (("limites", limites), ("aliquotas", aliquotas), ("deducoes", deducoes),
+                              ("larguras", larguras), ("acumulado", acumulado)):
+            array = np.array(valores, dtype=np.float64)
+            array.flags.writeable = False
+            object.__setattr__(self, nome, array)
+            object.__setattr__(self, "_" + nome, tuple(valores))
+
+    def __setattr__(self, nome, valor):
+        raise AttributeError("TabelaProgressiva é imutável")
+
+    def __len__(self):
+        return len(self._limites)
+
+    def __repr__(self):
+        return f"TabelaProgressiva(limites={self._limites}, aliquotas={self._aliquotas})"
+
+    @property
+    def teto(self):
+        """Limite da última faixa (teto de contribuição no INSS)."""
+        return self._limites[-1]
+
+    def faixa(self, valor):
+        """Índice da faixa em que o valor se encontra (busca binária)."""
+        return bisect_left(self._limites, valor)
+
+    def inss(self, salario_bruto):
+        """INSS progressivo de um salário, sem arredondamento."""
+        salario_calculo = min(salario_bruto, self._limites[-1])
+        i = bisect_left(self._limites, salario_calculo)
+        # Desconta as larguras uma a uma, como o laço original, para obter o mesmo float
+        salario_restante = salario_calculo
+        for largura in self._larguras[:i]:
+            salario_restante -= largura
+        return self._acumulado[i] + salario_restante * self._aliquotas[i]
+
+    def irrf(self, base_calculo):
+        """IRRF de uma base de cálculo, sem arredondamento (None acima da última faixa)."""
+        i = bisect_left(self._limites, base_calculo)
+        if i == len(self._limites):
+            return None
+        return (base_calculo * self._aliquotas[i]) - self._deducoes[i]
+
+
+# Cache das tabelas já compiladas, por identidade da lista original.
+# A lista é mantida no cache para que o id não seja reaproveitado.
+_COMPILADAS = {}
+
+
+def compilar_tabela(tabela):
+    """Retorna a `TabelaProgressiva` de uma lista de faixas, compilando-a só na primeira vez."""
+    if isinstance(tabela, TabelaProgressiva):
+        return tabela
+    item = _COMPILADAS.get(id(tabela))
+    if item is None or item[0] is not tabela:
+        item = (tabela, TabelaProgressiva(tabela))
+        _COMPILADAS[id(tabela)] = item
+    return item[1]
+
+
+_CACHE_DETALHAMENTO = CacheLRU("detalhar_faixas")
+
+
+def detalhar_faixas(tabela):
+    """
+    Detalhamento das faixas de uma tabela para relatórios: tupla de
+    (limite_anterior, limite, aliquota, deducao, valor_maximo_na_faixa),
+    calculada uma única vez por tabela.
+    """
+    tabela = compilar_tabela(tabela)
+    return _CACHE_DETALHAMENTO.obter(tabela, _detalhar_faixas, tabela)
+
+
+def _detalhar_faixas(tabela):
+    faixas = []
+    limite_anterior = 0.0
+    for limite, aliquota, deducao in zip(tabela._limites, tabela._aliquotas, tabela._deducoes):
+        faixas.append((limite_anterior, limite, aliquota, deducao, (limite - limite_anterior) * aliquota))
+        limite_anterior = limite
+    return tuple(faixas)
@@ -0,0 +1,133 @@
+"""
+Detecção do formato de arquivos CSV de folha (separador, codificação e
+separadores decimal/milhar) a partir de uma amostra do início do arquivo,
+para que o arquivo seja lido uma única vez com os parâmetros corretos.
+"""
+import codecs
+import csv
+import os
+import re
+
+import pandas as pd
+
+TAMANHO_AMOSTRA = 64 * 1024
+
+# Colunas numéricas lidas com tipo explícito (sem coerção posterior de texto)
+TIPOS_COLUNAS = {
+    'Salario_Bruto': 'float64',
+    'Dependentes': 'float64',
+    'Outros_Descontos': 'float64',
+}
+
+_SEPARADORES = ';,\t|'
+
+# Números no padrão brasileiro (1.234,56 / 1234,56) e no padrão ponto (1,234.56 / 1234.56)
+_NUMERO_VIRGULA = re.compile(r'^-?(\d{1,3}(\.\d{3})+|\d+)(,\d+)?$')
+_NUMERO_PONTO = re.compile(r'^-?(\d{1,3}(,\d{3})+|\d+)(\.\d+)?$')
+_MILHAR_PONTO = re.compile(r'^-?\d{1,3}(\.\d{3})+(,\d+)?$')
+_MILHAR_VIRGULA = re.compile(r'^-?\d{1,3}(,\d{3})+(\.\d+)?$')
+
+
+def _ler_amostra(arquivo, tamanho):
+    """Lê os primeiros bytes de um caminho ou arquivo binário, sem mudar a posição de leitura."""
+    if isinstance(arquivo, (str, os.PathLike)):
+        with open(arquivo, 'rb') as f:
+            return f.read(tamanho)
+    posicao = arquivo.tell()
+    amostra = arquivo.read(tamanho)
+    arquivo.seek(posicao)
+    return amostra
+
+
+def _detectar_codificacao(amostra):
+    if amostra.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig'
+    try:
+        amostra.decode('utf-8')
+    except UnicodeDecodeError as erro:
+        # A amostra pode terminar no meio de um caractere multibyte
+        if erro.start < len(amostra) - 3:
+            return 'latin-1'
+    return 'utf-8'
+
+
+def _detectar_separador(texto):
+    linhas = texto.splitlines()
+    try:
+        return csv.Sniffer().sniff('\n'.join(linhas[:20]), delimiters=_SEPARADORES).delimiter
+    except csv.Error:
+        cabecalho = linhas[0] if linhas else ''
+        return max(_SEPARADORES, key=cabecalho.count) if any(s in cabecalho for s in _SEPARADORES) else ','
+
+
+def _detectar_decimal(texto, separador):
+    """Retorna (decimal, milhar) pelos valores numéricos das primeiras linhas."""
+    linhas = texto.splitlines()[1:-1] or texto.splitlines()[1:]
+    virgula = ponto = milhar_ponto = milhar_virgula = 0
+    for campos in csv.reader(linhas, delimiter=separador):
+        for campo in campos:
+            campo = campo.strip()
+            if ',' in campo and _NUMERO_VIRGULA.match(campo):
+                virgula += 1
+                milhar_ponto += bool(_MILHAR_PONTO.match(campo))
+            elif '.' in campo and _NUMERO_PONTO.match(campo):
+                ponto += 1
+                milhar_virgula += bool(_MILHAR_VIRGULA.match(campo))
+            elif '.' in campo and _MILHAR_PONTO.match(campo):
+                milhar_ponto += 1
+
+    if virgula > ponto:
+        return ',', ('.' if milhar_ponto else None)
+    return '.', (',' if milhar_virgula and separador != ',' else None)
+
+
+def detectar_formato(arquivo, tamanho_amostra=TAMANHO_AMOSTRA):
+    """
+    Detecta separador, codificação (UTF-8 ou latin-1) e separadores decimal e
+    de milhar lendo apenas o início do arquivo. Retorna um dicionário com os
+    argumentos `sep`, `encoding`, `decimal` e `thousands` do `pd.read_csv`.
+    """
+    amostra = _ler_amostra(arquivo, tamanho_amostra)
+    codificacao = _detectar_codificacao(amostra)
+    texto = amostra.decode(codificacao, errors='ignore')
+    separador = _detectar_separador(texto)
+    decimal, milhar = _detectar_decimal(texto, separador)
+    return {'sep': separador, 'encoding': codificacao, 'decimal': decimal, 'thousands': milhar}
+
+
+def _converter_numericas(df, formato):
+    """Converte colunas numéricas que vieram como texto, respeitando o decimal e o milhar detectados."""
+    for coluna in TIPOS_COLUNAS:
+        if coluna in df.columns and not pd.api.types.is_numeric_dtype(df[coluna]):
+            texto = df[coluna].astype('string').str.strip()
+            if formato.get('thousands'):
+                texto = texto.str.replace(formato['thousands'], '', regex=False)
+            if formato.get('decimal', '.') != '.':
+                texto = texto.str.replace(formato['decimal'], '.', regex=False)
+            df[coluna] = pd.to_numeric(texto, errors='coerce').to_numpy(dtype='float64', na_value=float('nan'))
+    return df
+
+
+def ler_csv(arquivo, formato=None, **kwargs):
+    """
+    Lê o CSV uma única vez com o formato detectado e tipos explícitos para as
+    colunas numéricas. Se alguma célula numérica não puder ser convertida,
+    relê sem os tipos e converte as colunas numéricas célula a célula
+    (células inválidas ficam vazias e viram 0 em `preparar_entrada`).
+    """
+    formato = formato or detectar_formato(arquivo)
+    posicao = None if isinstance(arquivo, (str, os.PathLike)) else arquivo.tell()
+    try:
+        return pd.read_csv(arquivo, dtype=TIPOS_COLUNAS, **formato, **kwargs)
+    except ValueError:
+        if posicao is not None:
+            arquivo.seek(posicao)
+        return _converter_numericas(pd.read_csv(arquivo, **formato, **kwargs), formato)
+
+
+def ler_csv_em_blocos(arquivo, tamanho_bloco, formato=None):
+    """Lê o CSV em blocos com o formato detectado (tipos inferidos e convertidos bloco a bloco)."""
+    formato = formato or detectar_formato(arquivo)
+    with pd.read_csv(arquivo, chunksize=tamanho_bloco, **formato) as leitor:
+        for bloco in leitor:
+            yield _converter_numericas(bloco, formato)
@@ -0,0 +1,64 @@
+"""
+Grade de resultados paginada.
+
+Busca, filtros, ordenação e recorte da página são feitos no servidor, sobre
+o `df_resultado` numérico: a interface recebe só as linhas da página
+visível, sem cópia nem formatação da folha inteira. As posições filtradas e
+ordenadas são calculadas uma vez por combinação de busca/filtro/ordem;
+trocar de página é só um recorte.
+"""
+import numpy as np
+import pandas as pd
+
+from .relatorio import formatar_moeda_coluna
+
+TAMANHO_PAGINA_PADRAO = 100
+
+
+def posicoes_visiveis(df_resultado, busca='', filtros=None, ordenar_por=None, crescente=True):
+    """
+    Posições (iloc) das linhas cujo Nome contém `busca` (sem diferenciar
+    maiúsculas) e cujas colunas são iguais aos valores de `filtros`
+    ({coluna: valor}), na ordem de `ordenar_por` (ou na ordem do arquivo).
+    """
+    mascara = np.ones(len(df_resultado), dtype=bool)
+    if busca:
+        mascara &= df_resultado['Nome'].astype(str).str.contains(busca, case=False, regex=False, na=False).to_numpy()
+    for coluna, valor in (filtros or {}).items():
+        mascara &= (df_resultado[coluna] == valor).to_numpy()
+    posicoes = np.flatnonzero(mascara)
+
+    if ordenar_por:
+        valores = df_resultado[ordenar_por].iloc[posicoes].reset_index(drop=True)
+        ordem = valores.sort_values(ascending=crescente, kind='stable', na_position='last').index.to_numpy()
+        posicoes = posicoes[ordem]
+    return posicoes
+
+def total_paginas(quantidade, tamanho_pagina=TAMANHO_PAGINA_PADRAO):
+    """Número de páginas para `quantidade` linhas (ao menos 1)."""
+    return max(1, -(-quantidade // tamanho_pagina))
+
+def pagina_resultado(df_resultado, posicoes, pagina, tamanho_pagina=TAMANHO_PAGINA_PADRAO, colunas=None,
+                     moeda=False):
+    """
+    Linhas da `pagina` (a partir de 1, limitada ao intervalo válido) dentre
+    as `posicoes`, só com as `colunas` pedidas. Retorna (df_pagina, primeira
+    linha, última linha), com as linhas numeradas a partir de 1. Colunas
+    categóricas voltam a valores simples (datas e textos) só nesta página.
+    Com `moeda`, as colunas float da página viram textos 'R$ 1.234,56'
+    (`formatar_moeda_coluna`, o mesmo formato do PDF).
+    """
+    pagina = min(max(int(pagina), 1), total_paginas(len(posicoes), tamanho_pagina))
+    inicio = (pagina - 1) * tamanho_pagina
+    trecho = posicoes[inicio:inicio + tamanho_pagina]
+    df_pagina = df_resultado.iloc[trecho]
+    if colunas is not None:
+        df_pagina = df_pagina[list(colunas)]
+    categoricas = [coluna for coluna, tipo in df_pagina.dtypes.items() if isinstance(tipo, pd.CategoricalDtype)]
+    if categoricas:
+        df_pagina = df_pagina.astype({coluna: object for coluna in categoricas})
+    if moeda:
+        monetarias = [coluna for coluna, tipo in df_pagina.dtypes.items() if tipo == 'float64']
+        if monetarias:
+            df_pagina = df_pagina.assign(**{coluna: formatar_moeda_coluna(df_pagina[coluna]) for coluna in monetarias})
+    return df_pagina, inicio + 1 if len(trecho) else 0, inicio + len(trecho)
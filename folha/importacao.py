@@ -0,0 +1,142 @@
+"""
+Orçamento de tempo de importação das páginas.
+
+Ao abrir uma página pela primeira vez em um processo novo do servidor, o
+custo fixo é o dos imports de topo do script. Aqui esses imports (lidos
+com `ast`, sem executar a página) são refeitos em um interpretador novo
+com `-X importtime`, algumas vezes (vale a menor medida), e comparados com
+o orçamento. Módulos não instalados no ambiente são listados à parte e
+ficam fora da medida.
+
+    python -m folha.importacao [paginas.py ...] [--orcamento 1500] [--repeticoes 3]
+"""
+import argparse
+import ast
+import glob
+import json
+import os
+import subprocess
+import sys
+
+ORCAMENTO_IMPORTACAO_MS = 1500
+
+# Executado no interpretador novo: mede cada import de topo da página
+_MEDIDOR = """
+import json, sys, time
+comandos = json.loads(sys.argv[1])
+ausentes = []
+sys.stderr.write("#inicio\\n")
+sys.stderr.flush()
+inicio = time.perf_counter()
+for comando in comandos:
+    try:
+        exec(comando, {})
+    except ImportError as erro:
+        ausentes.append(erro.name or comando)
+print(json.dumps({"ms": (time.perf_counter() - inicio) * 1000, "ausentes": ausentes}))
+"""
+
+
+# --- IMPORTS DA PÁGINA ---
+
+def imports_de_topo(caminho):
+    """Comandos `import`/`from ... import` do nível de módulo da página, na ordem do arquivo."""
+    with open(caminho, encoding='utf-8') as arquivo:
+        fonte = arquivo.read()
+    arvore = ast.parse(fonte, filename=caminho)
+    return [
+        ast.get_source_segment(fonte, no)
+        for no in arvore.body
+        if isinstance(no, (ast.Import, ast.ImportFrom))
+    ]
+
+def paginas_padrao(pasta='.'):
+    """Scripts `.py` da pasta que importam o Streamlit no topo (as páginas do app)."""
+    paginas = []
+    for caminho in sorted(glob.glob(os.path.join(pasta, '*.py'))):
+        try:
+            comandos = imports_de_topo(caminho)
+        except SyntaxError:
+            continue
+        if any('streamlit' in comando for comando in comandos):
+            paginas.append(caminho)
+    return paginas
+
+
+# --- MEDIÇÃO ---
+
+def _modulos_mais_lentos(saida_importtime, quantidade):
+    """Módulos de primeiro nível com maior tempo acumulado, em ms, a partir da saída de `-X importtime`."""
+    modulos = []
+    medindo = False
+    for linha in saida_importtime.splitlines():
+        if linha == '#inicio':
+            medindo = True
+            continue
+        if not medindo or not linha.startswith('import time:'):
+            continue
+        _, acumulado, nome = linha.split('|')
+        if not acumulado.strip().isdigit() or nome[1:2] == ' ':
+            continue
+        modulos.append((nome.strip(), int(acumulado) / 1000))
+    return sorted(modulos, key=lambda modulo: -modulo[1])[:quantidade]
+
+def medir_pagina(caminho, repeticoes=3, modulos=5):
+    """
+    Tempo de importação da página, em ms (menor de `repeticoes` execuções em
+    interpretadores novos). Retorna um dicionário com `ms`, os `modulos` de
+    primeiro nível mais lentos e os módulos `ausentes` no ambiente.
+    """
+    pasta = os.path.dirname(os.path.abspath(caminho))
+    comandos = json.dumps(imports_de_topo(caminho))
+    ambiente = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [pasta, os.environ.get('PYTHONPATH')])))
+
+    melhor = None
+    for _ in range(max(repeticoes, 1)):
+        execucao = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', _MEDIDOR, comandos],
+            cwd=pasta, env=ambiente, capture_output=True, text=True, check=True,
+        )
+        medida = json.loads(execucao.stdout.strip().splitlines()[-1])
+        if melhor is None or medida['ms'] < melhor['ms']:
+            lentos = [modulo for modulo in _modulos_mais_lentos(execucao.stderr, modulos + len(medida['ausentes']))
+                      if modulo[0] not in medida['ausentes']]
+            melhor = dict(medida, modulos=lentos[:modulos])
+    return dict(melhor, pagina=os.path.basename(caminho))
+
+def medir_paginas(caminhos, orcamento_ms=ORCAMENTO_IMPORTACAO_MS, repeticoes=3):
+    """Mede cada página e marca se ficou dentro de `orcamento_ms`."""
+    resultados = []
+    for caminho in caminhos:
+        resultado = medir_pagina(caminho, repeticoes)
+        resultado['dentro_do_orcamento'] = resultado['ms'] <= orcamento_ms
+        resultados.append(resultado)
+    return resultados
+
+
+# --- LINHA DE COMANDO ---
+
+def main(argv=None):
+    """Imprime o tempo de importação por página; retorna 1 se alguma passou do orçamento."""
+    parser = argparse.ArgumentParser(prog='python -m folha.importacao', description=__doc__.strip().splitlines()[0])
+    parser.add_argument('paginas', nargs='*', help="Páginas a medir (padrão: as páginas Streamlit da pasta atual)")
+    parser.add_argument('--orcamento', type=float, default=ORCAMENTO_IMPORTACAO_MS,
+                        help=f"Orçamento por página, em ms (padrão: {ORCAMENTO_IMPORTACAO_MS})")
+    parser.add_argument('--repeticoes', type=int, default=3, help="Execuções por página; vale a menor (padrão: 3)")
+    args = parser.parse_args(argv)
+
+    resultados = medir_paginas(args.paginas or paginas_padrao(), args.orcamento, args.repeticoes)
+    largura = max([len(resultado['pagina']) for resultado in resultados] + [6])
+    print(f"{'Página':<{largura}}  {'Importação':>11}  Situação  Módulos mais lentos")
+    for resultado in resultados:
+        situacao = 'OK' if resultado['dentro_do_orcamento'] else 'ACIMA'
+        lentos = ', '.join(f"{nome} {ms:.0f} ms" for nome, ms in resultado['modulos'])
+        print(f"{resultado['pagina']:<{largura}}  {resultado['ms']:>8.0f} ms  {situacao:<8}  {lentos}")
+        if resultado['ausentes']:
+            print(f"{'':<{largura}}  não instalados (fora da medida): {', '.join(resultado['ausentes'])}")
+    print(f"Orçamento: {args.orcamento:.0f} ms por página")
+    return 0 if all(resultado['dentro_do_orcamento'] for resultado in resultados) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
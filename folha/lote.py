@@ -0,0 +1,349 @@
+"""
+Processamento em lote da auditoria: calcula Salário Família, INSS, IRRF e
+Salário Líquido de todas as linhas da folha com operações sobre colunas
+inteiras, sem laço por funcionário.
+
+Linhas repetidas (mesmo salário, dependentes, outros descontos e
+competência) são calculadas uma única vez e o resultado é replicado. Quando a
+folha traz uma coluna `Competencia`, as linhas são agrupadas pelo conjunto de
+tabelas em vigor e cada grupo é calculado em uma única chamada.
+"""
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from .centavos import calcular_folha_centavos, compilar_tabela_centavos, para_centavos, para_reais
+from .faixas import detalhar_faixas
+from .registro import (
+    VIGENCIAS_INSS,
+    VIGENCIAS_IRRF,
+    VIGENCIAS_SALARIO_FAMILIA,
+    id_conjunto,
+    resolver_competencias,
+    selecionar_tabelas_simuladas,
+    tabelas_do_conjunto,
+)
+from .vetorizado import (
+    calcular_inss_vetorizado,
+    calcular_irrf_vetorizado,
+    calcular_salario_familia_vetorizado,
+    _METODOS_DEDUCAO,
+)
+
+# Formatos aceitos na coluna Competencia, tentados em ordem
+_FORMATOS_COMPETENCIA = ("%m/%Y", "%d/%m/%Y", "ISO8601")
+
+# Colunas de texto do resultado com poucos valores distintos por execução,
+# guardadas como categóricas (cada valor uma vez, um código pequeno por linha)
+_COLUNAS_CATEGORICAS = ('Origem', 'Ano_Base_Sim', 'IRRF_Periodo_Sim')
+
+
+def calcular_folha_vetorizada(salarios_brutos, dependentes, outros_descontos, tabelas):
+    """
+    Calcula as verbas de todas as linhas com um conjunto de tabelas.
+
+    `tabelas` é a tupla retornada por `selecionar_tabelas` (ou equivalente da página).
+    Retorna um dicionário de arrays: Salario_Familia, INSS, IRRF,
+    Salario_Liquido e Metodo_Deducao.
+    """
+    tabela_inss, tabela_irrf, limite_sf, valor_sf, _, _, ds_maximo = tabelas
+
+    salarios = np.asarray(salarios_brutos, dtype=np.float64)
+    dependentes = np.asarray(dependentes, dtype=np.int64)
+    outros_descontos = np.asarray(outros_descontos, dtype=np.float64)
+
+    inss = calcular_inss_vetorizado(salarios, tabela_inss)
+    sal_familia = calcular_salario_familia_vetorizado(salarios, dependentes, limite_sf, valor_sf)
+    irrf, metodo_deducao, _, _ = calcular_irrf_vetorizado(salarios, dependentes, inss, outros_descontos, tabela_irrf, ds_maximo)
+    salario_liquido = salarios + sal_familia - inss - irrf - outros_descontos
+
+    return {
+        'Salario_Familia': sal_familia,
+        'INSS': inss,
+        'IRRF': irrf,
+        'Salario_Liquido': salario_liquido,
+        'Metodo_Deducao': metodo_deducao,
+    }
+
+
+def preparar_entrada(df):
+    """
+    Converte as colunas de entrada para os tipos do cálculo: valores não
+    numéricos viram 0 e `Outros_Descontos` é criada (zerada) se não existir.
+    """
+    df['Salario_Bruto'] = pd.to_numeric(df['Salario_Bruto'], errors='coerce').fillna(0)
+    df['Dependentes'] = pd.to_numeric(df['Dependentes'], errors='coerce').fillna(0).astype(int)
+    if 'Outros_Descontos' in df.columns:
+        df['Outros_Descontos'] = pd.to_numeric(df['Outros_Descontos'], errors='coerce').fillna(0)
+    else:
+        df['Outros_Descontos'] = 0.0
+    return df
+
+
+def _identidade(valores):
+    return valores
+
+
+def _competencias_por_linha(valores, competencia_padrao):
+    """
+    Converte a coluna Competencia (MM/AAAA, DD/MM/AAAA ou AAAA-MM-DD) para o
+    primeiro dia do mês de cada linha. Células vazias ou inválidas usam a
+    competência padrão. Retorna um array datetime64[D].
+    """
+    valores = pd.Series(valores)
+    if pd.api.types.is_datetime64_any_dtype(valores):
+        datas = valores
+    else:
+        texto = valores.astype("string").str.strip()
+        datas = pd.Series(pd.NaT, index=valores.index, dtype="datetime64[ns]")
+        for formato in _FORMATOS_COMPETENCIA:
+            faltando = datas.isna() & texto.notna()
+            if not faltando.any():
+                break
+            datas[faltando] = pd.to_datetime(texto[faltando], format=formato, errors="coerce")
+
+    meses = datas.to_numpy(dtype="datetime64[ns]").astype("datetime64[M]").astype("datetime64[D]")
+    return np.where(np.isnat(meses), np.datetime64(competencia_padrao, "D"), meses)
+
+
+def _deduplicar(*colunas):
+    """
+    Identifica as combinações únicas das colunas por fatoração (hash), sem ordenar.
+
+    Retorna (primeiras, combinacao): o índice da primeira linha de cada
+    combinação e, para cada linha, o número da sua combinação.
+    """
+    combinacao = np.zeros(len(colunas[0]), dtype=np.int64)
+    limite = 1
+    for coluna in colunas:
+        codigos, unicos = pd.factorize(coluna, use_na_sentinel=False)
+        if len(unicos) == 1:
+            continue
+        # Renumera antes que o código combinado possa estourar o int64
+        if limite * len(unicos) >= 2**62:
+            combinacao, unicas = pd.factorize(combinacao)
+            limite = len(unicas)
+        combinacao = combinacao * len(unicos) + codigos
+        limite *= len(unicos)
+    combinacao, _ = pd.factorize(combinacao)
+
+    # `factorize` numera na ordem da primeira ocorrência: cada combinação
+    # nova é a que eleva o máximo acumulado
+    novas = np.diff(np.maximum.accumulate(combinacao), prepend=-1) > 0
+    return np.flatnonzero(novas), combinacao
+
+
+def _calcular_por_grupo(salarios, dependentes, outros_descontos, chaves, tabelas_da_chave, chave_padrao,
+                        calcular=calcular_folha_vetorizada):
+    """
+    Agrupa as linhas por chave (conjunto de tabelas) e calcula cada grupo com
+    uma única chamada de `calcular` (`calcular_folha_vetorizada` ou
+    `calcular_folha_centavos`). Retorna o dicionário de arrays do cálculo, a
+    lista de tabelas de cada grupo e o índice do grupo de cada linha.
+    `chave_padrao` é usada quando não há linhas.
+    """
+    unicas, grupo = np.unique(chaves, return_inverse=True)
+    if len(unicas) <= 1:
+        tabelas = tabelas_da_chave(unicas[0] if len(unicas) else chave_padrao)
+        return calcular(salarios, dependentes, outros_descontos, tabelas), [tabelas], grupo
+
+    resultado = None
+    tabelas_grupos = []
+    for i, chave in enumerate(unicas):
+        linhas = np.flatnonzero(grupo == i)
+        tabelas = tabelas_da_chave(chave)
+        tabelas_grupos.append(tabelas)
+        parcial = calcular(salarios[linhas], dependentes[linhas], outros_descontos[linhas], tabelas)
+        if resultado is None:
+            resultado = {nome: np.empty(len(salarios), dtype=array.dtype) for nome, array in parcial.items()}
+        for nome, array in parcial.items():
+            resultado[nome][linhas] = array
+    return resultado, tabelas_grupos, grupo
+
+
+def processar_lote(df, competencia, simular_ano_anterior=False, centavos=False):
+    """
+    Executa a "Auditoria Completa" sobre um DataFrame com as colunas
+    Nome, Salario_Bruto, Dependentes e Outros_Descontos.
+
+    Se o DataFrame tiver a coluna opcional `Competencia`, cada linha usa as
+    tabelas da sua competência (vazios usam `competencia`); senão, todas as
+    linhas usam `competencia`. A coluna opcional `Origem` (aba ou planilha de
+    onde veio a linha) é repassada ao resultado.
+
+    Retorna o `df_resultado` no mesmo formato da versão linha a linha,
+    incluindo as colunas `_Sim` quando a simulação do ano anterior está ativa.
+    Em `df_resultado.attrs['deduplicacao']` ficam o número de linhas, o de
+    combinações únicas efetivamente calculadas e a razão entre eles.
+
+    Com `centavos=True`, os valores são convertidos para centavos int64 e
+    todo o cálculo é feito em inteiros (`folha.centavos`); as colunas
+    monetárias voltam em reais, convertidas sem perda a partir dos centavos.
+    """
+    salarios, dependentes, outros_descontos, competencias, coluna_competencia = _entradas_numericas(df, competencia, centavos)
+    verbas, combinacoes_unicas = _calcular_verbas(
+        salarios, dependentes, outros_descontos, competencias, competencia, simular_ano_anterior, centavos,
+    )
+    return _montar_resultado(df, salarios, dependentes, outros_descontos, coluna_competencia, verbas,
+                             combinacoes_unicas, centavos)
+
+
+def _entradas_numericas(df, competencia, centavos=False):
+    """
+    Arrays de entrada do cálculo: salários, dependentes e outros descontos (em
+    centavos int64 se `centavos`), a competência de cada linha (datetime64[D])
+    e o valor da coluna Competencia do resultado (data única ou categórica
+    de datas).
+    """
+    salarios = df['Salario_Bruto'].to_numpy(dtype=np.float64)
+    dependentes = df['Dependentes'].to_numpy(dtype=np.int64)
+    if 'Outros_Descontos' in df.columns:
+        outros_descontos = df['Outros_Descontos'].to_numpy(dtype=np.float64)
+    else:
+        outros_descontos = np.zeros(len(df))
+    if centavos:
+        salarios = para_centavos(salarios)
+        outros_descontos = para_centavos(outros_descontos)
+
+    if 'Competencia' in df.columns:
+        competencias = _competencias_por_linha(df['Competencia'], competencia)
+        codigos, datas = pd.factorize(competencias, sort=True)
+        coluna_competencia = pd.Categorical.from_codes(codigos, datas.astype(object))
+    else:
+        competencias = np.full(len(df), np.datetime64(competencia, "D"))
+        coluna_competencia = competencia
+    return salarios, dependentes, outros_descontos, competencias, coluna_competencia
+
+
+def _calcular_verbas(salarios, dependentes, outros_descontos, competencias, competencia,
+                     simular_ano_anterior=False, centavos=False):
+    """
+    Núcleo de `processar_lote` sobre arrays: deduplica as linhas, calcula
+    cada conjunto de tabelas (e cada ano da simulação) e replica o resultado.
+    Retorna (verbas, combinacoes_unicas): as colunas calculadas por linha,
+    com valores em reais, e o número de combinações efetivamente calculadas.
+    """
+    calcular, em_reais = (calcular_folha_centavos, para_reais) if centavos else (calcular_folha_vetorizada, _identidade)
+
+    # DEDUPLICAÇÃO: cada combinação (salário, dependentes, outros descontos,
+    # competência) é calculada uma vez e replicada para as linhas iguais
+    primeiras, combinacao = _deduplicar(salarios, dependentes, outros_descontos, competencias.view(np.int64))
+    if len(primeiras) == len(salarios):
+        replicar = _identidade
+    else:
+        def replicar(valores):
+            return valores[combinacao]
+    salarios_unicos = salarios[primeiras]
+    dependentes_unicos = dependentes[primeiras]
+    outros_unicos = outros_descontos[primeiras]
+    competencias_unicas = competencias[primeiras]
+
+    # CÁLCULO OFICIAL (um grupo por conjunto de tabelas)
+    oficial, _, _ = _calcular_por_grupo(
+        salarios_unicos, dependentes_unicos, outros_unicos,
+        resolver_competencias(competencias_unicas), tabelas_do_conjunto, id_conjunto(competencia), calcular,
+    )
+    verbas = {
+        'Salario_Familia': em_reais(replicar(oficial['Salario_Familia'])),
+        'INSS': em_reais(replicar(oficial['INSS'])),
+        'IRRF': em_reais(replicar(oficial['IRRF'])),
+        'Salario_Liquido': em_reais(replicar(oficial['Salario_Liquido'])),
+        'Metodo_Deducao': replicar(oficial['Metodo_Deducao']),
+    }
+
+    # ADICIONA CÁLCULO DE SIMULAÇÃO (um grupo por ano: tabelas de dezembro do ano anterior)
+    if simular_ano_anterior:
+        anos = competencias_unicas.astype("datetime64[Y]").astype(np.int64) + 1970
+        simulado, tabelas_sim, grupo_sim = _calcular_por_grupo(
+            salarios_unicos, dependentes_unicos, outros_unicos,
+            anos, lambda ano: selecionar_tabelas_simuladas(date(int(ano), 1, 1)), competencia.year, calcular,
+        )
+        grupo_sim = replicar(grupo_sim)
+
+        verbas['Salario_Familia_Sim'] = em_reais(replicar(simulado['Salario_Familia']))
+        verbas['INSS_Sim'] = em_reais(replicar(simulado['INSS']))
+        verbas['IRRF_Sim'] = em_reais(replicar(simulado['IRRF']))
+        verbas['Salario_Liquido_Sim'] = em_reais(replicar(simulado['Salario_Liquido']))
+        verbas['Metodo_Deducao_Sim'] = replicar(simulado['Metodo_Deducao'])
+        verbas['Ano_Base_Sim'] = _rotulos_por_grupo([tabelas[4] for tabelas in tabelas_sim], grupo_sim)
+        verbas['IRRF_Periodo_Sim'] = _rotulos_por_grupo([tabelas[5] for tabelas in tabelas_sim], grupo_sim)
+
+    return verbas, len(primeiras)
+
+
+def _rotulos_por_grupo(rotulos, grupo):
+    """Categórica com o rótulo do grupo de cada linha (`rotulos[grupo]`), sem repetir o texto por linha."""
+    codigos, unicos = pd.factorize(np.array(rotulos, dtype=object))
+    return pd.Categorical.from_codes(codigos[grupo], unicos)
+
+def _inteiro_compacto(valores):
+    """Inteiros no menor tipo com sinal que comporta os valores (int8 para dependentes)."""
+    maior = int(np.abs(valores).max(initial=0))
+    return valores.astype(np.promote_types(np.min_scalar_type(-maior - 1), np.int8))
+
+def _montar_resultado(df, salarios, dependentes, outros_descontos, coluna_competencia, verbas,
+                      combinacoes_unicas, centavos=False):
+    """
+    Monta o `df_resultado` (colunas na ordem da página) a partir das entradas
+    e das verbas calculadas. Dependentes ficam em inteiro pequeno; método de
+    dedução, competência, origem e rótulos da simulação, em categóricas: os
+    valores constantes da execução são guardados uma vez, no dtype, e cada
+    linha guarda só um código.
+    """
+    em_reais = para_reais if centavos else _identidade
+    colunas = {
+        'Nome': df['Nome'].to_numpy(),
+        'Salario_Bruto': em_reais(salarios),
+        'Dependentes': _inteiro_compacto(dependentes),
+        'Outros_Descontos': em_reais(outros_descontos),
+    }
+    colunas.update((nome, verbas[nome]) for nome in ('Salario_Familia', 'INSS', 'IRRF', 'Salario_Liquido', 'Metodo_Deducao'))
+    if isinstance(coluna_competencia, pd.Categorical):
+        colunas['Competencia'] = coluna_competencia
+    else:
+        colunas['Competencia'] = pd.Categorical.from_codes(np.zeros(len(df), dtype=np.int8), pd.Index([coluna_competencia], dtype=object))
+    if 'Origem' in df.columns:
+        colunas['Origem'] = df['Origem'].to_numpy()
+    colunas.update((nome, valores) for nome, valores in verbas.items() if nome not in colunas)
+
+    for nome in ('Metodo_Deducao', 'Metodo_Deducao_Sim'):
+        if nome in colunas:
+            simplificado = (colunas[nome] == _METODOS_DEDUCAO[1]).view(np.int8)
+            colunas[nome] = pd.Categorical.from_codes(simplificado, _METODOS_DEDUCAO)
+    for nome in _COLUNAS_CATEGORICAS:
+        if nome in colunas and not isinstance(colunas[nome], pd.Categorical):
+            colunas[nome] = pd.Categorical(colunas[nome])
+
+    df_resultado = pd.DataFrame(colunas, index=pd.RangeIndex(len(df)))
+    df_resultado.attrs['deduplicacao'] = {
+        'linhas': len(df),
+        'combinacoes_unicas': combinacoes_unicas,
+        'razao': len(df) / combinacoes_unicas if combinacoes_unicas else 1.0,
+    }
+    df_resultado.attrs['modo_calculo'] = 'centavos' if centavos else 'float'
+    return df_resultado
+
+
+# --- AQUECIMENTO ---
+
+def aquecer_tabelas():
+    """
+    Prepara de uma vez tudo o que o primeiro cálculo faria sob demanda: os
+    conjuntos de tabelas de todas as vigências (oficiais e de simulação),
+    as tabelas compiladas (em reais e em centavos) com o detalhamento das
+    faixas, e uma auditoria de uma linha em cada modo. Retorna o número de
+    conjuntos preparados.
+    """
+    conjuntos = len(VIGENCIAS_INSS) * len(VIGENCIAS_IRRF) * len(VIGENCIAS_SALARIO_FAMILIA)
+    for id_tabelas in range(conjuntos):
+        tabelas_do_conjunto(id_tabelas)
+        tabelas_do_conjunto(id_tabelas, simulacao=True)
+    for tabela in [vigencia[1] for vigencia in VIGENCIAS_INSS + VIGENCIAS_IRRF]:
+        detalhar_faixas(tabela)
+        compilar_tabela_centavos(tabela)
+
+    exemplo = pd.DataFrame({'Nome': ['Exemplo'], 'Salario_Bruto': [3000.0], 'Dependentes': [1], 'Outros_Descontos': [0.0]})
+    for centavos in (False, True):
+        processar_lote(exemplo, date.today().replace(day=1), simular_ano_anterior=True, centavos=centavos)
+    return conjuntos
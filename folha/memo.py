@@ -0,0 +1,97 @@
+"""
+Memoização limitada (LRU) dos cálculos escalares.
+
+A aba individual, as simulações e os geradores de PDF chamam as mesmas
+funções com os mesmos argumentos várias vezes. Cada função memoizada tem um
+`CacheLRU` próprio, com tamanho máximo configurável e contadores de acertos,
+falhas e descartes para avaliar se o cache compensa.
+"""
+from collections import OrderedDict
+from threading import Lock
+
+TAMANHO_CACHE_PADRAO = 4096
+
+# Caches registrados, por nome da função
+_CACHES = {}
+
+
+class CacheLRU:
+    """Cache LRU limitado, seguro entre threads (sessões do Streamlit)."""
+
+    __slots__ = ("nome", "tamanho_maximo", "acertos", "falhas", "descartes", "_itens", "_trava")
+
+    def __init__(self, nome, tamanho_maximo=TAMANHO_CACHE_PADRAO):
+        self.nome = nome
+        self.tamanho_maximo = tamanho_maximo
+        self.acertos = 0
+        self.falhas = 0
+        self.descartes = 0
+        self._itens = OrderedDict()
+        self._trava = Lock()
+        _CACHES[nome] = self
+
+    def __len__(self):
+        return len(self._itens)
+
+    def obter(self, chave, calcular, *argumentos):
+        """Retorna o valor da chave, chamando `calcular(*argumentos)` só quando ele não está no cache."""
+        with self._trava:
+            if chave in self._itens:
+                self._itens.move_to_end(chave)
+                self.acertos += 1
+                return self._itens[chave]
+            self.falhas += 1
+
+        valor = calcular(*argumentos)
+
+        with self._trava:
+            self._itens[chave] = valor
+            self._itens.move_to_end(chave)
+            self._descartar_excedente()
+        return valor
+
+    def redimensionar(self, tamanho_maximo):
+        """Altera o tamanho máximo, descartando os itens menos usados se preciso."""
+        with self._trava:
+            self.tamanho_maximo = tamanho_maximo
+            self._descartar_excedente()
+
+    def limpar(self):
+        """Esvazia o cache e zera os contadores."""
+        with self._trava:
+            self._itens.clear()
+            self.acertos = self.falhas = self.descartes = 0
+
+    def estatisticas(self):
+        """Contadores do cache e taxa de acerto (0 a 1)."""
+        consultas = self.acertos + self.falhas
+        return {
+            'acertos': self.acertos,
+            'falhas': self.falhas,
+            'descartes': self.descartes,
+            'tamanho': len(self._itens),
+            'tamanho_maximo': self.tamanho_maximo,
+            'taxa_acerto': self.acertos / consultas if consultas else 0.0,
+        }
+
+    def _descartar_excedente(self):
+        while len(self._itens) > max(self.tamanho_maximo, 0):
+            self._itens.popitem(last=False)
+            self.descartes += 1
+
+
+def estatisticas_cache():
+    """Estatísticas de todos os caches, por nome da função."""
+    return {nome: cache.estatisticas() for nome, cache in _CACHES.items()}
+
+
+def configurar_cache(tamanho_maximo):
+    """Define o tamanho máximo de todos os caches (0 desativa a memoização)."""
+    for cache in _CACHES.values():
+        cache.redimensionar(tamanho_maximo)
+
+
+def limpar_cache():
+    """Esvazia todos os caches e zera os contadores."""
+    for cache in _CACHES.values():
+        cache.limpar()
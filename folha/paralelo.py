@@ -0,0 +1,111 @@
+"""
+Auditoria de muitos arquivos em paralelo (um arquivo por processo).
+
+Os arquivos são distribuídos em um `ProcessPoolExecutor` com número
+limitado de processos. Um erro em um arquivo (ou a queda do processo que o
+auditava) é registrado como falha daquele arquivo, sem interromper os
+demais. Ao final, o resumo consolidado traz os totais de cada arquivo, os
+totais gerais, a vazão e as falhas.
+"""
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from .auditoria import auditar_arquivo, nomes_de_saida
+
+# Resumo por arquivo na pasta de saída; `resumo` fica reservado para que
+# nenhuma entrada grave `resumo_auditoria.*` por cima dele
+_NOME_BASE_RESUMO = 'resumo'
+NOME_RESUMO = f'{_NOME_BASE_RESUMO}_auditoria.csv'
+
+
+def _auditar_isolado(caminho, opcoes):
+    """Audita um arquivo devolvendo o erro no resumo, em vez de propagá-lo."""
+    try:
+        return auditar_arquivo(caminho, **opcoes)
+    except Exception as erro:
+        return {'arquivo': caminho, 'erro': f"{type(erro).__name__}: {erro}"}
+
+def auditar_arquivos(caminhos, competencia, simular_ano_anterior=False, centavos=False, formatos=('csv',),
+                     pasta_saida='.', observacao='', processos=None, ao_concluir=None, processos_por_arquivo=1):
+    """
+    Audita `caminhos` com até `processos` processos (padrão: número de CPUs;
+    1 audita no próprio processo). `ao_concluir(resumo)` é chamado a cada
+    arquivo terminado. Retorna o resumo consolidado e grava a tabela por
+    arquivo em `<pasta_saida>/resumo_auditoria.csv`. `processos_por_arquivo`
+    divide as linhas de cada arquivo entre processos (para poucos arquivos
+    muito grandes). Arquivos de mesmo nome em pastas diferentes recebem
+    nomes de saída distintos (`nomes_de_saida`).
+    """
+    caminhos = list(caminhos)
+    nomes = dict(zip(caminhos, nomes_de_saida(caminhos, reservados=(_NOME_BASE_RESUMO,))))
+    processos = min(processos or os.cpu_count() or 1, max(len(caminhos), 1))
+    opcoes = {
+        'competencia': competencia, 'simular_ano_anterior': simular_ano_anterior, 'centavos': centavos,
+        'formatos': formatos, 'pasta_saida': pasta_saida, 'observacao': observacao,
+        'processos_por_arquivo': processos_por_arquivo,
+    }
+
+    inicio = time.perf_counter()
+    resumos = []
+    if processos == 1:
+        for caminho in caminhos:
+            resumos.append(_auditar_isolado(caminho, dict(opcoes, nome_saida=nomes[caminho])))
+            if ao_concluir:
+                ao_concluir(resumos[-1])
+    else:
+        with ProcessPoolExecutor(max_workers=processos) as executor:
+            tarefas = {
+                executor.submit(_auditar_isolado, caminho, dict(opcoes, nome_saida=nomes[caminho])): caminho
+                for caminho in caminhos
+            }
+            for tarefa in as_completed(tarefas):
+                try:
+                    resumo = tarefa.result()
+                except Exception as erro:  # processo encerrado (ex.: falta de memória)
+                    resumo = {'arquivo': tarefas[tarefa], 'erro': f"{type(erro).__name__}: {erro}"}
+                resumos.append(resumo)
+                if ao_concluir:
+                    ao_concluir(resumo)
+    segundos = time.perf_counter() - inicio
+
+    ordem = {caminho: i for i, caminho in enumerate(caminhos)}
+    resumos.sort(key=lambda resumo: ordem[resumo['arquivo']])
+    concluidos = [resumo for resumo in resumos if 'erro' not in resumo]
+    falhas = {resumo['arquivo']: resumo['erro'] for resumo in resumos if 'erro' in resumo}
+
+    totais = {}
+    for resumo in concluidos:
+        for coluna, valor in resumo['totais'].items():
+            totais[coluna] = round(totais.get(coluna, 0.0) + valor, 2)
+    linhas = sum(resumo['linhas'] for resumo in concluidos)
+
+    consolidado = {
+        'arquivos': len(caminhos),
+        'concluidos': len(concluidos),
+        'falhas': falhas,
+        'linhas': linhas,
+        'totais': totais,
+        'segundos': segundos,
+        'processos': processos,
+        'linhas_por_segundo': linhas / segundos if segundos else 0.0,
+        'arquivos_por_segundo': len(caminhos) / segundos if segundos else 0.0,
+        'por_arquivo': resumos,
+        'arquivo_resumo': _gravar_resumo(resumos, pasta_saida),
+    }
+    return consolidado
+
+def _gravar_resumo(resumos, pasta_saida):
+    linhas = []
+    for resumo in resumos:
+        linha = {'Arquivo': resumo['arquivo'], 'Status': 'ERRO' if 'erro' in resumo else 'OK',
+                 'Linhas': resumo.get('linhas', 0), 'Segundos': round(resumo.get('segundos', 0.0), 3)}
+        linha.update(resumo.get('totais', {}))
+        linha['Erro'] = resumo.get('erro', '')
+        linhas.append(linha)
+    os.makedirs(pasta_saida, exist_ok=True)
+    caminho = os.path.join(pasta_saida, NOME_RESUMO)
+    pd.DataFrame(linhas).to_csv(caminho, sep=';', decimal=',', index=False, encoding='utf-8', float_format='%.2f')
+    return caminho
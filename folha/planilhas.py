@@ -0,0 +1,350 @@
+"""
+Leitura de abas do Google Sheets pelo endpoint gviz (exportação em CSV).
+
+Cada aba, identificada por (planilha, aba), fica em cache por um tempo de
+vida (TTL): reruns do Streamlit dentro do TTL não fazem nenhuma requisição.
+Vencido o TTL, a aba é pedida de novo em uma conexão persistente
+(keep-alive), com compressão gzip e cabeçalhos condicionais; se o servidor
+responder 304 ou o conteúdo tiver o mesmo hash, o DataFrame já lido é
+reaproveitado sem novo parse. O endereço base é configurável, o que permite
+testar contra um servidor HTTP local (`tests/servidor_gviz.py`).
+
+Com `carregar_colunas_planilha`, a seleção de colunas e o filtro de linhas
+vão para o servidor na consulta gviz (`tq`): só os dados auditados trafegam
+e são lidos. As colunas são conferidas com a linha de cabeçalho da aba:
+sem seleção explícita, a coluna de Competência entra automaticamente, e as
+colunas nomeadas que ficam de fora são informadas. `carregar_abas` lê várias abas (ou planilhas) em paralelo, com
+asyncio e um limite de requisições simultâneas, e junta tudo em uma única
+folha com a coluna `Origem`.
+"""
+import asyncio
+import gzip
+import hashlib
+import http.client
+import io
+import time
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+from threading import Lock
+from urllib.parse import quote, urljoin, urlsplit
+
+from .formato import ler_csv
+
+URL_PLANILHAS = "https://docs.google.com/spreadsheets"
+TTL_PADRAO = 300  # segundos
+TEMPO_LIMITE_PADRAO = 30  # segundos
+_MAXIMO_REDIRECIONAMENTOS = 5
+
+# Colunas lidas por padrão: Nome, Salario_Bruto, Dependentes, Outros_Descontos
+COLUNAS_PLANILHA = ('A', 'B', 'C', 'D')
+
+# Consulta que traz só a linha de cabeçalho da aba
+_CONSULTA_CABECALHO = 'limit 0'
+
+# Requisições simultâneas ao ler várias abas
+CONCORRENCIA_PADRAO = 8
+
+
+# --- SESSÃO HTTP (KEEP-ALIVE) ---
+
+class SessaoHTTP:
+    """Conexões HTTP(S) persistentes, reaproveitadas por host e seguras entre threads."""
+
+    def __init__(self, tempo_limite=TEMPO_LIMITE_PADRAO):
+        self.tempo_limite = tempo_limite
+        self.conexoes_abertas = 0
+        self._livres = {}
+        self._trava = Lock()
+
+    def _conexao(self, esquema, host):
+        with self._trava:
+            livres = self._livres.get((esquema, host))
+            if livres:
+                return livres.pop()
+            self.conexoes_abertas += 1
+        classe = http.client.HTTPSConnection if esquema == 'https' else http.client.HTTPConnection
+        return classe(host, timeout=self.tempo_limite)
+
+    def _devolver(self, esquema, host, conexao):
+        with self._trava:
+            self._livres.setdefault((esquema, host), []).append(conexao)
+
+    def _requisitar(self, url, cabecalhos):
+        partes = urlsplit(url)
+        caminho = (partes.path or '/') + (f'?{partes.query}' if partes.query else '')
+        cabecalhos = {'Accept-Encoding': 'gzip', 'Connection': 'keep-alive', **cabecalhos}
+
+        # Uma conexão ociosa pode ter sido fechada pelo servidor: tenta uma vez com outra
+        for tentativa in range(2):
+            conexao = self._conexao(partes.scheme, partes.netloc)
+            try:
+                conexao.request('GET', caminho, headers=cabecalhos)
+                resposta = conexao.getresponse()
+                conteudo = resposta.read()
+            except (http.client.HTTPException, OSError):
+                conexao.close()
+                if tentativa:
+                    raise
+                continue
+
+            if resposta.will_close:
+                conexao.close()
+            else:
+                self._devolver(partes.scheme, partes.netloc, conexao)
+            cabecalhos_resposta = {nome.lower(): valor for nome, valor in resposta.getheaders()}
+            if cabecalhos_resposta.get('content-encoding') == 'gzip':
+                conteudo = gzip.decompress(conteudo)
+            return resposta.status, cabecalhos_resposta, conteudo
+
+    def obter(self, url, cabecalhos=None):
+        """GET com redirecionamentos; retorna (status, cabeçalhos em minúsculas, corpo descomprimido)."""
+        for _ in range(_MAXIMO_REDIRECIONAMENTOS + 1):
+            status, cabecalhos_resposta, conteudo = self._requisitar(url, cabecalhos or {})
+            if status not in (301, 302, 303, 307, 308):
+                return status, cabecalhos_resposta, conteudo
+            url = urljoin(url, cabecalhos_resposta['location'])
+        raise ValueError(f"Redirecionamentos demais ao ler {url}")
+
+    def fechar(self):
+        """Fecha as conexões ociosas."""
+        with self._trava:
+            for conexoes in self._livres.values():
+                for conexao in conexoes:
+                    conexao.close()
+            self._livres.clear()
+
+
+_SESSAO = SessaoHTTP()
+
+
+# --- ENDEREÇOS ---
+
+def extrair_id_planilha(planilha):
+    """Id da planilha a partir da URL de compartilhamento (ou o próprio id)."""
+    if "/d/" in planilha:
+        return planilha.split("/d/")[1].split("/")[0]
+    return planilha
+
+def _letra_coluna(indice):
+    """Letra da coluna pela posição (0 -> 'A', 26 -> 'AA')."""
+    letras = ''
+    indice += 1
+    while indice:
+        indice, resto = divmod(indice - 1, 26)
+        letras = chr(ord('A') + resto) + letras
+    return letras
+
+def _nome_normalizado(nome):
+    """Nome de coluna sem acentos, em minúsculas e com '_' no lugar de espaços."""
+    sem_acentos = unicodedata.normalize('NFKD', str(nome)).encode('ascii', 'ignore').decode()
+    return sem_acentos.strip().lower().replace(' ', '_')
+
+def montar_consulta(colunas=COLUNAS_PLANILHA, filtro=None, limite=None):
+    """
+    Consulta gviz (`tq`) com as colunas (letras), a condição `where` e o
+    limite de linhas. Retorna None se não houver nada a restringir.
+    """
+    partes = []
+    if colunas:
+        partes.append(f"select {', '.join(colunas)}")
+    if filtro:
+        partes.append(f"where {filtro}")
+    if limite:
+        partes.append(f"limit {int(limite)}")
+    return ' '.join(partes) or None
+
+def url_csv(id_planilha, aba, url_base=URL_PLANILHAS, consulta=None):
+    """URL de exportação em CSV (gviz) de uma aba, com a consulta `tq` opcional."""
+    url = f"{url_base}/d/{id_planilha}/gviz/tq?tqx=out:csv&sheet={quote(aba)}"
+    return f"{url}&tq={quote(consulta)}" if consulta else url
+
+
+# --- CACHE POR (PLANILHA, ABA) ---
+
+# (url_base, id, aba, consulta) -> {'lida_em', 'hash', 'etag', 'modificado', 'df'}
+_CACHE_ABAS = {}
+_TRAVA_CACHE = Lock()
+_ESTATISTICAS = {'acertos_ttl': 0, 'nao_modificadas': 0, 'downloads': 0, 'parses': 0}
+
+
+def _contar(evento):
+    with _TRAVA_CACHE:
+        _ESTATISTICAS[evento] += 1
+
+def carregar_planilha(planilha, aba, ttl=TTL_PADRAO, url_base=URL_PLANILHAS, sessao=None, consulta=None):
+    """
+    Lê uma aba do Google Sheets como DataFrame (cópia do cache, se ainda no
+    TTL). `planilha` aceita a URL de compartilhamento ou o id; `ttl=0` força
+    a revalidação com o servidor; `consulta` é repassada como `tq`.
+    """
+    sessao = sessao or _SESSAO
+    id_planilha = extrair_id_planilha(planilha)
+    chave = (url_base, id_planilha, aba, consulta)
+
+    with _TRAVA_CACHE:
+        entrada = _CACHE_ABAS.get(chave)
+    if entrada is not None and time.monotonic() - entrada['lida_em'] < ttl:
+        _contar('acertos_ttl')
+        return entrada['df'].copy()
+
+    cabecalhos = {}
+    if entrada is not None:
+        if entrada['etag']:
+            cabecalhos['If-None-Match'] = entrada['etag']
+        if entrada['modificado']:
+            cabecalhos['If-Modified-Since'] = entrada['modificado']
+
+    url = url_csv(id_planilha, aba, url_base, consulta)
+    status, cabecalhos_resposta, conteudo = sessao.obter(url, cabecalhos)
+    _contar('downloads')
+
+    if status == 304 and entrada is not None:
+        _contar('nao_modificadas')
+        df = entrada['df']
+        hash_conteudo = entrada['hash']
+    elif status == 200:
+        hash_conteudo = hashlib.sha256(conteudo).hexdigest()
+        if entrada is not None and entrada['hash'] == hash_conteudo:
+            _contar('nao_modificadas')
+            df = entrada['df']
+        else:
+            _contar('parses')
+            df = ler_csv(io.BytesIO(conteudo))
+    else:
+        raise ValueError(f"Falha ao ler a aba '{aba}' (HTTP {status}): {url}")
+
+    with _TRAVA_CACHE:
+        _CACHE_ABAS[chave] = {
+            'lida_em': time.monotonic(),
+            'hash': hash_conteudo,
+            'etag': cabecalhos_resposta.get('etag'),
+            'modificado': cabecalhos_resposta.get('last-modified'),
+            'df': df,
+        }
+    return df.copy()
+
+def colunas_da_aba(planilha, aba, **opcoes):
+    """
+    Colunas nomeadas da aba, pela linha de cabeçalho ({letra: nome}). Só o
+    cabeçalho é baixado, e fica no cache como as demais consultas.
+    """
+    cabecalho = carregar_planilha(planilha, aba, consulta=_CONSULTA_CABECALHO, **opcoes)
+    return {
+        _letra_coluna(indice): str(nome)
+        for indice, nome in enumerate(cabecalho.columns)
+        if str(nome).strip() and not str(nome).startswith('Unnamed:')
+    }
+
+def carregar_colunas_planilha(planilha, aba, colunas=None, filtro=None, limite=None, **opcoes):
+    """
+    Lê só as `colunas` (letras) da aba, com filtro e limite de linhas
+    aplicados pelo servidor. Sem `colunas`, lê `COLUNAS_PLANILHA` e, se o
+    cabeçalho tiver uma coluna de Competência depois delas, também essa.
+    As colunas nomeadas do cabeçalho que ficaram de fora da seleção vão
+    para `df.attrs['colunas_ignoradas']` ({letra: nome}).
+
+    Se a consulta sem filtro for recusada (por exemplo, a aba tem menos
+    colunas que as pedidas), lê a aba inteira e aplica colunas e limite
+    localmente.
+    """
+    cabecalho = colunas_da_aba(planilha, aba, **opcoes)
+    if colunas is None:
+        competencia = [letra for letra, nome in cabecalho.items()
+                       if letra not in COLUNAS_PLANILHA and _nome_normalizado(nome) == 'competencia']
+        colunas = COLUNAS_PLANILHA + tuple(competencia[:1])
+    ignoradas = {letra: nome for letra, nome in cabecalho.items() if letra not in colunas}
+
+    try:
+        df = carregar_planilha(planilha, aba, consulta=montar_consulta(colunas, filtro, limite), **opcoes)
+    except ValueError:
+        if filtro:
+            raise
+        df = carregar_planilha(planilha, aba, **opcoes).iloc[:, :len(colunas)]
+        if limite:
+            df = df.head(int(limite))
+    df.attrs['colunas_ignoradas'] = ignoradas
+    return df
+
+def padronizar_colunas_planilha(df):
+    """
+    Renomeia as colunas pela posição para Nome, Salario_Bruto, Dependentes e
+    Outros_Descontos (criada com 0 se a aba só tiver três colunas). Uma
+    coluna seguinte chamada Competência (com ou sem acento) vira `Competencia`.
+    """
+    if len(df.columns) < 3:
+        raise ValueError("A aba precisa de pelo menos 3 colunas (Nome, Salario_Bruto, Dependentes).")
+    df.columns = ['Nome', 'Salario_Bruto', 'Dependentes'] + list(df.columns[3:])
+    if len(df.columns) > 3:
+        df = df.rename(columns={df.columns[3]: 'Outros_Descontos'})
+    else:
+        df['Outros_Descontos'] = 0.0
+    competencia = [nome for nome in df.columns[4:] if _nome_normalizado(nome) == 'competencia']
+    if competencia:
+        df = df.rename(columns={competencia[0]: 'Competencia'})
+    return df
+
+
+# --- VÁRIAS ABAS EM PARALELO ---
+
+def _rotulo_origem(planilha, aba, varias_planilhas):
+    return f"{extrair_id_planilha(planilha)}/{aba}" if varias_planilhas else aba
+
+async def _carregar_fontes(fontes, concorrencia, opcoes):
+    # Pool próprio: o executor padrão do asyncio pode ter menos threads que a concorrência pedida
+    loop = asyncio.get_running_loop()
+    limite = asyncio.Semaphore(concorrencia)
+
+    with ThreadPoolExecutor(max_workers=concorrencia) as executor:
+        async def carregar(planilha, aba):
+            async with limite:
+                df = await loop.run_in_executor(executor, lambda: carregar_colunas_planilha(planilha, aba, **opcoes))
+            return padronizar_colunas_planilha(df)
+
+        return await asyncio.gather(*(carregar(planilha, aba) for planilha, aba in fontes), return_exceptions=True)
+
+def carregar_abas(fontes, concorrencia=CONCORRENCIA_PADRAO, **opcoes):
+    """
+    Lê várias abas em paralelo e as concatena em uma folha, com a coluna
+    `Origem` (nome da aba ou "id/aba" quando há mais de uma planilha).
+    `fontes` é uma lista de (planilha, aba); `opcoes` vai para
+    `carregar_colunas_planilha` (colunas, filtro, limite, ttl, url_base...).
+
+    Abas com erro ficam em `df.attrs['erros_abas']` ({origem: mensagem}); se
+    todas falharem, o primeiro erro é levantado. As colunas nomeadas fora da
+    seleção ficam em `df.attrs['colunas_ignoradas']` ({origem: {letra: nome}}).
+    """
+    fontes = list(fontes)
+    varias_planilhas = len({extrair_id_planilha(planilha) for planilha, _ in fontes}) > 1
+    resultados = asyncio.run(_carregar_fontes(fontes, concorrencia, opcoes))
+
+    partes = []
+    erros = {}
+    ignoradas = {}
+    for (planilha, aba), resultado in zip(fontes, resultados):
+        origem = _rotulo_origem(planilha, aba, varias_planilhas)
+        if isinstance(resultado, Exception):
+            erros[origem] = str(resultado)
+        else:
+            if resultado.attrs.get('colunas_ignoradas'):
+                ignoradas[origem] = resultado.attrs['colunas_ignoradas']
+            partes.append(resultado.assign(Origem=origem))
+    if not partes:
+        raise next(resultado for resultado in resultados if isinstance(resultado, Exception))
+
+    df = pd.concat(partes, ignore_index=True)
+    df.attrs = {'erros_abas': erros, 'colunas_ignoradas': ignoradas}
+    return df
+
+def estatisticas_planilhas():
+    """Contadores do carregador: acertos no TTL, abas não modificadas, downloads e parses."""
+    with _TRAVA_CACHE:
+        return {**_ESTATISTICAS, 'abas_em_cache': len(_CACHE_ABAS)}
+
+def limpar_cache_planilhas():
+    """Esvazia o cache de abas e zera os contadores."""
+    with _TRAVA_CACHE:
+        _CACHE_ABAS.clear()
+        for evento in _ESTATISTICAS:
+            _ESTATISTICAS[evento] = 0
@@ -0,0 +1,226 @@
+"""
+Registro de vigências das tabelas legais.
+
+Cada tabela (INSS, IRRF + Desconto Simplificado, Salário Família) é indexada
+pela data de início de vigência. A resolução de uma competência é uma busca
+binária, e `resolver_competencias` resolve um array inteiro de competências
+em uma única chamada, retornando o id do conjunto de tabelas de cada linha.
+"""
+import hashlib
+from bisect import bisect_right
+from datetime import date, datetime
+from functools import lru_cache
+
+import numpy as np
+
+from .tabelas import (
+    DESCONTO_DEPENDENTE_IR,
+    DS_MAX_FEV2024_ABR2025,
+    DS_MAX_MAI2023_JAN2024,
+    DS_MAX_MAI2025_DEZ2025,
+    SF_LIMITE_2023,
+    SF_LIMITE_2024,
+    SF_LIMITE_2025,
+    SF_VALOR_2023,
+    SF_VALOR_2024,
+    SF_VALOR_2025,
+    TABELA_INSS_2020,
+    TABELA_INSS_2021,
+    TABELA_INSS_2022,
+    TABELA_INSS_2023,
+    TABELA_INSS_2024,
+    TABELA_INSS_2025,
+    TABELA_INSS_2026,
+    TABELA_INSS_JAN2023_ABR2023,
+    TABELA_IRRF_2023_MAI2024,
+    TABELA_IRRF_FEV2024_ABR2025,
+    TABELA_IRRF_MAI2025_DEZ2025,
+)
+
+# --- VIGÊNCIAS (ordenadas pela data de início) ---
+
+# (início, tabela)
+VIGENCIAS_INSS = (
+    (date(2020, 3, 1), TABELA_INSS_2020),
+    (date(2021, 1, 1), TABELA_INSS_2021),
+    (date(2022, 1, 1), TABELA_INSS_2022),
+    (date(2023, 1, 1), TABELA_INSS_JAN2023_ABR2023),
+    (date(2023, 5, 1), TABELA_INSS_2023),
+    (date(2024, 1, 1), TABELA_INSS_2024),
+    (date(2025, 1, 1), TABELA_INSS_2025),
+    (date(2026, 1, 1), TABELA_INSS_2026),
+)
+
+# (início, tabela, desconto simplificado máximo, período, norma)
+VIGENCIAS_IRRF = (
+    (date(2023, 5, 1), TABELA_IRRF_2023_MAI2024, DS_MAX_MAI2023_JAN2024, "01/05/2023 a 31/01/2024", "Tabela 2023"),
+    (date(2024, 2, 1), TABELA_IRRF_FEV2024_ABR2025, DS_MAX_FEV2024_ABR2025, "01/02/2024 a 30/04/2025", "MP 1.206/2024"),
+    (date(2025, 5, 1), TABELA_IRRF_MAI2025_DEZ2025, DS_MAX_MAI2025_DEZ2025, "01/05/2025 em diante", "MP 1.294/2025"),
+)
+
+# (início, limite de salário, valor por dependente)
+VIGENCIAS_SALARIO_FAMILIA = (
+    (date(2023, 1, 1), SF_LIMITE_2023, SF_VALOR_2023),
+    (date(2024, 1, 1), SF_LIMITE_2024, SF_VALOR_2024),
+    (date(2025, 1, 1), SF_LIMITE_2025, SF_VALOR_2025),
+)
+
+# Versão do registro: muda sempre que alguma tabela, vigência ou parâmetro
+# muda, invalidando resultados calculados com as tabelas anteriores
+VERSAO_REGISTRO = hashlib.sha256(
+    repr((VIGENCIAS_INSS, VIGENCIAS_IRRF, VIGENCIAS_SALARIO_FAMILIA, DESCONTO_DEPENDENTE_IR)).encode()
+).hexdigest()[:16]
+
+_INICIOS_INSS = tuple(vigencia[0] for vigencia in VIGENCIAS_INSS)
+_INICIOS_IRRF = tuple(vigencia[0] for vigencia in VIGENCIAS_IRRF)
+_INICIOS_SF = tuple(vigencia[0] for vigencia in VIGENCIAS_SALARIO_FAMILIA)
+
+_INICIOS_INSS_NP = np.array(_INICIOS_INSS, dtype="datetime64[D]")
+_INICIOS_IRRF_NP = np.array(_INICIOS_IRRF, dtype="datetime64[D]")
+_INICIOS_SF_NP = np.array(_INICIOS_SF, dtype="datetime64[D]")
+
+
+# --- RESOLUÇÃO POR COMPETÊNCIA ---
+
+def _como_data(competencia):
+    """Normaliza datetime/Timestamp para date (date e datetime não se comparam)."""
+    if isinstance(competencia, datetime):
+        return competencia.date()
+    return competencia
+
+def _indice_vigencia(inicios, competencia):
+    """Índice da vigência em vigor na competência (busca binária; antes da primeira, usa a primeira)."""
+    return max(bisect_right(inicios, _como_data(competencia)) - 1, 0)
+
+def indice_inss(competencia):
+    """Índice em VIGENCIAS_INSS da tabela em vigor na competência."""
+    return _indice_vigencia(_INICIOS_INSS, competencia)
+
+def indice_irrf(competencia):
+    """Índice em VIGENCIAS_IRRF da tabela em vigor na competência."""
+    return _indice_vigencia(_INICIOS_IRRF, competencia)
+
+def indice_salario_familia(competencia):
+    """Índice em VIGENCIAS_SALARIO_FAMILIA dos parâmetros em vigor na competência."""
+    return _indice_vigencia(_INICIOS_SF, competencia)
+
+def tabela_inss(competencia):
+    """Tabela INSS em vigor na competência."""
+    return VIGENCIAS_INSS[indice_inss(competencia)][1]
+
+
+# --- CONJUNTOS DE TABELAS (ids) ---
+# Um conjunto é a combinação (INSS, IRRF, Salário Família) de uma competência,
+# codificada em um único inteiro para agrupar linhas com as mesmas tabelas.
+
+def _codificar(i_inss, i_irrf, i_sf):
+    return (i_inss * len(VIGENCIAS_IRRF) + i_irrf) * len(VIGENCIAS_SALARIO_FAMILIA) + i_sf
+
+def _decodificar(id_conjunto):
+    id_conjunto, i_sf = divmod(int(id_conjunto), len(VIGENCIAS_SALARIO_FAMILIA))
+    i_inss, i_irrf = divmod(id_conjunto, len(VIGENCIAS_IRRF))
+    return i_inss, i_irrf, i_sf
+
+def id_conjunto(competencia):
+    """Id do conjunto de tabelas em vigor na competência."""
+    return _codificar(indice_inss(competencia), indice_irrf(competencia), indice_salario_familia(competencia))
+
+def resolver_competencias(competencias):
+    """
+    Resolve um array de competências (date, datetime64 ou Timestamp) para os
+    ids dos conjuntos de tabelas, com uma busca vetorizada por tipo de tabela.
+    """
+    dias = np.asarray(competencias, dtype="datetime64[D]")
+    i_inss = np.maximum(np.searchsorted(_INICIOS_INSS_NP, dias, side="right") - 1, 0)
+    i_irrf = np.maximum(np.searchsorted(_INICIOS_IRRF_NP, dias, side="right") - 1, 0)
+    i_sf = np.maximum(np.searchsorted(_INICIOS_SF_NP, dias, side="right") - 1, 0)
+    return _codificar(i_inss, i_irrf, i_sf)
+
+@lru_cache(maxsize=None)
+def tabelas_do_conjunto(id_conjunto, simulacao=False):
+    """
+    Retorna a tupla (tabela_inss, tabela_irrf, limite_sf, valor_sf, ano_base,
+    irrf_periodo, ds_maximo) de um conjunto, no formato de `selecionar_tabelas`.
+    """
+    i_inss, i_irrf, i_sf = _decodificar(id_conjunto)
+    inicio_inss, tabela_inss_conjunto = VIGENCIAS_INSS[i_inss]
+    _, tabela_irrf, ds_maximo, periodo, norma = VIGENCIAS_IRRF[i_irrf]
+    _, limite_sf, valor_sf = VIGENCIAS_SALARIO_FAMILIA[i_sf]
+
+    if simulacao:
+        ano_base = f"{inicio_inss.year} (Simulação)"
+        irrf_periodo = f"{periodo} (Simulação)"
+    else:
+        ano_base = str(inicio_inss.year)
+        irrf_periodo = f"{periodo} ({norma})"
+
+    return tabela_inss_conjunto, tabela_irrf, limite_sf, valor_sf, ano_base, irrf_periodo, ds_maximo
+
+
+# --- COBERTURA DO REGISTRO ---
+
+def _anos(vigencias):
+    return f"{vigencias[0][0].year} a {vigencias[-1][0].year}"
+
+def cobertura_vigencias():
+    """
+    Textos da cobertura do registro, para as páginas: anos das tabelas de
+    INSS, Salário Família e da legislação como um todo ('2020 a 2026'),
+    número de períodos de IRRF e início do primeiro (dd/mm/aaaa).
+    """
+    inicios = sorted(_INICIOS_INSS + _INICIOS_IRRF + _INICIOS_SF)
+    return {
+        'inss': _anos(VIGENCIAS_INSS),
+        'salario_familia': _anos(VIGENCIAS_SALARIO_FAMILIA),
+        'irrf_periodos': len(VIGENCIAS_IRRF),
+        'irrf_inicio': VIGENCIAS_IRRF[0][0].strftime("%d/%m/%Y"),
+        'legislacao': f"{inicios[0].year} a {inicios[-1].year}",
+    }
+
+
+# --- SELEÇÃO DE TABELAS POR COMPETÊNCIA ---
+
+def competencia_simulada(competencia: date):
+    """Competência usada na simulação: dezembro do ano anterior."""
+    return date(competencia.year - 1, 12, 1)
+
+def _tabelas_de_fallback(competencia):
+    """
+    Tabelas de INSS e Salário Família anteriores ao registro usadas na
+    competência (a primeira vigência de cada uma), ex.: 'INSS 2020 /
+    Salário Família 2023'. Vazio se a competência está coberta.
+    """
+    competencia = _como_data(competencia)
+    tabelas = []
+    if competencia < _INICIOS_INSS[0]:
+        tabelas.append(f"INSS {_INICIOS_INSS[0].year}")
+    if competencia < _INICIOS_SF[0]:
+        tabelas.append(f"Salário Família {_INICIOS_SF[0].year}")
+    return ' / '.join(tabelas)
+
+def selecionar_tabelas(competencia: date):
+    """
+    Seleciona as tabelas de INSS, IRRF e parâmetros de Salário Família e Desconto Simplificado
+    com base na competência.
+    """
+    tabelas = tabelas_do_conjunto(id_conjunto(competencia))
+    fallback = _tabelas_de_fallback(competencia)
+    if fallback:
+        tabelas = tabelas[:4] + (f"{competencia.year} (Fallback {fallback})",) + tabelas[5:]
+    if _como_data(competencia) < _INICIOS_IRRF[0]:
+        return tabelas[:5] + ("Tabelas Antigas (Utilizando 2023 como Referência)",) + tabelas[6:]
+    return tabelas
+
+def selecionar_tabelas_simuladas(competencia: date):
+    """
+    Seleciona as tabelas do ano **anterior** à competência. Anos anteriores
+    ao registro usam as primeiras tabelas, indicadas no rótulo como fallback.
+    """
+    competencia_sim = competencia_simulada(competencia)
+    tabelas = tabelas_do_conjunto(id_conjunto(competencia_sim), simulacao=True)
+    fallback = _tabelas_de_fallback(competencia_sim)
+    if fallback:
+        tabelas = tabelas[:4] + (f"{competencia_sim.year} (Simulação - Fallback {fallback})",) + tabelas[5:]
+    if competencia_sim < _INICIOS_IRRF[0]:
+        return tabelas[:5] + (f"IRRF {competencia_sim.year} (Simulação - Fallback {_INICIOS_IRRF[0].year})",) + tabelas[6:]
+    return tabelas
@@ -0,0 +1,226 @@
+"""
+Formatação e relatório PDF da auditoria em lote.
+
+Usados pela página do Streamlit e pelo auditor de linha de comando
+(`python -m folha`), sem depender do Streamlit. O `fpdf` só é importado
+quando um PDF é gerado, e o `zoneinfo` na primeira consulta ao horário.
+"""
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+
+from .colunar import texto_centavos, texto_reais
+from .registro import selecionar_tabelas
+
+# --- FORMATAÇÃO ---
+
+def formatar_moeda(valor):
+    """Formata valor em moeda brasileira"""
+    if pd.isna(valor) or valor is None:
+        return "R$ 0,00"
+    return f"R$ {float(valor):,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+
+def formatar_moeda_coluna(valores, centavos=False):
+    """
+    `formatar_moeda` para uma coluna inteira de uma vez (valores em reais, ou
+    centavos inteiros com `centavos=True`). Retorna uma Series de textos
+    'R$ 1.234,56', com o índice de `valores` quando for uma Series.
+    """
+    import pyarrow.compute as pc
+
+    indice = valores.index if isinstance(valores, pd.Series) else None
+    if centavos:
+        texto = texto_centavos(np.asarray(valores, dtype=np.int64), milhar='.')
+    else:
+        texto = texto_reais(valores, milhar='.')
+    texto = pc.binary_join_element_wise('R$ ', texto, '')
+    serie = texto.to_pandas()
+    if indice is not None:
+        serie.index = indice
+    return serie
+
+def formatar_data(data):
+    """Formata data no padrão brasileiro"""
+    if isinstance(data, str):
+        return data
+    if isinstance(data, date):
+        return data.strftime("%d/%m/%Y")
+    return data.strftime("%d/%m/%Y")
+
+def get_br_datetime_now():
+    """Retorna o objeto datetime configurado para o fuso horário de São Paulo (BRT/GMT-3)"""
+    from zoneinfo import ZoneInfo
+
+    return datetime.now(ZoneInfo("America/Sao_Paulo"))
+
+
+# --- RELATÓRIO PDF DO LOTE ---
+
+def gerar_pdf_auditoria_completa(df_resultado, uploaded_filename, total_salario_familia, total_inss, total_irrf, folha_liquida_total, obs_lote):
+    """
+    Gera PDF com o resumo da auditoria em lote e os dados detalhados (FINAL).
+    """
+    from fpdf import FPDF
+
+    pdf = FPDF(orientation='L', unit='mm', format='A4')
+    pdf.add_page()
+    pdf.set_font('Arial', '', 10)
+    
+    data_hora_agora = get_br_datetime_now()
+    data_hora_formatada = data_hora_agora.strftime("%d/%m/%Y %H:%M")
+    
+    # A folha pode trazer várias competências (coluna Competencia por linha)
+    competencias = sorted(set(df_resultado['Competencia']))
+    competencia_lote = competencias[0]
+    _, _, _, _, ano_base, irrf_periodo, _ = selecionar_tabelas(competencia_lote)
+    
+    simulacao_ativa = 'IRRF_Sim' in df_resultado.columns
+
+    # Cabeçalho
+    pdf.set_font('Arial', 'B', 16)
+    pdf.cell(0, 10, 'RELATÓRIO DE AUDITORIA DE FOLHA DE PAGAMENTO - LOTE', 0, 1, 'C')
+    
+    pdf.set_font('Arial', '', 10)
+    pdf.cell(0, 5, f'Arquivo/Fonte: {uploaded_filename}', 0, 1)
+    if len(competencias) > 1:
+        pdf.cell(0, 5, f'Competências Analisadas: {formatar_data(competencias[0])} a {formatar_data(competencias[-1])} ({len(competencias)} competências)', 0, 1)
+    else:
+        pdf.cell(0, 5, f'Competência Analisada: {formatar_data(competencia_lote)}', 0, 1)
+    pdf.cell(0, 5, f'Processado em: {data_hora_formatada}', 0, 1)
+    if len(competencias) > 1:
+        pdf.cell(0, 5, 'Tabelas Oficiais: conforme a competência de cada linha', 0, 1)
+    else:
+        pdf.cell(0, 5, f'Tabelas Oficiais: INSS ({ano_base}), IRRF ({irrf_periodo})', 0, 1)
+    
+    if simulacao_ativa:
+        ano_base_sim = ' / '.join(df_resultado['Ano_Base_Sim'].unique())
+        irrf_periodo_sim = ' / '.join(df_resultado['IRRF_Periodo_Sim'].unique())
+        pdf.cell(0, 5, f'Tabelas Simulação: INSS ({ano_base_sim}), IRRF ({irrf_periodo_sim})', 0, 1)
+        
+    pdf.ln(5)
+
+    # Resumo Financeiro
+    pdf.set_font('Arial', 'B', 12)
+    pdf.cell(0, 10, 'RESUMO FINANCEIRO DO LOTE', 0, 1)
+    
+    pdf.set_font('Arial', '', 10)
+    
+    resumo_headers = ['Descrição', 'Valor Oficial', 'Valor Simulado', 'Diferença'] if simulacao_ativa else ['Descrição', 'Valor Oficial']
+    col_widths_resumo = [70, 40, 40, 40] if simulacao_ativa else [70, 40]
+    
+    # Títulos
+    pdf.set_font('Arial', 'B', 10)
+    for i, header in enumerate(resumo_headers):
+        pdf.cell(col_widths_resumo[i], 7, header, 1, 0, 'C')
+    pdf.ln()
+
+    # Dados do Resumo
+    if simulacao_ativa:
+        total_salario_familia_sim = df_resultado['Salario_Familia_Sim'].sum()
+        total_inss_sim = df_resultado['INSS_Sim'].sum()
+        total_irrf_sim = df_resultado['IRRF_Sim'].sum()
+        folha_liquida_total_sim = df_resultado['Salario_Liquido_Sim'].sum()
+        
+        resumo_dados = [
+            ('Total Salário Bruto', df_resultado['Salario_Bruto'].sum(), df_resultado['Salario_Bruto'].sum()),
+            ('Total Salário Família', total_salario_familia, total_salario_familia_sim),
+            ('Total INSS Descontado', total_inss, total_inss_sim),
+            ('Total IRRF Descontado', total_irrf, total_irrf_sim),
+            ('Total Folha Líquida', folha_liquida_total, folha_liquida_total_sim),
+        ]
+    else:
+        resumo_dados = [
+            ('Total Salário Bruto', df_resultado['Salario_Bruto'].sum()),
+            ('Total Salário Família', total_salario_familia),
+            ('Total INSS Descontado', total_inss),
+            ('Total IRRF Descontado', total_irrf),
+            ('Total Folha Líquida', folha_liquida_total),
+        ]
+
+    pdf.set_font('Arial', '', 10)
+    for item in resumo_dados:
+        pdf.cell(col_widths_resumo[0], 6, item[0], 1, 0)
+        pdf.cell(col_widths_resumo[1], 6, formatar_moeda(item[1]), 1, 0, 'R')
+        
+        if simulacao_ativa:
+            delta = item[1] - item[2]
+            pdf.cell(col_widths_resumo[2], 6, formatar_moeda(item[2]), 1, 0, 'R')
+            pdf.cell(col_widths_resumo[3], 6, formatar_moeda(delta).replace('R$ ', ''), 1, 1, 'R')
+        else:
+            pdf.ln()
+            
+    pdf.ln(5)
+
+    # Observações do Lote
+    if obs_lote:
+        pdf.set_font('Arial', 'B', 12)
+        pdf.cell(0, 10, 'OBSERVAÇÕES GERAIS DO ANALISTA', 0, 1)
+        pdf.set_font('Arial', '', 10)
+        pdf.multi_cell(0, 6, obs_lote)
+        pdf.ln(5)
+
+    # Tabela de Detalhamento
+    pdf.set_font('Arial', 'B', 12)
+    pdf.cell(0, 10, 'DETALHAMENTO POR FUNCIONÁRIO', 0, 1)
+
+    df_pdf = df_resultado.copy()
+    
+    # Definição das colunas e larguras
+    if simulacao_ativa:
+        df_pdf = df_pdf[['Nome', 'Salario_Bruto', 'Dependentes', 'Salario_Familia', 'Salario_Familia_Sim', 
+                         'INSS', 'INSS_Sim', 'IRRF', 'IRRF_Sim', 'Outros_Descontos', 'Salario_Liquido', 'Salario_Liquido_Sim', 
+                         'Metodo_Deducao', 'Metodo_Deducao_Sim']]
+        df_pdf.columns = ['Nome', 'Sal. Bruto', 'Deps.', 'SF Of.', 'SF Sim.', 'INSS Of.', 'INSS Sim.', 'IRRF Of.', 'IRRF Sim.', 'Outros Desc.', 'Líq. Of.', 'Líq. Sim.', 'Ded Of.', 'Ded Sim.']
+        col_widths = [25, 17, 10, 16, 16, 16, 16, 16, 16, 16, 18, 18, 10, 10]
+    else:
+        df_pdf = df_pdf[['Nome', 'Salario_Bruto', 'Dependentes', 'Salario_Familia', 'INSS', 'IRRF', 'Outros_Descontos', 'Salario_Liquido', 'Metodo_Deducao']]
+        df_pdf.columns = ['Nome', 'Sal. Bruto', 'Deps.', 'Sal. Fam.', 'INSS', 'IRRF', 'Outros Desc.', 'Sal. Líquido', 'Ded. IR']
+        col_widths = [45, 20, 10, 20, 20, 20, 20, 20, 20]
+        
+    # Títulos da tabela
+    pdf.set_font('Arial', 'B', 8)
+    for i, header in enumerate(df_pdf.columns):
+        pdf.cell(col_widths[i], 7, header, 1, 0, 'C')
+    pdf.ln()
+
+    # Dados da tabela
+    pdf.set_font('Arial', '', 7)
+    for _, row in df_pdf.iterrows():
+        i = 0
+        
+        # Nome
+        pdf.cell(col_widths[i], 6, row[df_pdf.columns[i]], 1, 0); i += 1
+        
+        # Valores (Monetários e Dependentes/Dedução)
+        for col_name in df_pdf.columns[i:]:
+            if col_name in ['Deps.']:
+                pdf.cell(col_widths[i], 6, str(row[col_name]), 1, 0, 'C')
+            elif 'Ded' in col_name or col_name in ['Ded Of.', 'Ded Sim.', 'Ded. IR']:
+                pdf.cell(col_widths[i], 6, row[col_name], 1, 0, 'C')
+            else:
+                # Converte para float e formata como moeda 
+                valor = float(row[col_name])
+                pdf.cell(col_widths[i], 6, formatar_moeda(valor), 1, 0, 'R')
+            i += 1
+            
+        pdf.ln()
+        
+        # Se a página estiver cheia, adiciona uma nova
+        if pdf.get_y() > 185:
+            pdf.add_page()
+            pdf.set_font('Arial', 'B', 8)
+            for i, header in enumerate(df_pdf.columns):
+                pdf.cell(col_widths[i], 7, header, 1, 0, 'C')
+            pdf.ln()
+            pdf.set_font('Arial', '', 7)
+
+    pdf.ln(10)
+
+    # Rodapé Legal (REMOVIDA A FRASE SOBRE GERAÇÃO AUTOMÁTICA)
+    pdf.set_font('Arial', 'I', 8)
+    pdf.cell(0, 5, 'Consulte um contador para validação oficial dos cálculos e interpretação da legislação.', 0, 1, 'C')
+    pdf.cell(0, 5, f'Processado em: {data_hora_formatada}', 0, 1, 'C')
+
+    # Retorna o output em bytes, codificado em latin1
+    return pdf.output(dest='S').encode('latin1')
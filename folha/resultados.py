@@ -0,0 +1,151 @@
+"""
+Cache de resultados de auditoria endereçado pelo conteúdo da entrada.
+
+A chave é (hash dos dados de entrada, competência, simulação, modo de
+cálculo, versão do registro de tabelas): o mesmo arquivo enviado de novo, ou
+aberto por outra sessão do Streamlit, reaproveita o `df_resultado` já
+calculado. O cache é do processo (compartilhado entre sessões), limitado
+pelo tamanho em bytes dos resultados guardados, com descarte LRU.
+"""
+import hashlib
+from collections import OrderedDict
+from threading import Lock
+
+import pandas as pd
+
+from .lote import processar_lote
+from .registro import VERSAO_REGISTRO
+
+TAMANHO_CACHE_RESULTADOS_PADRAO = 256 * 1024 * 1024
+
+
+def _tamanho_resultado(df):
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+class CacheResultados:
+    """Cache LRU de DataFrames limitado em bytes, seguro entre threads (sessões do Streamlit)."""
+
+    __slots__ = ("tamanho_maximo", "acertos", "falhas", "descartes", "bytes_usados", "_itens", "_trava")
+
+    def __init__(self, tamanho_maximo=TAMANHO_CACHE_RESULTADOS_PADRAO):
+        self.tamanho_maximo = tamanho_maximo
+        self.acertos = 0
+        self.falhas = 0
+        self.descartes = 0
+        self.bytes_usados = 0
+        self._itens = OrderedDict()
+        self._trava = Lock()
+
+    def __len__(self):
+        return len(self._itens)
+
+    def obter(self, chave):
+        """Cópia do resultado guardado na chave, ou None (conta acerto ou falha)."""
+        with self._trava:
+            item = self._itens.get(chave)
+            if item is None:
+                self.falhas += 1
+                return None
+            self._itens.move_to_end(chave)
+            self.acertos += 1
+        return item[0].copy()
+
+    def guardar(self, chave, df):
+        """Guarda uma cópia do resultado; resultados maiores que o cache inteiro não são guardados."""
+        tamanho = _tamanho_resultado(df)
+        if tamanho > self.tamanho_maximo:
+            return
+        copia = df.copy()
+        with self._trava:
+            anterior = self._itens.pop(chave, None)
+            if anterior is not None:
+                self.bytes_usados -= anterior[1]
+            self._itens[chave] = (copia, tamanho)
+            self.bytes_usados += tamanho
+            self._descartar_excedente()
+
+    def redimensionar(self, tamanho_maximo):
+        """Altera o tamanho máximo (em bytes), descartando os resultados menos usados se preciso."""
+        with self._trava:
+            self.tamanho_maximo = tamanho_maximo
+            self._descartar_excedente()
+
+    def limpar(self):
+        """Esvazia o cache e zera os contadores."""
+        with self._trava:
+            self._itens.clear()
+            self.bytes_usados = 0
+            self.acertos = self.falhas = self.descartes = 0
+
+    def estatisticas(self):
+        """Contadores do cache, ocupação em bytes e taxa de acerto (0 a 1)."""
+        consultas = self.acertos + self.falhas
+        return {
+            'acertos': self.acertos,
+            'falhas': self.falhas,
+            'descartes': self.descartes,
+            'tamanho': len(self._itens),
+            'bytes_usados': self.bytes_usados,
+            'tamanho_maximo': self.tamanho_maximo,
+            'taxa_acerto': self.acertos / consultas if consultas else 0.0,
+        }
+
+    def _descartar_excedente(self):
+        while self._itens and self.bytes_usados > max(self.tamanho_maximo, 0):
+            _, (_, tamanho) = self._itens.popitem(last=False)
+            self.bytes_usados -= tamanho
+            self.descartes += 1
+
+
+_CACHE_RESULTADOS = CacheResultados()
+
+
+# --- CHAVES ---
+
+def hash_entrada(dados):
+    """
+    Hash SHA-256 da entrada: dos bytes do arquivo enviado ou, para dados sem
+    arquivo (Google Sheets, digitação), do conteúdo do DataFrame.
+    """
+    if isinstance(dados, pd.DataFrame):
+        resumo = hashlib.sha256(repr(list(dados.columns)).encode())
+        resumo.update(pd.util.hash_pandas_object(dados, index=False).to_numpy().tobytes())
+        return resumo.hexdigest()
+    return hashlib.sha256(bytes(dados)).hexdigest()
+
+def chave_resultado(dados, competencia, simular_ano_anterior=False, centavos=False):
+    """Chave do cache: (hash da entrada, competência, simulação, modo, versão do registro)."""
+    return (hash_entrada(dados), competencia.isoformat(), bool(simular_ano_anterior), bool(centavos), VERSAO_REGISTRO)
+
+
+# --- PROCESSAMENTO COM CACHE ---
+
+def processar_lote_em_cache(df, competencia, simular_ano_anterior=False, centavos=False, conteudo=None):
+    """
+    `processar_lote` consultando antes o cache de resultados. A chave usa os
+    bytes `conteudo` do arquivo original quando informados; senão, o próprio
+    `df`. Em um acerto, `attrs['cache_resultado']` fica True.
+    """
+    chave = chave_resultado(df if conteudo is None else conteudo, competencia, simular_ano_anterior, centavos)
+    resultado = _CACHE_RESULTADOS.obter(chave)
+    if resultado is not None:
+        resultado.attrs['cache_resultado'] = True
+        return resultado
+
+    resultado = processar_lote(df, competencia, simular_ano_anterior, centavos=centavos)
+    _CACHE_RESULTADOS.guardar(chave, resultado)
+    resultado.attrs['cache_resultado'] = False
+    return resultado
+
+def estatisticas_cache_resultados():
+    """Estatísticas do cache de resultados."""
+    return _CACHE_RESULTADOS.estatisticas()
+
+def configurar_cache_resultados(tamanho_maximo):
+    """Define o tamanho máximo do cache de resultados, em bytes (0 desativa)."""
+    _CACHE_RESULTADOS.redimensionar(tamanho_maximo)
+
+def limpar_cache_resultados():
+    """Esvazia o cache de resultados e zera os contadores."""
+    _CACHE_RESULTADOS.limpar()
@@ -0,0 +1,95 @@
+"""
+Auditoria em blocos (streaming) para arquivos grandes (CSV, Parquet ou Feather).
+
+O arquivo é lido uma única vez, em blocos de tamanho fixo (CSV com o formato
+detectado por `folha.formato`, Parquet/Feather por lotes de registros). Cada
+bloco é calculado com `processar_lote`, os totais do "Resumo Financeiro" são
+acumulados em centavos inteiros (soma exata, independente da divisão em
+blocos) e as linhas calculadas são gravadas em disco. Assim a memória usada
+depende do tamanho do bloco, e não do tamanho do arquivo.
+"""
+import os
+import tempfile
+
+import numpy as np
+
+from .centavos import para_centavos
+from .colunar import GravadorParquet, ler_entrada_em_blocos, resultado_para_csv
+from .lote import preparar_entrada, processar_lote
+
+TAMANHO_BLOCO_PADRAO = 100_000
+
+# Colunas somadas no Resumo Financeiro (as _Sim só existem com simulação)
+COLUNAS_TOTAIS = (
+    'Salario_Bruto', 'Salario_Familia', 'INSS', 'IRRF', 'Outros_Descontos', 'Salario_Liquido',
+    'Salario_Familia_Sim', 'INSS_Sim', 'IRRF_Sim', 'Salario_Liquido_Sim',
+)
+
+
+def processar_csv_em_blocos(arquivo, competencia, simular_ano_anterior=False, tamanho_bloco=TAMANHO_BLOCO_PADRAO,
+                            destino=None, centavos=False, gravar_parquet=False):
+    """
+    Audita um CSV, Parquet ou Feather bloco a bloco.
+
+    As linhas calculadas são gravadas em `destino` (um arquivo temporário se
+    omitido) no formato de exportação da página: separador ';' e decimal ','.
+    Com `gravar_parquet`, também são gravadas em Parquet (valores numéricos),
+    ao lado do CSV e com o mesmo nome.
+    Retorna um dicionário com o caminho do resultado, o número de linhas, as
+    combinações calculadas, as competências encontradas e os totais (em
+    reais) de cada coluna monetária. Cada bloco é deduplicado à parte:
+    `combinacoes_calculadas` soma as combinações únicas de cada bloco (uma
+    combinação repetida em N blocos é calculada, e contada, N vezes).
+
+    Se o cálculo falhar no meio do arquivo, o CSV e o Parquet parciais são
+    removidos antes de a exceção ser repassada.
+    """
+    if destino is None:
+        descritor, destino = tempfile.mkstemp(prefix='auditoria_', suffix='.csv')
+        os.close(descritor)
+
+    totais_centavos = {}
+    competencias = set()
+    linhas = 0
+    combinacoes_calculadas = 0
+    colunas = None
+
+    destino_parquet = os.path.splitext(destino)[0] + '.parquet' if gravar_parquet else None
+    gravador_parquet = GravadorParquet(destino_parquet) if gravar_parquet else None
+    try:
+        with open(destino, 'w', encoding='utf-8', newline='') as saida:
+            for bloco in ler_entrada_em_blocos(arquivo, tamanho_bloco):
+                bloco = preparar_entrada(bloco)
+                resultado = processar_lote(bloco, competencia, simular_ano_anterior, centavos=centavos)
+
+                for coluna in COLUNAS_TOTAIS:
+                    if coluna in resultado.columns:
+                        soma = int(para_centavos(resultado[coluna].to_numpy()).sum())
+                        totais_centavos[coluna] = totais_centavos.get(coluna, 0) + soma
+                competencias.update(np.unique(resultado['Competencia'].to_numpy()).tolist())
+                linhas += len(resultado)
+                combinacoes_calculadas += resultado.attrs['deduplicacao']['combinacoes_unicas']
+
+                resultado_para_csv(resultado, saida, cabecalho=colunas is None)
+                if gravador_parquet is not None:
+                    gravador_parquet.gravar(resultado)
+                colunas = list(resultado.columns)
+    except BaseException:
+        if gravador_parquet is not None:
+            gravador_parquet.fechar()
+        for caminho in (destino, destino_parquet):
+            if caminho is not None and os.path.exists(caminho):
+                os.unlink(caminho)
+        raise
+    if gravador_parquet is not None:
+        gravador_parquet.fechar()
+
+    return {
+        'arquivo_resultado': destino,
+        'arquivo_parquet': destino_parquet,
+        'linhas': linhas,
+        'combinacoes_calculadas': combinacoes_calculadas,
+        'competencias': sorted(competencias),
+        'colunas': colunas or [],
+        'totais': {coluna: centavos_totais / 100 for coluna, centavos_totais in totais_centavos.items()},
+    }
@@ -0,0 +1,121 @@
+"""
+Tabelas legais de INSS, IRRF, Salário Família e Desconto Simplificado.
+
+Módulo sem dependência do Streamlit: é carregado uma única vez por processo
+e compartilhado por todas as páginas.
+"""
+from datetime import date
+
+# --- TABELAS LEGAIS ---
+
+# Datas de Referência
+DATA_INICIO_2024_IRRF = date(2024, 2, 1) # Início do período da MP 1.206/2024
+DATA_INICIO_2025_IRRF = date(2025, 5, 1) # Início do período da MP 1.294/2025
+DATA_INICIO_2023_IRRF = date(2023, 5, 1) # Início do período da alteração de 2023
+
+# --- Salário Família & Dedução IR ---
+DESCONTO_DEPENDENTE_IR = 189.59
+
+# Salário Família 2025 (Padrão 2025)
+SF_LIMITE_2025 = 1906.04
+SF_VALOR_2025 = 65.00
+
+# Salário Família 2024
+SF_LIMITE_2024 = 1819.26
+SF_VALOR_2024 = 62.04
+
+# Salário Família 2023
+SF_LIMITE_2023 = 1754.18
+SF_VALOR_2023 = 59.83
+
+# --- Tabela INSS ---
+TABELA_INSS_2026 = [
+    {"limite": 1621.00, "aliquota": 0.075},
+    {"limite": 2902.84, "aliquota": 0.09},
+    {"limite": 4354.27, "aliquota": 0.12},
+    {"limite": 8475.55, "aliquota": 0.14}
+]
+
+TABELA_INSS_2025 = [
+    {"limite": 1518.00, "aliquota": 0.075},
+    {"limite": 2793.88, "aliquota": 0.09},
+    {"limite": 4190.83, "aliquota": 0.12},
+    {"limite": 8157.41, "aliquota": 0.14}
+]
+
+TABELA_INSS_2024 = [
+    {"limite": 1412.00, "aliquota": 0.075},
+    {"limite": 2666.68, "aliquota": 0.09},
+    {"limite": 4000.03, "aliquota": 0.12},
+    {"limite": 7786.02, "aliquota": 0.14}
+]
+
+# Tabela INSS 2023 (a partir de 01/05/2023)
+TABELA_INSS_2023 = [
+    {"limite": 1320.00, "aliquota": 0.075},
+    {"limite": 2571.29, "aliquota": 0.09},
+    {"limite": 3856.94, "aliquota": 0.12},
+    {"limite": 7507.49, "aliquota": 0.14}
+]
+
+# Tabela INSS 01/01/2023 a 30/04/2023
+TABELA_INSS_JAN2023_ABR2023 = [
+    {"limite": 1302.00, "aliquota": 0.075},
+    {"limite": 2571.29, "aliquota": 0.09},
+    {"limite": 3856.94, "aliquota": 0.12},
+    {"limite": 7507.49, "aliquota": 0.14}
+]
+
+TABELA_INSS_2022 = [
+    {"limite": 1212.00, "aliquota": 0.075},
+    {"limite": 2427.35, "aliquota": 0.09},
+    {"limite": 3641.03, "aliquota": 0.12},
+    {"limite": 7087.22, "aliquota": 0.14}
+]
+
+TABELA_INSS_2021 = [
+    {"limite": 1100.00, "aliquota": 0.075},
+    {"limite": 2203.48, "aliquota": 0.09},
+    {"limite": 3305.22, "aliquota": 0.12},
+    {"limite": 6433.57, "aliquota": 0.14}
+]
+
+# Tabela INSS 2020 (a partir de 01/03/2020 - EC 103/2019)
+TABELA_INSS_2020 = [
+    {"limite": 1045.00, "aliquota": 0.075},
+    {"limite": 2089.60, "aliquota": 0.09},
+    {"limite": 3134.40, "aliquota": 0.12},
+    {"limite": 6101.06, "aliquota": 0.14}
+]
+
+# --- Desconto Simplificado (Opcional) ---
+DS_MAX_FEV2024_ABR2025 = 564.80 # 25% de 2.259,20
+DS_MAX_MAI2025_DEZ2025 = 607.20 # 25% de 2.428,80
+DS_MAX_MAI2023_JAN2024 = 528.00 # 25% de 2.112,00
+
+# --- Tabela IRRF (01/05/2023 a 31/01/2024) ---
+TABELA_IRRF_2023_MAI2024 = [
+    {"limite": 2112.00, "aliquota": 0.0, "deducao": 0.00},
+    {"limite": 2826.65, "aliquota": 0.075, "deducao": 158.40},
+    {"limite": 3751.05, "aliquota": 0.15, "deducao": 370.40},
+    {"limite": 4664.68, "aliquota": 0.225, "deducao": 651.73},
+    {"limite": float('inf'), "aliquota": 0.275, "deducao": 884.96}
+]
+
+# --- Tabela IRRF (01/02/2024 a 30/04/2025 - MP 1.206/2024) ---
+TABELA_IRRF_FEV2024_ABR2025 = [
+    {"limite": 2259.20, "aliquota": 0.0, "deducao": 0.00},
+    {"limite": 2826.65, "aliquota": 0.075, "deducao": 169.44},
+    {"limite": 3751.05, "aliquota": 0.15, "deducao": 381.44},
+    {"limite": 4664.68, "aliquota": 0.225, "deducao": 662.77},
+    {"limite": float('inf'), "aliquota": 0.275, "deducao": 896.00}
+]
+
+# --- Tabela IRRF (01/05/2025 em diante - MP 1.294/2025) ---
+TABELA_IRRF_MAI2025_DEZ2025 = [
+    {"limite": 2428.80, "aliquota": 0.0, "deducao": 0.0},
+    {"limite": 2826.65, "aliquota": 0.075, "deducao": 182.16},
+    {"limite": 3751.05, "aliquota": 0.15, "deducao": 394.16},
+    {"limite": 4664.68, "aliquota": 0.225, "deducao": 675.49},
+    {"limite": float('inf'), "aliquota": 0.275, "deducao": 908.73}
+]
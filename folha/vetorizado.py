@@ -0,0 +1,135 @@
+"""
+Versões vetorizadas (NumPy) das funções de cálculo, para processar colunas
+inteiras da folha em uma única passada.
+
+Os resultados reproduzem exatamente os das funções escalares de
+`folha.calculos`, inclusive o arredondamento feito com `round(valor, 2)`.
+"""
+import numpy as np
+
+from .faixas import compilar_tabela
+from .tabelas import DESCONTO_DEPENDENTE_IR
+
+# Constante de Veltkamp para dividir um float64 em duas metades de 26 bits
+_SPLIT = 134217729.0  # 2**27 + 1
+
+# Rótulos do método de dedução, indexados por "usa o Desconto Simplificado"
+_METODOS_DEDUCAO = np.array(["Legal", "Simplificado"], dtype=object)
+
+
+def _centavos_exatos(valores):
+    """
+    Arredonda valores * 100 para o inteiro mais próximo sobre o valor exato.
+
+    O produto por 100 é feito sem perda (produto exato de Dekker) e o
+    desempate segue a regra do Python (metade para o par).
+    """
+    produto = valores * 100.0
+
+    # Erro exato do produto: valores * 100 == produto + erro
+    c = _SPLIT * valores
+    alto = c - (c - valores)
+    baixo = valores - alto
+    erro = (alto * 100.0 - produto) + baixo * 100.0
+
+    inteiro = np.floor(produto)
+    sobra = ((produto - inteiro) - 0.5) + erro
+    empate_impar = (sobra == 0) & (np.fmod(inteiro, 2) != 0)
+    return inteiro + (sobra > 0) + empate_impar
+
+
+def arredondar_centavos(valores):
+    """
+    Arredonda para 2 casas decimais exatamente como `round(valor, 2)` do Python.
+
+    `np.round` multiplica por 100 antes de arredondar e erra em casos como
+    0.015 ou 0.165. O caminho rápido (`np.rint`) só é corrigido nos valores
+    que ficam a poucos ulps de um meio centavo.
+    """
+    valores = np.asarray(valores, dtype=np.float64)
+    produto = valores * 100.0
+    centavos = np.rint(produto)
+
+    perto_do_meio = (0.5 - np.abs(produto - centavos)) <= 4 * np.spacing(np.abs(produto))
+    if perto_do_meio.any():
+        centavos[perto_do_meio] = _centavos_exatos(valores[perto_do_meio])
+
+    return centavos / 100.0
+
+
+def calcular_inss_vetorizado(salarios_brutos, tabela_inss):
+    """
+    Calcula o INSS progressivo para um array de salários.
+
+    A faixa de cada salário é encontrada com `searchsorted` sobre os limites,
+    e o imposto é a contribuição acumulada até a faixa anterior mais a parte
+    do salário dentro da faixa.
+    """
+    salarios = np.asarray(salarios_brutos, dtype=np.float64)
+    tabela = compilar_tabela(tabela_inss)
+
+    salario_calculo = np.minimum(salarios, tabela.teto)
+    faixa = np.searchsorted(tabela.limites, salario_calculo, side="left")
+    faixa = np.minimum(faixa, len(tabela) - 1)
+
+    # O laço escalar desconta as larguras uma a uma; repetir a mesma ordem de
+    # subtrações mantém o resultado idêntico bit a bit.
+    salario_restante = salario_calculo.copy()
+    for i in range(len(tabela) - 1):
+        salario_restante = np.where(faixa > i, salario_restante - tabela.larguras[i], salario_restante)
+
+    inss = tabela.acumulado[faixa] + salario_restante * tabela.aliquotas[faixa]
+    inss = np.where(salarios <= 0, 0.0, inss)
+    return arredondar_centavos(inss)
+
+
+def calcular_salario_familia_vetorizado(salarios, dependentes, limite_sf, valor_sf):
+    """Calcula o salário família para arrays de salários e dependentes."""
+    salarios = np.asarray(salarios, dtype=np.float64)
+    dependentes = np.asarray(dependentes)
+    return np.where(salarios <= limite_sf, dependentes * valor_sf, 0.0)
+
+
+def calcular_irrf_base_vetorizado(bases_calculo, tabela_irrf):
+    """Calcula o IRRF para um array de bases de cálculo (faixa localizada por índice)."""
+    bases = np.asarray(bases_calculo, dtype=np.float64)
+    tabela = compilar_tabela(tabela_irrf)
+
+    faixa = np.searchsorted(tabela.limites, bases, side="left")
+    faixa = np.minimum(faixa, len(tabela) - 1)
+
+    irrf = arredondar_centavos(bases * tabela.aliquotas[faixa] - tabela.deducoes[faixa])
+    irrf = np.maximum(irrf, 0.0)
+    # Bases acima do último limite (tabela sem faixa infinita) ficam sem imposto, como no escalar
+    irrf = np.where((bases <= 0) | (bases > tabela.teto), 0.0, irrf)
+    return irrf
+
+
+def calcular_irrf_vetorizado(salarios_brutos, dependentes, inss, outros_descontos, tabela_irrf, ds_maximo):
+    """
+    Calcula o IRRF de colunas inteiras comparando o Desconto Legal com o
+    Desconto Simplificado e escolhendo o menor imposto em cada linha.
+
+    Retorna (irrf, metodo, base, deducao), todos como arrays.
+    """
+    salarios = np.asarray(salarios_brutos, dtype=np.float64)
+    dependentes = np.asarray(dependentes)
+    inss = np.asarray(inss, dtype=np.float64)
+    outros_descontos = np.asarray(outros_descontos, dtype=np.float64)
+
+    # 1. CÁLCULO LEGAL (Padrão)
+    deducao_legal = (dependentes * DESCONTO_DEPENDENTE_IR) + inss + outros_descontos
+    base_legal = salarios - deducao_legal
+    irrf_legal = calcular_irrf_base_vetorizado(base_legal, tabela_irrf)
+
+    # 2. CÁLCULO SIMPLIFICADO
+    base_simplificada = salarios - ds_maximo
+    irrf_simplificado = calcular_irrf_base_vetorizado(base_simplificada, tabela_irrf)
+
+    # 3. ESCOLHA DO MAIS BENÉFICO (Menor IRRF)
+    usa_legal = irrf_legal <= irrf_simplificado
+    irrf = np.where(usa_legal, irrf_legal, irrf_simplificado)
+    metodo = _METODOS_DEDUCAO.take(~usa_legal)
+    base = np.where(usa_legal, base_legal, base_simplificada)
+    deducao = np.where(usa_legal, deducao_legal, ds_maximo)
+    return irrf, metodo, base, deducao
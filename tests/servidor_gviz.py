@@ -0,0 +1,157 @@
+"""
+Servidor local que imita o endpoint gviz do Google Sheets, para testar o
+carregador de planilhas sem rede.
+
+Serve abas CSV de um dicionário {aba: texto CSV} (ou de uma pasta com um
+arquivo .csv por aba) em `/d/<id>/gviz/tq?tqx=out:csv&sheet=<aba>`, com
+gzip, ETag/304 e keep-alive. A consulta `tq` aceita o subconjunto usado
+pelo carregador: `select` por letras, `where` com comparações ligadas por
+`and`, `limit` e `offset`.
+
+    python tests/servidor_gviz.py pasta_com_csvs [porta]
+"""
+import csv
+import gzip
+import hashlib
+import io
+import os
+import re
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+_COMPARACAO = re.compile(r"^\s*([A-Z]+)\s*(<=|>=|!=|<>|=|<|>)\s*(.+?)\s*$")
+_CLAUSULAS = re.compile(r"\b(select|where|limit|offset)\b", re.IGNORECASE)
+
+
+# --- CONSULTA tq ---
+
+def _indice_coluna(letras):
+    indice = 0
+    for letra in letras:
+        indice = indice * 26 + ord(letra) - ord('A') + 1
+    return indice - 1
+
+def _valor(texto):
+    texto = texto.strip()
+    if texto[:1] in ("'", '"'):
+        return texto[1:-1]
+    return float(texto)
+
+def _comparar(celula, operador, valor):
+    if isinstance(valor, float):
+        try:
+            celula = float(celula)
+        except ValueError:
+            return False
+    return {
+        '=': celula == valor, '!=': celula != valor, '<>': celula != valor,
+        '<': celula < valor, '<=': celula <= valor, '>': celula > valor, '>=': celula >= valor,
+    }[operador]
+
+def aplicar_consulta(texto_csv, consulta):
+    """Aplica a consulta `tq` a uma aba CSV e retorna o CSV resultante (ValueError se inválida)."""
+    linhas = list(csv.reader(io.StringIO(texto_csv)))
+    cabecalho, dados = linhas[0], linhas[1:]
+
+    partes = _CLAUSULAS.split(consulta or '')
+    clausulas = {partes[i].lower(): partes[i + 1].strip() for i in range(1, len(partes) - 1, 2)}
+
+    colunas = list(range(len(cabecalho)))
+    if 'select' in clausulas and clausulas['select'] != '*':
+        colunas = [_indice_coluna(letra.strip()) for letra in clausulas['select'].split(',')]
+        if max(colunas) >= len(cabecalho):
+            raise ValueError("Coluna inexistente no select")
+
+    if 'where' in clausulas:
+        for condicao in re.split(r"\s+and\s+", clausulas['where'], flags=re.IGNORECASE):
+            correspondencia = _COMPARACAO.match(condicao)
+            if correspondencia is None:
+                raise ValueError(f"Condição não suportada: {condicao}")
+            letras, operador, valor = correspondencia.groups()
+            indice, valor = _indice_coluna(letras), _valor(valor)
+            dados = [linha for linha in dados if _comparar(linha[indice], operador, valor)]
+
+    inicio = int(clausulas.get('offset', 0))
+    fim = inicio + int(clausulas['limit']) if 'limit' in clausulas else None
+    dados = dados[inicio:fim]
+
+    saida = io.StringIO()
+    escritor = csv.writer(saida, quoting=csv.QUOTE_ALL, lineterminator='\n')
+    escritor.writerow([cabecalho[i] for i in colunas])
+    escritor.writerows([linha[i] for i in colunas] for linha in dados)
+    return saida.getvalue()
+
+
+# --- SERVIDOR ---
+
+class _Manipulador(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    abas = {}
+    requisicoes = []
+
+    def log_message(self, *argumentos):
+        pass
+
+    def _responder(self, status, corpo=b'', cabecalhos=None):
+        self.send_response(status)
+        for nome, valor in (cabecalhos or {}).items():
+            self.send_header(nome, valor)
+        self.send_header('Content-Length', str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def do_GET(self):
+        parametros = parse_qs(urlsplit(self.path).query)
+        aba = parametros.get('sheet', [''])[0]
+        consulta = parametros.get('tq', [None])[0]
+        self.requisicoes.append((aba, consulta, self.client_address))
+
+        if aba not in self.abas:
+            return self._responder(404)
+        try:
+            corpo = aplicar_consulta(self.abas[aba], consulta).encode('utf-8')
+        except (ValueError, IndexError) as erro:
+            return self._responder(400, str(erro).encode('utf-8'))
+
+        etag = f'"{hashlib.sha256(corpo).hexdigest()[:32]}"'
+        if self.headers.get('If-None-Match') == etag:
+            return self._responder(304, cabecalhos={'ETag': etag})
+        cabecalhos = {'Content-Type': 'text/csv; charset=utf-8', 'ETag': etag}
+        if 'gzip' in self.headers.get('Accept-Encoding', ''):
+            corpo = gzip.compress(corpo)
+            cabecalhos['Content-Encoding'] = 'gzip'
+        self._responder(200, corpo, cabecalhos)
+
+
+def iniciar_servidor(abas, porta=0):
+    """
+    Sobe o servidor em uma thread e retorna (servidor, url_base); a url_base
+    vai no parâmetro `url_base` do carregador. `servidor.requisicoes` lista
+    (aba, consulta, cliente) de cada requisição recebida.
+    """
+    manipulador = type('Manipulador', (_Manipulador,), {'abas': abas, 'requisicoes': []})
+    servidor = ThreadingHTTPServer(('127.0.0.1', porta), manipulador)
+    servidor.daemon_threads = True
+    servidor.requisicoes = manipulador.requisicoes
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor, f"http://127.0.0.1:{servidor.server_address[1]}"
+
+
+def _abas_da_pasta(pasta):
+    abas = {}
+    for nome in sorted(os.listdir(pasta)):
+        if nome.lower().endswith('.csv'):
+            with open(os.path.join(pasta, nome), encoding='utf-8') as arquivo:
+                abas[os.path.splitext(nome)[0]] = arquivo.read()
+    return abas
+
+
+if __name__ == '__main__':
+    servidor, url_base = iniciar_servidor(_abas_da_pasta(sys.argv[1]), int(sys.argv[2]) if len(sys.argv) > 2 else 8765)
+    print(f"Servidor gviz local em {url_base} (Ctrl+C para encerrar)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        servidor.shutdown()
@@ -0,0 +1,43 @@
+"""Auditor sem interface: nomes das saídas de vários arquivos."""
+import os
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from folha.auditoria import nomes_de_saida
+from folha.paralelo import NOME_RESUMO, auditar_arquivos
+
+
+def test_nomes_de_saida_distintos():
+    caminhos = ['/dados/x/folha.csv', '/dados/y/folha.csv', '/dados/resumo.csv', '/dados/jan.csv',
+                '/dados/z/Jan.parquet', '/dados/x_folha.csv']
+    nomes = nomes_de_saida(caminhos, reservados=('resumo',))
+    # jan.csv e Jan.parquet só diferem em maiúsculas: também recebem a pasta
+    assert nomes == ['x_folha', 'y_folha', 'resumo_2', 'dados_jan', 'z_Jan', 'x_folha_2']
+    assert len({nome.casefold() for nome in nomes}) == len(nomes)
+
+
+def test_nomes_de_saida_sem_repeticao_mantem_o_nome():
+    assert nomes_de_saida(['a/jan.csv', 'b/fev.csv']) == ['jan', 'fev']
+
+
+@pytest.mark.parametrize("processos", [1, 2])
+def test_auditar_arquivos_nao_sobrescreve_saidas(tmp_path, processos):
+    entradas = []
+    for pasta, nome, salario in (('x', 'folha.csv', 2000.0), ('y', 'folha.csv', 5000.0), ('', 'resumo.csv', 8000.0)):
+        os.makedirs(tmp_path / pasta, exist_ok=True)
+        caminho = tmp_path / pasta / nome
+        pd.DataFrame({'Nome': ['A'], 'Salario_Bruto': [salario], 'Dependentes': [0]}).to_csv(caminho, index=False)
+        entradas.append(str(caminho))
+
+    saida = tmp_path / 'saida'
+    consolidado = auditar_arquivos(entradas, date(2025, 6, 1), pasta_saida=str(saida), processos=processos)
+
+    assert not consolidado['falhas']
+    assert sorted(os.listdir(saida)) == sorted([NOME_RESUMO, 'x_folha_auditoria.csv', 'y_folha_auditoria.csv',
+                                                'resumo_2_auditoria.csv'])
+    for resumo, salario in zip(consolidado['por_arquivo'], (2000.0, 5000.0, 8000.0)):
+        gravado = pd.read_csv(resumo['saidas'][0], sep=';', decimal=',')
+        assert gravado['Salario_Bruto'].tolist() == [salario]
+    assert len(pd.read_csv(saida / NOME_RESUMO, sep=';', decimal=',')) == 3
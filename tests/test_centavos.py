@@ -0,0 +1,107 @@
+"""Modo em centavos inteiros comparado ao cálculo em float e a uma referência decimal exata."""
+from datetime import date
+from decimal import ROUND_HALF_UP, Decimal
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from folha import (
+    TABELA_INSS_2025,
+    arredondar_unidades,
+    calcular_inss_centavos,
+    formatar_centavos,
+    para_centavos,
+    para_reais,
+    processar_lote,
+)
+
+COLUNAS_MONETARIAS = ['Salario_Familia', 'INSS', 'IRRF', 'Salario_Liquido']
+
+
+def _inss_decimal(salario_centavos, faixas):
+    """INSS exato em Decimal, arredondado uma vez (meio centavo para cima)."""
+    salario = Decimal(int(salario_centavos)) / 100
+    inss = Decimal(0)
+    anterior = Decimal(0)
+    for faixa in faixas:
+        limite = Decimal(str(faixa['limite']))
+        if salario <= anterior:
+            break
+        inss += (min(salario, limite) - anterior) * Decimal(str(faixa['aliquota']))
+        anterior = limite
+    return int((inss * 100).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+def _folha(linhas=5000):
+    rng = np.random.default_rng(9)
+    return pd.DataFrame({
+        'Nome': [f'Funcionario {i}' for i in range(linhas)],
+        'Salario_Bruto': rng.uniform(0, 20000, linhas).round(2),
+        'Dependentes': rng.integers(0, 4, linhas),
+        'Outros_Descontos': rng.uniform(0, 500, linhas).round(2),
+        'Competencia': rng.choice(['06/2023', '03/2024', '08/2025'], linhas),
+    })
+
+
+def test_conversao_sem_perda():
+    valores = np.array([0.0, 0.01, 0.015, 1234.56, 8157.41, -2.675, 99999999.99])
+    centavos = para_centavos(valores)
+    # Arredonda como round(valor, 2): 0.015 e -2.675 ficam abaixo do meio em binário
+    assert centavos.tolist() == [0, 1, 1, 123456, 815741, -267, 9999999999]
+    assert para_reais(centavos).tolist() == [round(float(valor), 2) for valor in valores]
+
+
+@pytest.mark.parametrize("regra, esperado", [
+    ('meio_para_cima', [0, 1, 1, 2, 3, 0]),
+    ('meio_para_par', [0, 0, 1, 2, 2, 0]),
+    ('truncar', [0, 0, 1, 1, 2, -1]),
+])
+def test_regras_de_arredondamento(regra, esperado):
+    unidades = [4999, 5000, 15000 - 1, 15000, 25000, -5000]
+    assert arredondar_unidades(unidades, regra).tolist() == esperado
+
+
+def test_regra_desconhecida():
+    with pytest.raises(ValueError):
+        arredondar_unidades([1], 'bancario')
+
+
+def test_formatar_centavos():
+    assert formatar_centavos(123456789) == "R$ 1.234.567,89"
+    assert formatar_centavos(-5) == "R$ -0,05"
+
+
+def test_inss_centavos_igual_a_referencia_decimal():
+    rng = np.random.default_rng(1)
+    salarios = np.concatenate([[0, 1, 151800, 151801, 815741, 815742, 2_000_000], rng.integers(0, 2_000_000, 3000)])
+    esperado = [_inss_decimal(salario, TABELA_INSS_2025) for salario in salarios]
+    assert calcular_inss_centavos(salarios, TABELA_INSS_2025).tolist() == esperado
+
+
+@pytest.mark.parametrize("simular_ano_anterior", [False, True])
+def test_lote_em_centavos_igual_ao_float(simular_ano_anterior):
+    folha = _folha()
+    competencia = date(2025, 1, 1)
+    em_float = processar_lote(folha, competencia, simular_ano_anterior)
+    em_centavos = processar_lote(folha, competencia, simular_ano_anterior, centavos=True)
+
+    assert em_float.attrs['modo_calculo'] == 'float'
+    assert em_centavos.attrs['modo_calculo'] == 'centavos'
+    assert em_centavos.attrs['deduplicacao'] == em_float.attrs['deduplicacao']
+    assert em_centavos['Salario_Bruto'].tolist() == em_float['Salario_Bruto'].tolist()
+
+    colunas = COLUNAS_MONETARIAS + ([f'{coluna}_Sim' for coluna in COLUNAS_MONETARIAS] if simular_ano_anterior else [])
+    for coluna in colunas:
+        # INSS arredondado uma única vez pode diferir em 1 centavo, e o IRRF/líquido herdam a diferença
+        diferenca = np.abs(para_centavos(em_centavos[coluna]) - para_centavos(em_float[coluna]))
+        assert diferenca.max() <= 1, coluna
+    assert (em_centavos['Salario_Familia'] == em_float['Salario_Familia']).all()
+
+
+def test_liquido_em_centavos_fecha_exato():
+    resultado = processar_lote(_folha(), date(2025, 1, 1), centavos=True)
+    centavos = {coluna: para_centavos(resultado[coluna]) for coluna in resultado.columns if resultado[coluna].dtype == 'float64'}
+    liquido = (centavos['Salario_Bruto'] + centavos['Salario_Familia'] - centavos['INSS']
+               - centavos['IRRF'] - centavos['Outros_Descontos'])
+    assert (liquido == centavos['Salario_Liquido']).all()
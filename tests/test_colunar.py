@@ -0,0 +1,139 @@
+"""Saída em texto (CSV e moeda) por coluna, comparada à formatação escalar."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from folha.colunar import resultado_para_csv, texto_reais
+from folha.relatorio import formatar_moeda, formatar_moeda_coluna
+
+# Meios centavos, produtos inexatos por 100, zeros com sinal e valores grandes
+VALORES_LIMITE = [
+    0.0, -0.0, 0.005, 0.015, 0.025, 0.125, 0.165, 1.005, 2.675, 1234.565,
+    -0.004, -0.005, -0.015, -1234.565, 999.995, 999999.995, 1e-9, -1e-9,
+    0.1 + 0.2, 4.35, 8157.41, 12345678.905, -12345678.905,
+]
+
+
+def _valores_aleatorios():
+    rng = np.random.default_rng(7)
+    centavos_e_meio = rng.integers(-10**8, 10**8, 5000) + 0.5
+    return np.concatenate([rng.uniform(-1e6, 1e6, 5000), centavos_e_meio / 100, rng.integers(0, 10**6, 5000) / 1000])
+
+
+@pytest.mark.parametrize("valor", VALORES_LIMITE)
+def test_texto_reais_igual_ao_format(valor):
+    assert texto_reais([valor])[0].as_py() == format(valor, '.2f').replace('.', ',')
+
+
+def test_texto_reais_igual_ao_format_em_massa():
+    valores = _valores_aleatorios()
+    esperado = [format(valor, '.2f').replace('.', ',') for valor in valores]
+    assert texto_reais(valores).to_pylist() == esperado
+
+
+def test_formatar_moeda_coluna_igual_ao_escalar():
+    valores = pd.Series(VALORES_LIMITE + list(_valores_aleatorios()[:2000]) + [np.nan])
+    esperado = [formatar_moeda(valor) for valor in valores]
+    assert formatar_moeda_coluna(valores).tolist() == esperado
+
+
+def test_formatar_moeda_coluna_em_centavos():
+    centavos = np.array([0, 1, -1, 99, 100, 123456, -123456789])
+    esperado = [formatar_moeda(valor / 100) for valor in centavos]
+    assert formatar_moeda_coluna(centavos, centavos=True).tolist() == esperado
+
+
+def test_resultado_para_csv_igual_ao_to_csv():
+    df = pd.DataFrame({
+        'Nome': ['Ana; Clara', 'Bia "B"', 'Caio\nC', None] * 6,
+        'Valor': (VALORES_LIMITE + [np.nan])[:24],
+        'Dependentes': np.arange(24, dtype=np.int8),
+        'Metodo_Deducao': pd.Categorical(['Legal', 'Simplificado'] * 12),
+    })
+    esperado = df.to_csv(sep=';', decimal=',', index=False, float_format='%.2f', lineterminator='\n').encode('utf-8')
+    assert resultado_para_csv(df) == esperado
+
+
+def test_gravador_parquet_amplia_tipos_entre_blocos(tmp_path):
+    from datetime import date
+
+    from folha import processar_lote
+    from folha.colunar import GravadorParquet
+
+    primeiro = pd.DataFrame({'Nome': ['a', 'b'], 'Salario_Bruto': [2000.0, 3000.0], 'Dependentes': [1, 2],
+                             'Origem': ['x', 'y']})
+    segundo = pd.DataFrame({'Nome': [f'n{i}' for i in range(300)], 'Salario_Bruto': [2000.0] * 300,
+                            'Dependentes': [300] + [0] * 299, 'Origem': [f'o{i}' for i in range(300)]})
+    blocos = [processar_lote(bloco, date(2025, 1, 1)) for bloco in (primeiro, segundo)]
+
+    destino = tmp_path / 'resultado.parquet'
+    gravador = GravadorParquet(destino)
+    for bloco in blocos:
+        gravador.gravar(bloco)
+    gravador.fechar()
+
+    lido = pd.read_parquet(destino)
+    assert lido['Dependentes'].tolist() == [1, 2, 300] + [0] * 299
+    assert lido['Origem'].astype(str).tolist() == ['x', 'y'] + [f'o{i}' for i in range(300)]
+
+
+def _folha_entrada(linhas=1000):
+    rng = np.random.default_rng(13)
+    return pd.DataFrame({
+        'Nome': [f'Funcionario {i}' for i in range(linhas)],
+        'Salario_Bruto': rng.uniform(1000, 15000, linhas).round(2),
+        'Dependentes': rng.integers(0, 4, linhas),
+        'Outros_Descontos': rng.uniform(0, 300, linhas).round(2),
+        'Competencia': rng.choice(['01/2024', '03/2025'], linhas),
+        'Setor': rng.choice(['RH', 'TI'], linhas),
+    })
+
+
+def test_resultado_parquet_ida_e_volta(tmp_path):
+    import io
+    from datetime import date
+
+    from folha import processar_lote
+    from folha.colunar import resultado_para_parquet
+
+    resultado = processar_lote(_folha_entrada(), date(2025, 1, 1), simular_ano_anterior=True)
+    # Categóricas de datas voltam como datas simples; as de texto continuam categóricas
+    esperado = resultado.assign(Competencia=resultado['Competencia'].astype(object))
+    lido = pd.read_parquet(io.BytesIO(resultado_para_parquet(resultado)))
+    pd.testing.assert_frame_equal(lido, esperado)
+
+    destino = tmp_path / 'resultado.parquet'
+    assert resultado_para_parquet(resultado, destino) == destino
+    pd.testing.assert_frame_equal(pd.read_parquet(destino), esperado)
+
+
+@pytest.mark.parametrize("formato", ['parquet', 'feather'])
+def test_ler_entrada_colunar_igual_ao_csv(formato):
+    import io
+    from datetime import date
+
+    from folha import ler_entrada, preparar_entrada, processar_lote
+    from folha.colunar import COLUNAS_ENTRADA, ler_entrada_em_blocos
+
+    folha = _folha_entrada()
+    arquivo = io.BytesIO()
+    if formato == 'parquet':
+        folha.to_parquet(arquivo, index=False)
+    else:
+        folha.to_feather(arquivo)
+    csv = io.BytesIO(folha.to_csv(index=False, sep=';', decimal=',').encode('utf-8'))
+
+    arquivo.seek(0)
+    entrada = ler_entrada(arquivo)
+    # Só as colunas da auditoria são carregadas
+    assert list(entrada.columns) == list(COLUNAS_ENTRADA)
+    competencia = date(2025, 1, 1)
+    pd.testing.assert_frame_equal(
+        processar_lote(preparar_entrada(entrada), competencia),
+        processar_lote(preparar_entrada(ler_entrada(csv)), competencia),
+    )
+
+    arquivo.seek(0)
+    blocos = list(ler_entrada_em_blocos(arquivo, 300))
+    assert [len(bloco) for bloco in blocos] == [300, 300, 300, 100]
+    pd.testing.assert_frame_equal(pd.concat(blocos, ignore_index=True), entrada)
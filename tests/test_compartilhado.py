@@ -0,0 +1,54 @@
+"""Processamento em memória compartilhada: mesmo resultado de `processar_lote`."""
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from folha import compartilhado, processar_lote
+
+
+@pytest.fixture
+def folha_varios_anos():
+    rng = np.random.default_rng(3)
+    linhas = 20_000
+    return pd.DataFrame({
+        'Nome': [f'Funcionario {i}' for i in range(linhas)],
+        'Salario_Bruto': rng.uniform(1500, 15000, linhas).round(2),
+        'Dependentes': rng.integers(0, 4, linhas),
+        'Outros_Descontos': rng.uniform(0, 300, linhas).round(2),
+        # Ordem de aparição diferente da ordem dos anos
+        'Competencia': rng.choice(['03/2025', '01/2024', '06/2023'], linhas),
+        'Origem': rng.choice(['Mar', 'Jan', 'Jun'], linhas),
+    })
+
+
+@pytest.mark.parametrize("centavos", [False, True])
+def test_paralelo_igual_ao_serial(folha_varios_anos, monkeypatch, centavos):
+    monkeypatch.setattr(compartilhado, 'LINHAS_MINIMAS_PARALELO', 1)
+    competencia = date(2025, 1, 1)
+
+    serial = processar_lote(folha_varios_anos, competencia, simular_ano_anterior=True, centavos=centavos)
+    paralelo = compartilhado.processar_lote_paralelo(folha_varios_anos, competencia, simular_ano_anterior=True,
+                                                     centavos=centavos, processos=2)
+
+    pd.testing.assert_frame_equal(paralelo, serial)
+    assert list(paralelo['Ano_Base_Sim'].cat.categories) == list(serial['Ano_Base_Sim'].cat.categories)
+    assert paralelo.attrs['modo_calculo'] == serial.attrs['modo_calculo']
+    assert paralelo.attrs['deduplicacao'] == serial.attrs['deduplicacao']
+
+
+def test_paralelo_conta_combinacoes_da_folha_inteira(monkeypatch):
+    monkeypatch.setattr(compartilhado, 'LINHAS_MINIMAS_PARALELO', 1)
+    combinacoes = [(1500.0, 2, 0.0), (2800.0, 1, 100.0), (4200.0, 0, 200.5),
+                   (1800.5, 3, 50.0), (6000.0, 1, 300.0), (9000.0, 0, 0.0)]
+    linhas = 20_000
+    df = pd.DataFrame([combinacoes[i % len(combinacoes)] for i in range(linhas)],
+                      columns=['Salario_Bruto', 'Dependentes', 'Outros_Descontos'])
+    df.insert(0, 'Nome', [f'Funcionario {i}' for i in range(linhas)])
+
+    serial = processar_lote(df, date(2025, 1, 1))
+    paralelo = compartilhado.processar_lote_paralelo(df, date(2025, 1, 1), processos=2)
+
+    assert serial.attrs['deduplicacao']['combinacoes_unicas'] == len(combinacoes)
+    assert paralelo.attrs['deduplicacao'] == serial.attrs['deduplicacao']
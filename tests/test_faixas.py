@@ -0,0 +1,77 @@
+"""Tabelas progressivas compiladas: imutáveis, compiladas uma vez e fiéis às faixas."""
+import numpy as np
+import pytest
+
+from folha import (
+    TABELA_INSS_2025,
+    TABELA_IRRF_MAI2025_DEZ2025,
+    TabelaProgressiva,
+    compilar_tabela,
+    detalhar_faixas,
+)
+
+
+def _inss_por_faixas(salario, faixas):
+    """INSS somando faixa a faixa sobre a lista original."""
+    inss = 0.0
+    anterior = 0.0
+    for faixa in faixas:
+        if salario <= anterior:
+            break
+        inss += (min(salario, faixa["limite"]) - anterior) * faixa["aliquota"]
+        anterior = faixa["limite"]
+    return inss
+
+
+def _irrf_por_faixas(base, faixas):
+    for faixa in faixas:
+        if base <= faixa["limite"]:
+            return base * faixa["aliquota"] - faixa["deducao"]
+    return None
+
+
+def test_tabela_compilada_imutavel():
+    tabela = compilar_tabela(TABELA_INSS_2025)
+    with pytest.raises(AttributeError):
+        tabela.limites = np.zeros(4)
+    with pytest.raises(ValueError):
+        tabela.aliquotas[0] = 0.5
+    assert tabela.teto == TABELA_INSS_2025[-1]["limite"]
+
+
+def test_compilada_uma_vez_por_lista():
+    assert compilar_tabela(TABELA_INSS_2025) is compilar_tabela(TABELA_INSS_2025)
+    compilada = compilar_tabela(TABELA_INSS_2025)
+    assert compilar_tabela(compilada) is compilada
+    # Lista com o mesmo conteúdo, mas outro objeto: compilada à parte
+    copia = [dict(faixa) for faixa in TABELA_INSS_2025]
+    assert compilar_tabela(copia) is not compilada
+    assert compilar_tabela(copia).limites.tolist() == compilada.limites.tolist()
+
+
+@pytest.mark.parametrize("salario", [0.01, 1518.0, 1518.01, 2793.88, 4190.83, 5000.0, 8157.41, 8157.42, 20000.0])
+def test_inss_compilado_igual_as_faixas(salario):
+    assert compilar_tabela(TABELA_INSS_2025).inss(salario) == pytest.approx(_inss_por_faixas(salario, TABELA_INSS_2025), abs=1e-9)
+
+
+@pytest.mark.parametrize("base", [0.01, 2428.8, 2428.81, 2826.65, 3751.06, 4664.68, 4664.69, 50000.0])
+def test_irrf_compilado_igual_as_faixas(base):
+    assert compilar_tabela(TABELA_IRRF_MAI2025_DEZ2025).irrf(base) == _irrf_por_faixas(base, TABELA_IRRF_MAI2025_DEZ2025)
+
+
+def test_irrf_acima_da_ultima_faixa_finita():
+    tabela = TabelaProgressiva([{"limite": 1000.0, "aliquota": 0.0}, {"limite": 2000.0, "aliquota": 0.1, "deducao": 100.0}])
+    assert tabela.irrf(1500.0) == pytest.approx(50.0)
+    assert tabela.irrf(2000.01) is None
+
+
+def test_detalhar_faixas():
+    faixas = detalhar_faixas(TABELA_INSS_2025)
+    assert faixas is detalhar_faixas(TABELA_INSS_2025)
+    assert len(faixas) == len(TABELA_INSS_2025)
+    anterior = 0.0
+    for (limite_anterior, limite, aliquota, _, valor_maximo), faixa in zip(faixas, TABELA_INSS_2025):
+        assert (limite_anterior, limite, aliquota) == (anterior, faixa["limite"], faixa["aliquota"])
+        assert valor_maximo == pytest.approx((faixa["limite"] - anterior) * faixa["aliquota"])
+        anterior = faixa["limite"]
+    assert sum(faixa[4] for faixa in faixas) == pytest.approx(_inss_por_faixas(8157.41, TABELA_INSS_2025))
@@ -0,0 +1,64 @@
+"""Detecção do formato de CSV: codificação, separador e decimal/milhar brasileiros."""
+import io
+
+import pandas as pd
+import pytest
+
+from folha import detectar_formato, ler_csv, ler_csv_em_blocos
+
+LINHAS_BR = [
+    ('José Conceição', '1.234,56', '2', '0,00'),
+    ('Ana Lúcia', '12.345,67', '0', '150,25'),
+    ('Márcio', '980,00', '1', '35,50'),
+]
+ESPERADO = pd.DataFrame({
+    'Nome': ['José Conceição', 'Ana Lúcia', 'Márcio'],
+    'Salario_Bruto': [1234.56, 12345.67, 980.0],
+    'Dependentes': [2.0, 0.0, 1.0],
+    'Outros_Descontos': [0.0, 150.25, 35.5],
+})
+
+
+def _csv(linhas, separador=';', codificacao='latin-1'):
+    texto = '\n'.join(separador.join(campos) for campos in [('Nome', 'Salario_Bruto', 'Dependentes', 'Outros_Descontos')] + linhas)
+    return io.BytesIO((texto + '\n').encode(codificacao))
+
+
+def test_latin1_com_virgula_decimal_e_milhar():
+    arquivo = _csv(LINHAS_BR)
+    assert detectar_formato(arquivo) == {'sep': ';', 'encoding': 'latin-1', 'decimal': ',', 'thousands': '.'}
+    # A detecção não consome o arquivo
+    assert arquivo.tell() == 0
+    pd.testing.assert_frame_equal(ler_csv(arquivo), ESPERADO)
+
+
+def test_utf8_com_bom():
+    arquivo = io.BytesIO(b'\xef\xbb\xbf' + _csv(LINHAS_BR, codificacao='utf-8').getvalue())
+    assert detectar_formato(arquivo)['encoding'] == 'utf-8-sig'
+    pd.testing.assert_frame_equal(ler_csv(arquivo), ESPERADO)
+
+
+@pytest.mark.parametrize("separador", [',', '\t', '|'])
+def test_ponto_decimal(separador):
+    linhas = [(nome, salario.replace('.', '').replace(',', '.'), deps, outros.replace(',', '.'))
+              for nome, salario, deps, outros in LINHAS_BR]
+    arquivo = _csv(linhas, separador, 'utf-8')
+    formato = detectar_formato(arquivo)
+    assert (formato['sep'], formato['encoding'], formato['decimal']) == (separador, 'utf-8', '.')
+    pd.testing.assert_frame_equal(ler_csv(arquivo), ESPERADO)
+
+
+def test_celula_invalida_fica_vazia():
+    arquivo = _csv(LINHAS_BR + [('Inválido', 'abc', '1', '0,00')])
+    df = ler_csv(arquivo)
+    assert df['Salario_Bruto'].iloc[:3].tolist() == ESPERADO['Salario_Bruto'].tolist()
+    assert pd.isna(df['Salario_Bruto'].iloc[3])
+
+
+def test_blocos_iguais_a_leitura_inteira():
+    arquivo = _csv(LINHAS_BR * 5)
+    blocos = list(ler_csv_em_blocos(arquivo, 4))
+    assert [len(bloco) for bloco in blocos] == [4, 4, 4, 3]
+    arquivo.seek(0)
+    # Em blocos os tipos são inferidos (Dependentes pode vir inteiro)
+    pd.testing.assert_frame_equal(pd.concat(blocos, ignore_index=True), ler_csv(arquivo), check_dtype=False)
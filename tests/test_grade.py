@@ -0,0 +1,25 @@
+"""Página da grade: recorte e formatação em moeda brasileira."""
+import numpy as np
+import pandas as pd
+
+from folha.grade import pagina_resultado
+from folha.relatorio import formatar_moeda
+
+
+def test_pagina_em_moeda_igual_ao_pdf():
+    df = pd.DataFrame({
+        'Nome': ['Ana', 'Bruno', 'Carla'],
+        'Dependentes': [0, 2, 1],
+        'Salario_Bruto': [1234.56, 12345.678, 999.995],
+        'INSS': [92.59, 951.63, np.nan],
+    })
+    pagina, primeira, ultima = pagina_resultado(df, np.array([2, 0]), 1, moeda=True)
+
+    assert (primeira, ultima) == (1, 2)
+    assert pagina['Nome'].tolist() == ['Carla', 'Ana']
+    assert pagina['Dependentes'].tolist() == [1, 0]
+    for coluna in ('Salario_Bruto', 'INSS'):
+        assert pagina[coluna].tolist() == [formatar_moeda(valor) for valor in df[coluna].iloc[[2, 0]]]
+    assert pagina['Salario_Bruto'].iloc[1] == 'R$ 1.234,56'
+    # O resultado numérico não é alterado
+    assert df['Salario_Bruto'].dtype == 'float64'
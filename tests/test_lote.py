@@ -0,0 +1,61 @@
+"""Deduplicação do lote: cada combinação é calculada uma vez e replicada corretamente."""
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from folha import processar_lote
+from folha.lote import _deduplicar
+
+
+def _deduplicar_referencia(*colunas):
+    """Primeira linha e número de cada combinação pelo groupby do pandas."""
+    df = pd.DataFrame({i: coluna for i, coluna in enumerate(colunas)})
+    combinacao = df.groupby(list(df.columns), sort=False, dropna=False).ngroup().to_numpy()
+    primeiras = np.flatnonzero(~df.duplicated())
+    return primeiras, combinacao
+
+
+def test_deduplicar_igual_ao_groupby():
+    rng = np.random.default_rng(2)
+    linhas = 10_000
+    salarios = rng.choice([1500.0, 2500.5, 4800.0, 9200.0, np.nan], linhas)
+    dependentes = rng.integers(0, 4, linhas)
+    outros = rng.choice([0.0, 35.5, 120.0], linhas)
+    competencias = rng.choice(np.array(['2024-01-01', '2025-03-01'], dtype='datetime64[D]'), linhas).view(np.int64)
+
+    primeiras, combinacao = _deduplicar(salarios, dependentes, outros, competencias)
+    esperado_primeiras, esperado_combinacao = _deduplicar_referencia(salarios, dependentes, outros, competencias)
+    assert primeiras.tolist() == esperado_primeiras.tolist()
+    assert combinacao.tolist() == esperado_combinacao.tolist()
+
+
+def test_deduplicar_sem_estourar_o_codigo_combinado():
+    # 5 colunas com ~10 mil valores distintos: o produto passa de 2**62
+    rng = np.random.default_rng(4)
+    colunas = [rng.integers(0, 10_000, 20_000) for _ in range(5)]
+    colunas = [np.concatenate([coluna, coluna[:500]]) for coluna in colunas]
+
+    primeiras, combinacao = _deduplicar(*colunas)
+    esperado_primeiras, esperado_combinacao = _deduplicar_referencia(*colunas)
+    assert primeiras.tolist() == esperado_primeiras.tolist()
+    assert combinacao.tolist() == esperado_combinacao.tolist()
+    assert len(primeiras) == 20_000
+
+
+def test_lote_deduplicado_igual_linha_a_linha():
+    combinacoes = [(1500.0, 2, 0.0, '01/2024'), (2500.5, 0, 35.5, '03/2025'), (4800.0, 1, 0.0, '03/2025'),
+                   (9200.0, 3, 120.0, '06/2023'), (2500.5, 0, 35.5, '01/2024')]
+    linhas = [combinacoes[i % len(combinacoes)] for i in range(500)]
+    df = pd.DataFrame(linhas, columns=['Salario_Bruto', 'Dependentes', 'Outros_Descontos', 'Competencia'])
+    df.insert(0, 'Nome', [f'Funcionario {i}' for i in range(len(df))])
+    competencia = date(2025, 1, 1)
+
+    resultado = processar_lote(df, competencia, simular_ano_anterior=True)
+    assert resultado.attrs['deduplicacao'] == {'linhas': 500, 'combinacoes_unicas': 5, 'razao': 100.0}
+
+    for i in range(len(combinacoes)):
+        individual = processar_lote(df.iloc[[i]], competencia, simular_ano_anterior=True)
+        repetidas = resultado.iloc[i::len(combinacoes)].drop(columns='Nome')
+        esperado = pd.concat([individual.drop(columns='Nome')] * len(repetidas), ignore_index=True)
+        pd.testing.assert_frame_equal(repetidas.reset_index(drop=True), esperado, check_categorical=False)
@@ -0,0 +1,92 @@
+"""Memoização LRU: acertos, falhas, descartes e configuração global."""
+import pytest
+
+from folha import (
+    TABELA_INSS_2025,
+    CacheLRU,
+    calcular_inss,
+    configurar_cache,
+    estatisticas_cache,
+    limpar_cache,
+    memo,
+)
+
+
+@pytest.fixture
+def cache():
+    cache = CacheLRU("teste_memo", tamanho_maximo=2)
+    yield cache
+    memo._CACHES.pop("teste_memo", None)
+
+
+@pytest.fixture
+def caches_limpos():
+    limpar_cache()
+    yield
+    configurar_cache(memo.TAMANHO_CACHE_PADRAO)
+    limpar_cache()
+
+
+def test_acertos_falhas_e_descartes(cache):
+    chamadas = []
+
+    def dobrar(valor):
+        chamadas.append(valor)
+        return valor * 2
+
+    assert cache.obter(1, dobrar, 1) == 2
+    assert cache.obter(1, dobrar, 1) == 2
+    assert cache.obter(2, dobrar, 2) == 4
+    # Tamanho 2: o 3 descarta o 1, o menos usado
+    assert cache.obter(3, dobrar, 3) == 6
+    assert chamadas == [1, 2, 3]
+    assert cache.estatisticas() == {
+        'acertos': 1, 'falhas': 3, 'descartes': 1, 'tamanho': 2, 'tamanho_maximo': 2, 'taxa_acerto': 0.25,
+    }
+
+
+def test_descarta_o_menos_usado(cache):
+    cache.obter('a', str, 'a')
+    cache.obter('b', str, 'b')
+    cache.obter('a', str, 'a')  # 'a' passa a ser o mais recente
+    cache.obter('c', str, 'c')  # descarta 'b'
+    falhas = cache.falhas
+    cache.obter('a', str, 'a')
+    assert cache.falhas == falhas
+    cache.obter('b', str, 'b')
+    assert cache.falhas == falhas + 1
+
+
+def test_redimensionar_e_limpar(cache):
+    for chave in range(2):
+        cache.obter(chave, str, chave)
+    cache.redimensionar(0)
+    assert len(cache) == 0
+    assert cache.descartes == 2
+    # Tamanho 0: nada é guardado
+    cache.obter(5, str, 5)
+    cache.obter(5, str, 5)
+    assert (cache.acertos, cache.falhas, len(cache)) == (0, 4, 0)
+
+    cache.limpar()
+    assert cache.estatisticas()['falhas'] == 0
+    assert cache.estatisticas()['taxa_acerto'] == 0.0
+
+
+def test_calculo_memoizado_conta_acertos(caches_limpos):
+    assert estatisticas_cache()['calcular_inss']['falhas'] == 0
+    primeiro = calcular_inss(4321.09, TABELA_INSS_2025)
+    assert calcular_inss(4321.09, TABELA_INSS_2025) == primeiro
+    estatisticas = estatisticas_cache()['calcular_inss']
+    assert (estatisticas['acertos'], estatisticas['falhas']) == (1, 1)
+
+    limpar_cache()
+    assert estatisticas_cache()['calcular_inss']['acertos'] == 0
+
+
+def test_configurar_cache_vale_para_todos(caches_limpos):
+    configurar_cache(0)
+    assert all(cache['tamanho_maximo'] == 0 for cache in estatisticas_cache().values())
+    # Sem memoização o resultado é o mesmo
+    assert calcular_inss(4321.09, TABELA_INSS_2025) == calcular_inss(4321.09, TABELA_INSS_2025)
+    assert estatisticas_cache()['calcular_inss']['acertos'] == 0
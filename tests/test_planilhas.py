@@ -0,0 +1,230 @@
+"""Carregador de planilhas contra o servidor gviz local (`servidor_gviz`, nesta pasta)."""
+from datetime import date
+from decimal import ROUND_HALF_UP, Decimal
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from folha import (
+    VIGENCIAS_INSS,
+    VIGENCIAS_IRRF,
+    VIGENCIAS_SALARIO_FAMILIA,
+    calcular_inss,
+    calcular_irrf,
+    calcular_salario_familia,
+    preparar_entrada,
+    processar_lote,
+    selecionar_tabelas,
+)
+from folha.planilhas import (
+    SessaoHTTP,
+    carregar_abas,
+    carregar_colunas_planilha,
+    carregar_planilha,
+    estatisticas_planilhas,
+    limpar_cache_planilhas,
+    padronizar_colunas_planilha,
+)
+
+from servidor_gviz import iniciar_servidor
+
+ID_PLANILHA = 'planilha-teste'
+
+
+def _aba(linhas, competencia=False):
+    cabecalho = 'Nome,Salario_Bruto,Dependentes,Outros_Descontos' + (',Competencia' if competencia else '')
+    return '\n'.join([cabecalho] + [','.join(map(str, linha)) for linha in linhas]) + '\n'
+
+
+def _mes_anterior(data):
+    return date(data.year - (data.month == 1), (data.month - 2) % 12 + 1, 1)
+
+
+# Início de cada vigência e o mês anterior a ele
+COMPETENCIAS_LIMITE = sorted({
+    competencia
+    for vigencias in (VIGENCIAS_INSS, VIGENCIAS_IRRF, VIGENCIAS_SALARIO_FAMILIA)
+    for inicio in (vigencia[0] for vigencia in vigencias)
+    for competencia in (inicio.replace(day=1), _mes_anterior(inicio))
+})
+
+
+@pytest.fixture
+def servidor():
+    abas = {
+        'Jan': _aba([('Ana', 1800.0, 2, 0.0), ('Bruno', 4500.5, 1, 120.0)]),
+        'Fev': _aba([('Carla', 9000.0, 0, 50.0)]),
+        'Limites': _aba([
+            (f'Func {i}', salario, dependentes, 0.0, competencia.strftime('%m/%Y'))
+            for i, competencia in enumerate(COMPETENCIAS_LIMITE)
+            for salario, dependentes in ((1700.0, 2), (3500.0, 1), (9500.0, 3))
+        ], competencia=True),
+        'Extras': 'Nome,Salario_Bruto,Dependentes,Outros_Descontos,Competência,Setor\n'
+                  'Ana,3500.0,1,0.0,12/2023,RH\n'
+                  'Bruno,3500.0,1,0.0,06/2025,TI\n',
+    }
+    limpar_cache_planilhas()
+    servidor, url_base = iniciar_servidor(abas)
+    sessao = SessaoHTTP(tempo_limite=5)
+    yield servidor, url_base, sessao, abas
+    sessao.fechar()
+    servidor.shutdown()
+    servidor.server_close()
+    limpar_cache_planilhas()
+
+
+# --- TTL E REVALIDAÇÃO ---
+
+def test_ttl_evita_requisicao(servidor):
+    servidor_gviz, url_base, sessao, _ = servidor
+    primeira = carregar_planilha(ID_PLANILHA, 'Jan', ttl=60, url_base=url_base, sessao=sessao)
+    segunda = carregar_planilha(ID_PLANILHA, 'Jan', ttl=60, url_base=url_base, sessao=sessao)
+
+    pd.testing.assert_frame_equal(primeira, segunda)
+    assert len(servidor_gviz.requisicoes) == 1
+    assert estatisticas_planilhas()['acertos_ttl'] == 1
+
+
+def test_revalidacao_com_etag_reaproveita_o_dataframe(servidor):
+    servidor_gviz, url_base, sessao, _ = servidor
+    primeira = carregar_planilha(ID_PLANILHA, 'Jan', ttl=0, url_base=url_base, sessao=sessao)
+    segunda = carregar_planilha(ID_PLANILHA, 'Jan', ttl=0, url_base=url_base, sessao=sessao)
+
+    pd.testing.assert_frame_equal(primeira, segunda)
+    estatisticas = estatisticas_planilhas()
+    assert len(servidor_gviz.requisicoes) == 2
+    assert (estatisticas['downloads'], estatisticas['nao_modificadas'], estatisticas['parses']) == (2, 1, 1)
+
+
+def test_revalidacao_le_conteudo_novo(servidor):
+    _, url_base, sessao, abas = servidor
+    carregar_planilha(ID_PLANILHA, 'Fev', ttl=0, url_base=url_base, sessao=sessao)
+    abas['Fev'] = _aba([('Carla', 9100.0, 0, 50.0)])
+    df = carregar_planilha(ID_PLANILHA, 'Fev', ttl=0, url_base=url_base, sessao=sessao)
+
+    assert df['Salario_Bruto'].tolist() == [9100.0]
+    assert estatisticas_planilhas()['parses'] == 2
+
+
+def test_consulta_filtra_no_servidor(servidor):
+    _, url_base, sessao, _ = servidor
+    df = carregar_colunas_planilha(ID_PLANILHA, 'Jan', filtro='B > 2000', url_base=url_base, sessao=sessao)
+    assert df.iloc[:, 0].tolist() == ['Bruno']
+
+
+# --- COLUNAS PELO CABEÇALHO ---
+
+def test_competencia_fora_de_a_d_entra_pelo_cabecalho(servidor):
+    _, url_base, sessao, _ = servidor
+    df = carregar_colunas_planilha(ID_PLANILHA, 'Extras', url_base=url_base, sessao=sessao)
+
+    assert list(df.columns) == ['Nome', 'Salario_Bruto', 'Dependentes', 'Outros_Descontos', 'Competência']
+    assert df.attrs['colunas_ignoradas'] == {'F': 'Setor'}
+    resultado = processar_lote(preparar_entrada(padronizar_colunas_planilha(df)), date(2025, 1, 1))
+    assert resultado['Competencia'].tolist() == [date(2023, 12, 1), date(2025, 6, 1)]
+    assert resultado['INSS'].iloc[0] != resultado['INSS'].iloc[1]
+
+
+def test_selecao_explicita_avisa_colunas_de_fora(servidor):
+    _, url_base, sessao, _ = servidor
+    df = carregar_colunas_planilha(ID_PLANILHA, 'Extras', colunas=('A', 'B', 'C', 'D'), url_base=url_base, sessao=sessao)
+    assert len(df.columns) == 4
+    assert df.attrs['colunas_ignoradas'] == {'E': 'Competência', 'F': 'Setor'}
+
+    sem_extras = carregar_colunas_planilha(ID_PLANILHA, 'Jan', url_base=url_base, sessao=sessao)
+    assert sem_extras.attrs['colunas_ignoradas'] == {}
+
+
+def test_carregar_abas_junta_as_colunas_ignoradas(servidor):
+    _, url_base, sessao, _ = servidor
+    df = carregar_abas([(ID_PLANILHA, 'Jan'), (ID_PLANILHA, 'Extras')], url_base=url_base, sessao=sessao)
+    assert df.attrs['colunas_ignoradas'] == {'Extras': {'F': 'Setor'}}
+    assert df['Competencia'].isna().tolist() == [True, True, False, False]
+
+
+# --- VÁRIAS ABAS ---
+
+def test_carregar_abas_isola_a_aba_com_erro(servidor):
+    _, url_base, sessao, _ = servidor
+    fontes = [(ID_PLANILHA, 'Jan'), (ID_PLANILHA, 'Inexistente'), (ID_PLANILHA, 'Fev')]
+    df = carregar_abas(fontes, concorrencia=2, url_base=url_base, sessao=sessao)
+
+    assert df['Nome'].tolist() == ['Ana', 'Bruno', 'Carla']
+    assert df['Origem'].tolist() == ['Jan', 'Jan', 'Fev']
+    assert list(df.attrs['erros_abas']) == ['Inexistente']
+    assert 'HTTP 404' in df.attrs['erros_abas']['Inexistente']
+
+
+def test_carregar_abas_falha_se_todas_falharem(servidor):
+    _, url_base, sessao, _ = servidor
+    with pytest.raises(ValueError, match='HTTP 404'):
+        carregar_abas([(ID_PLANILHA, 'Nao'), (ID_PLANILHA, 'Existe')], url_base=url_base, sessao=sessao)
+
+
+def test_carregar_abas_de_varias_planilhas_rotula_a_origem(servidor):
+    _, url_base, sessao, _ = servidor
+    df = carregar_abas([(ID_PLANILHA, 'Fev'), ('outra-planilha', 'Fev')], url_base=url_base, sessao=sessao)
+    assert df['Origem'].tolist() == [f'{ID_PLANILHA}/Fev', 'outra-planilha/Fev']
+
+
+# --- CÁLCULO DA FOLHA LIDA ---
+
+def _folha_limites(url_base, sessao):
+    df = carregar_colunas_planilha(ID_PLANILHA, 'Limites', colunas=('A', 'B', 'C', 'D', 'E'),
+                                   url_base=url_base, sessao=sessao)
+    return preparar_entrada(df)
+
+
+def test_vigencias_nas_datas_limite(servidor):
+    _, url_base, sessao, _ = servidor
+    folha = _folha_limites(url_base, sessao)
+    resultado = processar_lote(folha, date(2025, 1, 1))
+
+    for linha in resultado.itertuples():
+        competencia = linha.Competencia
+        tabela_inss, tabela_irrf, limite_sf, valor_sf, _, _, ds_maximo = selecionar_tabelas(competencia)
+        inss = calcular_inss(linha.Salario_Bruto, tabela_inss)
+        irrf, metodo, _, _ = calcular_irrf(linha.Salario_Bruto, linha.Dependentes, inss, linha.Outros_Descontos,
+                                           tabela_irrf, ds_maximo)
+        esperado = (calcular_salario_familia(linha.Salario_Bruto, linha.Dependentes, limite_sf, valor_sf), inss, irrf, metodo)
+        assert (linha.Salario_Familia, linha.INSS, linha.IRRF, linha.Metodo_Deducao) == esperado, competencia
+
+
+def test_vigencias_mudam_no_inicio(servidor):
+    _, url_base, sessao, _ = servidor
+    resultado = processar_lote(_folha_limites(url_base, sessao), date(2025, 1, 1))
+    inss = resultado.set_index(['Competencia', 'Salario_Bruto'])['INSS']
+
+    for inicio, _ in VIGENCIAS_INSS[1:]:
+        assert inss[(inicio, 3500.0)] != inss[(_mes_anterior(inicio), 3500.0)], inicio
+
+
+def _inss_exato(salario, tabela_inss):
+    """INSS progressivo em Decimal, arredondado uma única vez (meio para cima)."""
+    salario = Decimal(str(salario))
+    total = Decimal(0)
+    anterior = Decimal(0)
+    for faixa in tabela_inss:
+        limite = Decimal(str(faixa['limite']))
+        total += (min(salario, limite) - anterior).max(Decimal(0)) * Decimal(str(faixa['aliquota']))
+        anterior = limite
+    return float(total.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP))
+
+
+def test_modo_centavos_arredonda_uma_vez(servidor):
+    _, url_base, sessao, _ = servidor
+    folha = _folha_limites(url_base, sessao)
+    em_float = processar_lote(folha, date(2025, 1, 1), simular_ano_anterior=True)
+    em_centavos = processar_lote(folha, date(2025, 1, 1), simular_ano_anterior=True, centavos=True)
+
+    assert em_centavos.attrs['modo_calculo'] == 'centavos'
+    esperado = [_inss_exato(linha.Salario_Bruto, selecionar_tabelas(linha.Competencia)[0])
+                for linha in em_centavos.itertuples()]
+    assert em_centavos['INSS'].tolist() == esperado
+
+    # Fora o arredondamento único, os dois modos coincidem
+    colunas_monetarias = [coluna for coluna in em_float.columns if em_float[coluna].dtype == np.float64]
+    for coluna in colunas_monetarias:
+        np.testing.assert_allclose(em_centavos[coluna], em_float[coluna], rtol=0, atol=0.0101, err_msg=coluna)
+    pd.testing.assert_frame_equal(em_centavos.drop(columns=colunas_monetarias), em_float.drop(columns=colunas_monetarias))
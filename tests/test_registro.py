@@ -0,0 +1,39 @@
+"""Registro de vigências: seleção de tabelas e rótulos por competência."""
+from datetime import date
+
+import pytest
+
+from folha import processar_lote, selecionar_tabelas, selecionar_tabelas_simuladas
+
+
+@pytest.mark.parametrize("competencia, ano_base, irrf_periodo", [
+    (date(2019, 6, 1), "2018 (Simulação - Fallback INSS 2020 / Salário Família 2023)", "IRRF 2018 (Simulação - Fallback 2023)"),
+    (date(2022, 6, 1), "2021 (Simulação - Fallback Salário Família 2023)", "IRRF 2021 (Simulação - Fallback 2023)"),
+    (date(2024, 6, 1), "2023 (Simulação)", "01/05/2023 a 31/01/2024 (Simulação)"),
+    (date(2026, 6, 1), "2025 (Simulação)", "01/05/2025 em diante (Simulação)"),
+])
+def test_rotulos_da_simulacao_nomeiam_o_ano_simulado(competencia, ano_base, irrf_periodo):
+    _, _, _, _, ano_base_sim, irrf_periodo_sim, _ = selecionar_tabelas_simuladas(competencia)
+    assert (ano_base_sim, irrf_periodo_sim) == (ano_base, irrf_periodo)
+
+
+def test_rotulo_oficial_antes_do_registro_indica_fallback():
+    assert selecionar_tabelas(date(2019, 6, 1))[4] == "2019 (Fallback INSS 2020 / Salário Família 2023)"
+    assert selecionar_tabelas(date(2025, 6, 1))[4] == "2025"
+
+
+def test_rotulo_da_simulacao_no_lote():
+    import pandas as pd
+
+    folha = pd.DataFrame({'Nome': ['A'], 'Salario_Bruto': [3000.0], 'Dependentes': [0], 'Competencia': ['06/2019']})
+    resultado = processar_lote(folha, date(2025, 1, 1), simular_ano_anterior=True)
+    assert resultado['Ano_Base_Sim'].iloc[0] == "2018 (Simulação - Fallback INSS 2020 / Salário Família 2023)"
+
+
+def test_cobertura_vigencias_acompanha_o_registro():
+    from folha import VIGENCIAS_INSS, VIGENCIAS_IRRF, cobertura_vigencias
+
+    cobertura = cobertura_vigencias()
+    assert cobertura['inss'] == f"{VIGENCIAS_INSS[0][0].year} a {VIGENCIAS_INSS[-1][0].year}"
+    assert cobertura['irrf_periodos'] == len(VIGENCIAS_IRRF)
+    assert cobertura['irrf_inicio'] == VIGENCIAS_IRRF[0][0].strftime("%d/%m/%Y")
@@ -0,0 +1,98 @@
+"""Cache de resultados: chave pelo conteúdo e parâmetros, cópias independentes e limite em bytes."""
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from folha import (
+    CacheResultados,
+    chave_resultado,
+    configurar_cache_resultados,
+    estatisticas_cache_resultados,
+    hash_entrada,
+    limpar_cache_resultados,
+    processar_lote,
+    processar_lote_em_cache,
+)
+from folha.resultados import TAMANHO_CACHE_RESULTADOS_PADRAO
+
+COMPETENCIA = date(2025, 1, 1)
+
+
+@pytest.fixture
+def folha():
+    return pd.DataFrame({
+        'Nome': ['Ana', 'Bruno', 'Carla'],
+        'Salario_Bruto': [1500.0, 4800.55, 9200.0],
+        'Dependentes': [2, 1, 0],
+        'Outros_Descontos': [0.0, 35.5, 120.0],
+    })
+
+
+@pytest.fixture
+def cache_limpo():
+    limpar_cache_resultados()
+    yield
+    configurar_cache_resultados(TAMANHO_CACHE_RESULTADOS_PADRAO)
+    limpar_cache_resultados()
+
+
+def test_hash_pelo_conteudo(folha):
+    assert hash_entrada(folha) == hash_entrada(folha.copy())
+    assert hash_entrada(b'abc') == hash_entrada(bytearray(b'abc'))
+    assert hash_entrada(b'abc') != hash_entrada(b'abd')
+
+    alterada = folha.copy()
+    alterada.loc[1, 'Salario_Bruto'] = 4800.56
+    assert hash_entrada(alterada) != hash_entrada(folha)
+    # Mesmos valores com outro nome de coluna
+    assert hash_entrada(folha.rename(columns={'Nome': 'Funcionario'})) != hash_entrada(folha)
+
+
+def test_chave_separa_parametros(folha):
+    chaves = {
+        chave_resultado(folha, COMPETENCIA),
+        chave_resultado(folha, date(2024, 1, 1)),
+        chave_resultado(folha, COMPETENCIA, simular_ano_anterior=True),
+        chave_resultado(folha, COMPETENCIA, centavos=True),
+    }
+    assert len(chaves) == 4
+    assert chave_resultado(folha.copy(), COMPETENCIA) == chave_resultado(folha, COMPETENCIA)
+
+
+def test_processar_em_cache(folha, cache_limpo):
+    primeiro = processar_lote_em_cache(folha, COMPETENCIA)
+    segundo = processar_lote_em_cache(folha.copy(), COMPETENCIA)
+    assert (primeiro.attrs['cache_resultado'], segundo.attrs['cache_resultado']) == (False, True)
+    pd.testing.assert_frame_equal(segundo, processar_lote(folha, COMPETENCIA))
+
+    # O resultado devolvido é uma cópia: alterá-lo não afeta o cache
+    segundo.loc[0, 'INSS'] = -1.0
+    assert processar_lote_em_cache(folha, COMPETENCIA).loc[0, 'INSS'] != -1.0
+
+    # Outro parâmetro é outra chave
+    assert processar_lote_em_cache(folha, COMPETENCIA, centavos=True).attrs['cache_resultado'] is False
+    estatisticas = estatisticas_cache_resultados()
+    assert (estatisticas['acertos'], estatisticas['falhas'], estatisticas['tamanho']) == (2, 2, 2)
+
+
+def test_chave_pelos_bytes_do_arquivo(folha, cache_limpo):
+    processar_lote_em_cache(folha, COMPETENCIA, conteudo=b'arquivo original')
+    assert processar_lote_em_cache(folha, COMPETENCIA, conteudo=b'arquivo original').attrs['cache_resultado'] is True
+    assert processar_lote_em_cache(folha, COMPETENCIA, conteudo=b'outro arquivo').attrs['cache_resultado'] is False
+
+
+def test_limite_em_bytes(folha):
+    resultado = processar_lote(folha, COMPETENCIA)
+    cache = CacheResultados(tamanho_maximo=1)
+    cache.guardar('grande', resultado)
+    assert len(cache) == 0
+
+    tamanho = int(resultado.memory_usage(index=True, deep=True).sum())
+    cache = CacheResultados(tamanho_maximo=2 * tamanho)
+    for chave in ('a', 'b', 'c'):
+        cache.guardar(chave, resultado)
+    assert cache.obter('a') is None
+    assert cache.obter('c') is not None
+    assert cache.estatisticas()['descartes'] == 1
+    assert cache.estatisticas()['bytes_usados'] == 2 * tamanho
@@ -0,0 +1,54 @@
+"""Auditoria em blocos: contagem por bloco e limpeza dos arquivos parciais."""
+import io
+import os
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from folha import processar_lote, streaming
+
+COMPETENCIA = date(2025, 1, 1)
+
+
+def _csv_repetido(linhas):
+    combinacoes = [(2500.0, 0, 0.0), (4800.55, 2, 120.0), (9200.0, 1, 35.5)]
+    df = pd.DataFrame(
+        [combinacoes[i % len(combinacoes)] for i in range(linhas)],
+        columns=['Salario_Bruto', 'Dependentes', 'Outros_Descontos'],
+    )
+    df.insert(0, 'Nome', [f'Funcionario {i}' for i in range(linhas)])
+    return df, df.to_csv(index=False).encode('utf-8')
+
+
+def test_combinacoes_somadas_por_bloco(tmp_path):
+    df, conteudo = _csv_repetido(30)
+    resumo = streaming.processar_csv_em_blocos(
+        io.BytesIO(conteudo), COMPETENCIA, tamanho_bloco=10, destino=str(tmp_path / 'saida.csv'))
+
+    # Três combinações repetidas em três blocos: calculadas três vezes cada
+    assert resumo['linhas'] == 30
+    assert resumo['combinacoes_calculadas'] == 9
+    inteiro = processar_lote(df, COMPETENCIA)
+    assert inteiro.attrs['deduplicacao']['combinacoes_unicas'] == 3
+    assert resumo['totais']['Salario_Liquido'] == pytest.approx(inteiro['Salario_Liquido'].sum(), abs=0.005)
+
+
+def test_falha_no_meio_remove_arquivos_parciais(tmp_path, monkeypatch):
+    _, conteudo = _csv_repetido(30)
+    chamadas = []
+
+    def processar_lote_falho(*args, **kwargs):
+        chamadas.append(1)
+        if len(chamadas) == 2:
+            raise ValueError('falha no segundo bloco')
+        return processar_lote(*args, **kwargs)
+
+    monkeypatch.setattr(streaming, 'processar_lote', processar_lote_falho)
+    destino = tmp_path / 'saida.csv'
+    with pytest.raises(ValueError, match='segundo bloco'):
+        streaming.processar_csv_em_blocos(
+            io.BytesIO(conteudo), COMPETENCIA, tamanho_bloco=10, destino=str(destino), gravar_parquet=True)
+
+    assert len(chamadas) == 2
+    assert os.listdir(tmp_path) == []
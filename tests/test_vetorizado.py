@@ -0,0 +1,74 @@
+"""Cálculo vetorizado (NumPy) comparado às funções escalares de `folha.calculos`."""
+import numpy as np
+import pytest
+
+from folha import (
+    DESCONTO_DEPENDENTE_IR,
+    VIGENCIAS_INSS,
+    VIGENCIAS_IRRF,
+    arredondar_centavos,
+    calcular_inss,
+    calcular_inss_vetorizado,
+    calcular_irrf,
+    calcular_irrf_vetorizado,
+    compilar_tabela,
+)
+
+TABELAS_INSS = [tabela for _, tabela in VIGENCIAS_INSS]
+
+
+def _salarios_limite(tabela):
+    """Zero, negativos, cada limite de faixa e um centavo em volta, acima do teto e sorteados."""
+    limites = compilar_tabela(tabela).limites
+    rng = np.random.default_rng(11)
+    return np.concatenate([
+        [0.0, -0.01, -1500.0, 0.01, 1e7],
+        limites, limites - 0.01, limites + 0.01, limites + 0.005,
+        rng.uniform(0, 12000, 3000).round(2),
+        rng.uniform(0, 12000, 1000),
+    ])
+
+
+@pytest.mark.parametrize("valor", [0.005, 0.015, 0.125, 0.165, 1.005, 2.675, 1234.565, -0.015, 999999.995])
+def test_arredondar_centavos_igual_ao_round(valor):
+    assert arredondar_centavos([valor])[0] == round(valor, 2)
+
+
+@pytest.mark.parametrize("tabela", TABELAS_INSS, ids=[str(inicio) for inicio, _ in VIGENCIAS_INSS])
+def test_inss_vetorizado_igual_ao_escalar(tabela):
+    salarios = _salarios_limite(tabela)
+    esperado = [calcular_inss(float(salario), tabela) for salario in salarios]
+    assert calcular_inss_vetorizado(salarios, tabela).tolist() == esperado
+
+
+@pytest.mark.parametrize("tabela, ds_maximo", [(tabela, ds_maximo) for _, tabela, ds_maximo, _, _ in VIGENCIAS_IRRF],
+                         ids=[periodo for _, _, _, periodo, _ in VIGENCIAS_IRRF])
+def test_irrf_vetorizado_igual_ao_escalar(tabela, ds_maximo):
+    rng = np.random.default_rng(5)
+    limites = compilar_tabela(tabela).limites[:-1]
+    # Salários cuja base simplificada cai em cada limite, e entradas sorteadas
+    salarios = np.concatenate([limites + ds_maximo, limites + ds_maximo + 0.01, rng.uniform(0, 20000, 3000).round(2)])
+    linhas = len(salarios)
+    dependentes = rng.integers(0, 5, linhas)
+    outros_descontos = np.where(rng.random(linhas) < 0.5, 0.0, rng.uniform(0, 1500, linhas).round(2))
+    inss = calcular_inss_vetorizado(salarios, TABELAS_INSS[-1])
+
+    irrf, metodo, base, deducao = calcular_irrf_vetorizado(salarios, dependentes, inss, outros_descontos, tabela, ds_maximo)
+
+    esperado = [
+        calcular_irrf(float(s), int(d), float(i), float(o), tabela, ds_maximo)
+        for s, d, i, o in zip(salarios, dependentes, inss, outros_descontos)
+    ]
+    assert list(zip(irrf.tolist(), metodo.tolist(), base.tolist(), deducao.tolist())) == esperado
+    # Os dois métodos aparecem na amostra
+    assert set(metodo) == {"Legal", "Simplificado"}
+
+
+def test_irrf_vetorizado_escolhe_legal_no_empate():
+    _, tabela, ds_maximo, _, _ = VIGENCIAS_IRRF[-1]
+    # Dedução legal igual ao Desconto Simplificado: mesmo imposto pelos dois métodos
+    salario = np.array([6000.0])
+    inss = np.array([ds_maximo - DESCONTO_DEPENDENTE_IR])
+    _, metodo, _, _ = calcular_irrf_vetorizado(salario, np.array([1]), inss, np.array([0.0]), tabela, ds_maximo)
+    assert metodo.tolist() == ["Legal"]
+    assert calcular_irrf(6000.0, 1, float(inss[0]), 0.0, tabela, ds_maximo)[1] == "Legal"